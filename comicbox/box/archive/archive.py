@@ -11,13 +11,15 @@ from comicbox._pdf import PAGE_FORMAT_IMAGE, PDF_ENABLED
 from comicbox.box.archive.sniff import sniff_ext
 
 if TYPE_CHECKING:
-    from pdffile import PDFFile
+    from collections.abc import Sequence
+
+    from pdffile import PageVerdict, PDFFile
     from py7zr import SevenZipFile
-    from py7zr.io import BytesIOFactory
     from rarfile import RarFile
     from zipremove import ZipFile
 
     from comicbox.box.archive.archiveinfo import InfoType
+    from comicbox.box.archive.sevenzip import PageBufferFactory
 
     ArchiveType = ZipFile | SevenZipFile | RarFile | TarFile | PDFFile
 else:
@@ -59,20 +61,23 @@ class Archive:
 
     @staticmethod
     def _read_7zipfile(
-        archive: SevenZipFile, factory: BytesIOFactory | None, filename: str
+        archive: SevenZipFile, factory: PageBufferFactory | None, filename: str
     ) -> bytes:
-        """Read a single file from 7zip."""
+        """Read a single file from 7zip, or from the page buffer."""
         if not factory:
             return b""
+        if (data := factory.get(filename)) is not None:
+            return data
         archive.extract(targets=[filename], factory=factory)
-        file_obj = factory.products.get(filename)
-        data = file_obj.read() if file_obj else b""
+        data = factory.read(filename)
         archive.reset()
         return data
 
     @staticmethod
     def _read_pdffile_rotated_render(
-        archive: PDFFile, filename: str
+        archive: PDFFile,
+        filename: str,
+        verdicts: Sequence[PageVerdict] | None = None,
     ) -> tuple[bytes, str] | None:
         """
         Render an ``image`` read when raw bytes would bake in rotation.
@@ -82,15 +87,20 @@ class Archive:
         of a rotated image-dominant page would write the stored,
         wrong-way-up orientation into extracted files and converted
         archives. Detect that case and render the whole page instead.
-        Returns None when the stored bytes are fine as-is, the name is
-        an embedded file, or detection fails.
+        Page verdicts classified ahead, one per page, save classifying
+        the page again. Returns None when the stored bytes are fine
+        as-is, the name is an embedded file, or detection fails.
         """
         try:
             index = archive.valid_pagenum(filename)
         except ValueError:
             return None  # embedded file, not a page
         try:
-            if not archive.classify_page(index).rotation:
+            if verdicts is not None and index < len(verdicts):
+                verdict = verdicts[index]
+            else:
+                verdict = archive.classify_page(index)
+            if not verdict.rotation:
                 return None
             return archive.read_full_pixmap_jpeg(index)
         except Exception as exc:
@@ -102,11 +112,16 @@ class Archive:
 
     @classmethod
     def _read_pdffile(
-        cls, archive: PDFFile, filename: str, pdf_format: str, props: dict | None
+        cls,
+        archive: PDFFile,
+        filename: str,
+        pdf_format: str,
+        props: dict | None,
+        verdicts: Sequence[PageVerdict] | None,
     ) -> bytes:
         """Read a pdf page and report the format actually served."""
         if pdf_format == PAGE_FORMAT_IMAGE and (
-            served := cls._read_pdffile_rotated_render(archive, filename)
+            served := cls._read_pdffile_rotated_render(archive, filename, verdicts)
         ):
             data, ext = served
             if props is not None:
@@ -126,13 +141,14 @@ class Archive:
         cls,
         archive: ArchiveType,
         filename: str,
-        factory: BytesIOFactory | None,
+        factory: PageBufferFactory | None,
         pdf_format: str = "",
         props: dict | None = None,
+        pdf_verdicts: Sequence[PageVerdict] | None = None,
     ) -> bytes:
         """Read one file in the archive's data."""
         if PDF_ENABLED and isinstance(archive, PDFFile):
-            return cls._read_pdffile(archive, filename, pdf_format, props)
+            return cls._read_pdffile(archive, filename, pdf_format, props, pdf_verdicts)
         if isinstance(archive, TarFile):
             return cls._read_tarfile(archive, filename)
         if hasattr(archive, "reset"):  # SevenZipFile
@@ -7,11 +7,13 @@ from tarfile import TarInfo
 from typing import TYPE_CHECKING, Any, cast
 from zipfile import ZipInfo
 
+from comicbox.box.archive.zipdir import ZipEntry
+
 if TYPE_CHECKING:
     from py7zr import FileInfo as SevenZipInfo
     from rarfile import RarInfo
 
-    InfoType = ZipInfo | SevenZipInfo | RarInfo | TarInfo
+    InfoType = ZipInfo | ZipEntry | SevenZipInfo | RarInfo | TarInfo
 else:
     InfoType = Any  # avoid pulling in py7zr / rarfile at module-load time
 
@@ -27,7 +29,7 @@ class ArchiveInfo:
     def mtime(info: InfoType) -> datetime | None:
         """Return mtime as a datetime."""
         dttm = None
-        if isinstance(info, ZipInfo):
+        if isinstance(info, (ZipInfo, ZipEntry)):
             if date_time := info.date_time:
                 dttm = datetime(*date_time)  # noqa: DTZ001
         elif isinstance(info, TarInfo):
@@ -64,8 +66,8 @@ class ArchiveInfo:
             return info.isdir()
         if hasattr(info, "is_directory"):  # SevenZipInfo
             return bool(cast("SevenZipInfo", info).is_directory)
-        # ZipInfo or RarInfo
-        return cast("ZipInfo | RarInfo", info).is_dir()
+        # ZipInfo, ZipEntry or RarInfo
+        return cast("ZipInfo | ZipEntry | RarInfo", info).is_dir()
 
     @staticmethod
     def filename(info: InfoType) -> str:
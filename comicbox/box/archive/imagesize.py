@@ -0,0 +1,192 @@
+"""
+Image dimensions from the first bytes of an image.
+
+Reads the pixel size out of the format header without decoding any pixel
+data: JPEG start of frame markers, the PNG IHDR chunk, WebP VP8, VP8L and
+VP8X headers, the GIF logical screen descriptor and the JPEG XL size
+header, bare or in its ISOBMFF container.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Header bytes to read first. A JPEG start of frame can sit behind large
+# EXIF or ICC segments, so short reads are retried up to the last size.
+HEAD_SIZES: Final = (4 * 1024, 64 * 1024, 512 * 1024)
+
+_PNG_SIG = b"\x89PNG\r\n\x1a\n"
+_GIF_SIGS = frozenset({b"GIF87a", b"GIF89a"})
+_JXL_CODESTREAM_SIG = b"\xff\x0a"
+_JXL_CONTAINER_SIG = b"\x00\x00\x00\x0cJXL \r\n\x87\n"
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_MARKER = 0xFF
+# Start of frame markers, all but DHT (C4), JPG (C8) and DAC (CC).
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field.
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+_JPEG_EOI = 0xD9
+_JPEG_SOS = 0xDA
+_VP8_START_CODE = b"\x9d\x01\x2a"
+_VP8L_SIG = 0x2F
+_JXL_RATIOS: Final = (None, (1, 1), (12, 10), (4, 3), (3, 2), (16, 9), (5, 4), (2, 1))
+_JXL_SIZE_BITS: Final = (9, 13, 18, 30)
+_BE16 = struct.Struct(">H")
+_BE32 = struct.Struct(">I")
+_LE16 = struct.Struct("<H")
+_LE32 = struct.Struct("<I")
+
+
+def _need(data: bytes, end: int) -> None:
+    if len(data) < end:
+        raise EOFError
+
+
+def _jpeg_size(data: bytes) -> tuple[int, int] | None:
+    pos = len(_JPEG_SOI)
+    while True:
+        _need(data, pos + 2)
+        if data[pos] != _JPEG_MARKER:
+            return None
+        marker = data[pos + 1]
+        if marker == _JPEG_MARKER:
+            # Fill byte before a marker.
+            pos += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in (_JPEG_EOI, _JPEG_SOS):
+            return None
+        _need(data, pos + 4)
+        (length,) = _BE16.unpack_from(data, pos + 2)
+        if marker in _JPEG_SOF_MARKERS:
+            _need(data, pos + 9)
+            height, width = struct.unpack_from(">HH", data, pos + 5)
+            return width, height
+        pos += 2 + length
+
+
+def _png_size(data: bytes) -> tuple[int, int] | None:
+    _need(data, 24)
+    if data[12:16] != b"IHDR":
+        return None
+    return _BE32.unpack_from(data, 16)[0], _BE32.unpack_from(data, 20)[0]
+
+
+def _gif_size(data: bytes) -> tuple[int, int]:
+    _need(data, 10)
+    return _LE16.unpack_from(data, 6)[0], _LE16.unpack_from(data, 8)[0]
+
+
+def _webp_size(data: bytes) -> tuple[int, int] | None:
+    _need(data, 30)
+    chunk = data[12:16]
+    if chunk == b"VP8 ":
+        if data[23:26] != _VP8_START_CODE:
+            return None
+        width = _LE16.unpack_from(data, 26)[0] & 0x3FFF
+        height = _LE16.unpack_from(data, 28)[0] & 0x3FFF
+        return width, height
+    if chunk == b"VP8L":
+        if data[20] != _VP8L_SIG:
+            return None
+        (bits,) = _LE32.unpack_from(data, 21)
+        return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+    if chunk == b"VP8X":
+        width = 1 + int.from_bytes(data[24:27], "little")
+        height = 1 + int.from_bytes(data[27:30], "little")
+        return width, height
+    return None
+
+
+class _BitReader:
+    """Least significant bit first reader for the JPEG XL header."""
+
+    def __init__(self, data: bytes, pos: int) -> None:
+        self._data = data
+        self._bit = pos * 8
+
+    def read(self, count: int) -> int:
+        value = 0
+        for shift in range(count):
+            byte, bit = divmod(self._bit, 8)
+            _need(self._data, byte + 1)
+            value |= ((self._data[byte] >> bit) & 1) << shift
+            self._bit += 1
+        return value
+
+    def read_size(self) -> int:
+        return 1 + self.read(_JXL_SIZE_BITS[self.read(2)])
+
+
+def _jxl_codestream_size(data: bytes, pos: int) -> tuple[int, int]:
+    bits = _BitReader(data, pos + len(_JXL_CODESTREAM_SIG))
+    small = bits.read(1)
+    height = (bits.read(5) + 1) * 8 if small else bits.read_size()
+    ratio = bits.read(3)
+    if ratio:
+        num, den = _JXL_RATIOS[ratio]  # pyright: ignore[reportGeneralTypeIssues], # ty: ignore[not-iterable]
+        width = height * num // den
+    elif small:
+        width = (bits.read(5) + 1) * 8
+    else:
+        width = bits.read_size()
+    return width, height
+
+
+def _jxl_container_size(data: bytes) -> tuple[int, int] | None:
+    pos = 0
+    while True:
+        _need(data, pos + 8)
+        size, box_type = _BE32.unpack_from(data, pos)[0], data[pos + 4 : pos + 8]
+        header = 8
+        if size == 1:
+            _need(data, pos + 16)
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        if box_type == b"jxlc":
+            return _jxl_codestream_size(data, pos + header)
+        if box_type == b"jxlp":
+            # Partial codestream boxes start with a sequence number.
+            return _jxl_codestream_size(data, pos + header + 4)
+        if not size:
+            return None
+        pos += size
+
+
+def _is_webp(data: bytes) -> bool:
+    return data[:4] == b"RIFF" and data[8:12] == b"WEBP"
+
+
+_PARSERS: Final[
+    tuple[
+        tuple[Callable[[bytes], bool], Callable[[bytes], tuple[int, int] | None]], ...
+    ]
+] = (
+    (lambda data: data.startswith(_JPEG_SOI), _jpeg_size),
+    (lambda data: data.startswith(_PNG_SIG), _png_size),
+    (lambda data: data[:6] in _GIF_SIGS, _gif_size),
+    (_is_webp, _webp_size),
+    (
+        lambda data: data.startswith(_JXL_CODESTREAM_SIG),
+        lambda data: _jxl_codestream_size(data, 0),
+    ),
+    (lambda data: data.startswith(_JXL_CONTAINER_SIG), _jxl_container_size),
+)
+
+
+def image_size(data: bytes) -> tuple[int, int] | None:
+    """
+    Return (width, height) from an image header, or None if unknown.
+
+    Raises EOFError when data ends before the header does.
+    """
+    for is_format, parse in _PARSERS:
+        if is_format(data):
+            return parse(data)
+    return None
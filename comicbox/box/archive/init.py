@@ -1,14 +1,24 @@
 """Comicbox methods on the archive itself."""
 
+from __future__ import annotations
+
 import re
+from contextlib import suppress
+from typing import TYPE_CHECKING
 
 from loguru import logger
 from typing_extensions import Self
 
+from comicbox.box.archive.pool import PooledArchive
 from comicbox.box.init import ComicboxInit
-from comicbox.box.types import ArchiveType
 from comicbox.exceptions import ArchiveError
 
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from comicbox.box.types import ArchiveType
+    from comicbox.formats import MetadataFormats
+
 
 class ComicboxArchiveInit(ComicboxInit):
     """Methods on the archive itself."""
@@ -23,8 +33,60 @@ class ComicboxArchiveInit(ComicboxInit):
         """Context close."""
         self.close()
 
+    def _reset_archive(
+        self, fmt: MetadataFormats | None, metadata: Mapping | str | bytes | None
+    ) -> None:
+        super()._reset_archive(fmt, metadata)
+        self._checkout_pooled_archive()
+
+    def _checkout_pooled_archive(self) -> None:
+        """Adopt the pool's open state for this path, if it has any."""
+        if self._pool is None or not self._path:
+            return
+        try:
+            self._pool_fingerprint, pooled = self._pool.checkout(self._path)
+        except OSError as exc:
+            logger.debug(f"{self._path} not pooled: {exc}")
+            return
+        if pooled is None:
+            return
+        self._archive = pooled.archive
+        self._namelist = pooled.namelist
+        self._infolist = pooled.infolist
+        self._zipdir = pooled.zipdir
+        self._tar_index = pooled.tar_index
+        self._tar_reader = pooled.tar_reader
+        self._mmap = pooled.mmap
+
+    def _checkin_pooled_archive(self) -> bool:
+        """Hand the open state back to the pool instead of closing it."""
+        if self._pool is None or not self._path or self._pool_fingerprint is None:
+            return False
+        pooled = PooledArchive(
+            archive=self._archive,
+            namelist=self._namelist,
+            infolist=self._infolist,
+            zipdir=self._zipdir,
+            tar_index=self._tar_index,
+            tar_reader=self._tar_reader,
+            mmap=self._mmap,
+        )
+        if pooled.is_empty():
+            return False
+        self._pool.checkin(self._path, self._pool_fingerprint, pooled)
+        self._pool_fingerprint = None
+        self._archive = None
+        self._tar_reader = None
+        self._mmap = None
+        return True
+
     def close(self) -> None:
-        """Close the open archive and release cached archive state."""
+        """
+        Close the open archive and release cached archive state.
+
+        A box with a pool returns the open archive to it instead.
+        """
+        self._checkin_pooled_archive()
         try:
             if self._archive and hasattr(self._archive, "close"):
                 self._archive.close()
@@ -32,15 +94,27 @@ class ComicboxArchiveInit(ComicboxInit):
             logger.warning(f"closing archive {self._path}: {exc}")
         finally:
             self._archive = None
-            # Release the 7z page-buffer factory — Py7zBytesIO objects
-            # accumulate one entry per page ever read and are otherwise
-            # only freed when the Comicbox instance is GC'd. Long-lived
+            # Release the 7z page buffer and its spill files. Long-lived
             # callers (Codex's ArchiveCache) need explicit release.
-            self._7zfactory = None
+            if self._7zfactory is not None:
+                self._7zfactory.close()
+                self._7zfactory = None
             # Drop cached archive directory listings as well; they can
             # be many KB on archives with hundreds of pages.
             self._namelist = None
             self._infolist = None
+            self._zipinfolist = None
+            self._zipdir = None
+            self._tar_index = None
+            if self._tar_reader is not None:
+                self._tar_reader.close()
+                self._tar_reader = None
+            if self._mmap is not None:
+                # Outstanding page views keep the map alive; it unmaps
+                # when the last of them is released.
+                with suppress(BufferError):
+                    self._mmap.close()
+                self._mmap = None
 
     def _get_archive(self) -> ArchiveType:
         """Set archive instance open for reading."""
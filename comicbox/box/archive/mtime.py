@@ -5,7 +5,6 @@ from pathlib import Path
 
 from comicbox.box.archive.archiveinfo import ArchiveInfo
 from comicbox.box.archive.write import ComicboxArchiveWrite
-from comicbox.box.types import ArchiveType
 
 _BRACKETS = ("{", b"{")
 
@@ -13,10 +12,10 @@ _BRACKETS = ("{", b"{")
 class ComicboxArchiveMtime(ComicboxArchiveWrite):
     """Calculate page filenames."""
 
-    def _is_comment_json(self, archive: ArchiveType) -> bool:
+    def _is_comment_json(self) -> bool:
         return (
             self._config.is_read_comments
-            and bool(comment := getattr(archive, "comment", ""))
+            and bool(comment := self._get_raw_comment())
             and (comment[0] in _BRACKETS)
         )
 
@@ -31,7 +30,7 @@ class ComicboxArchiveMtime(ComicboxArchiveWrite):
     def get_metadata_files_mtime(self) -> datetime | None:
         """Get the latest metadata archive file mtime according to the read config."""
         max_mtime: datetime | None = None
-        for info in self.infolist():
+        for info in self._get_infolist():
             if ArchiveInfo.is_dir(info):
                 continue
 
@@ -53,10 +52,15 @@ class ComicboxArchiveMtime(ComicboxArchiveWrite):
 
     def get_metadata_mtime(self) -> datetime | None:
         """Get the latest metadata mtime according to the read config."""
-        # Ensure the archive is ready.
-        archive = self._get_archive()
+        if self._archive_is_pdf:
+            # Pdf metadata lives in the file itself.
+            return self.get_path_mtime_dttm()
+
+        # Ensure the archive is ready. CBZs and CBTs only need their index.
+        if self._get_zip_directory() is None and self._get_tar_index() is None:
+            self._get_archive()
 
-        if self._archive_is_pdf or self._is_comment_json(archive):
+        if self._is_comment_json():
             return self.get_path_mtime_dttm()
 
         return self.get_metadata_files_mtime()
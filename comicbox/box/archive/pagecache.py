@@ -0,0 +1,218 @@
+"""
+Page cache shared between processes on one host.
+
+Page servers run several worker processes, and a private cache in each
+decompresses a hot page once per process. A box created with
+``Comicbox(path, page_cache=cache)`` looks pages up in a memory mapped
+file under /dev/shm first and stores the pages it has to decompress, so
+every process on the host shares them.
+
+The file holds a header, a fixed table of slots and a data ring. Slots
+are found by hashing the archive fingerprint and member name and probing
+a short window; when the window is full the CLOCK algorithm picks the
+victim, skipping slots read since they were last passed over. Page bytes
+are appended to the ring, which overwrites the oldest pages as it wraps;
+a slot whose bytes have been overwritten reads as a miss. A rewritten
+archive changes its fingerprint, so stale pages are never served.
+
+Processes coordinate with flock on the file, threads with a lock, and
+every failure reads as a miss or drops the store, as with the read cache.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from comicbox.read_cache import Fingerprint
+
+DEFAULT_NAME = "comicbox-pages"
+DEFAULT_SIZE = 256 * 1024 * 1024
+DEFAULT_SLOTS = 8192
+_SHM_DIR = Path("/dev/shm")  # noqa: S108
+_MAGIC = b"CBXPAGE1"
+_HEADER = struct.Struct("<8sIIQQ")
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<16sQIB3x")
+# Offset of the CLOCK reference byte in a slot.
+_SLOT_REF = struct.calcsize("<16sQI")
+_DIGEST_SIZE = 16
+_EMPTY_DIGEST = bytes(_DIGEST_SIZE)
+_PROBES = 8
+# Bigger pages would flush too much of the ring to be worth caching.
+_MAX_PAGE_FRACTION = 8
+
+
+def default_page_cache_path(name: str = DEFAULT_NAME) -> Path:
+    """Return the page cache file path in /dev/shm, or the temp dir without it."""
+    shm_dir = _SHM_DIR if _SHM_DIR.is_dir() else Path(tempfile.gettempdir())
+    return shm_dir / name
+
+
+class SharedPageCache:
+    """Fixed size page cache in a memory mapped file shared by processes."""
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        size: int = DEFAULT_SIZE,
+        slots: int = DEFAULT_SLOTS,
+    ) -> None:
+        """
+        Map the cache file at path, creating it if it doesn't exist.
+
+        An existing file keeps the geometry it was created with, so every
+        process agrees on it whatever size and slots they pass.
+        """
+        self._path = Path(path) if path else default_page_cache_path()
+        self._lock = threading.Lock()
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._init_file(size, slots)
+            self._mmap: mmap.mmap | None = mmap.mmap(self._fd, 0)
+            _, self._slots, _, self._data_size, _ = _HEADER.unpack_from(self._mmap)
+        except Exception:
+            os.close(self._fd)
+            raise
+        self._data_start = _HEADER_SIZE + self._slots * _SLOT.size
+        self.max_page_size = self._data_size // _MAX_PAGE_FRACTION
+
+    def _init_file(self, size: int, slots: int) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header.startswith(_MAGIC):
+                return
+            data_size = size - _HEADER_SIZE - slots * _SLOT.size
+            if data_size <= 0:
+                reason = f"Page cache size {size} is too small for {slots} slots."
+                raise ValueError(reason)
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+            os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots, 0, data_size, 0), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @property
+    def path(self) -> Path:
+        """Return the path of the cache file."""
+        return self._path
+
+    @contextmanager
+    def _locked(self, operation: int) -> Generator[mmap.mmap]:
+        with self._lock:
+            if self._mmap is None:
+                reason = f"Page cache {self._path} is closed."
+                raise ValueError(reason)
+            fcntl.flock(self._fd, operation)
+            try:
+                yield self._mmap
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _digest(fingerprint: Fingerprint, name: str) -> bytes:
+        material = repr((tuple(fingerprint), name)).encode()
+        return hashlib.blake2b(material, digest_size=_DIGEST_SIZE).digest()
+
+    def _slot_offsets(self, digest: bytes) -> Generator[int]:
+        first = int.from_bytes(digest[:8], "little") % self._slots
+        for probe in range(min(_PROBES, self._slots)):
+            yield _HEADER_SIZE + ((first + probe) % self._slots) * _SLOT.size
+
+    def _is_live(self, head: int, pos: int) -> bool:
+        """Are a page's bytes still in the ring."""
+        return head - pos <= self._data_size
+
+    def get(self, fingerprint: Fingerprint, name: str) -> bytes | None:
+        """Return a cached page, or None."""
+        digest = self._digest(fingerprint, name)
+        with suppress(OSError, ValueError), self._locked(fcntl.LOCK_SH) as mm:
+            head = _HEADER.unpack_from(mm)[4]
+            for offset in self._slot_offsets(digest):
+                slot_digest, pos, length, _ = _SLOT.unpack_from(mm, offset)
+                if slot_digest != digest or not self._is_live(head, pos):
+                    continue
+                # Mark the slot referenced for CLOCK.
+                mm[offset + _SLOT_REF] = 1
+                start = self._data_start + pos % self._data_size
+                return mm[start : start + length]
+        return None
+
+    def _choose_slot(self, mm: mmap.mmap, digest: bytes, head: int) -> int:
+        """Return the slot for digest: its own, a free one or a CLOCK victim."""
+        offsets = tuple(self._slot_offsets(digest))
+        slots = [_SLOT.unpack_from(mm, offset) for offset in offsets]
+        for offset, (slot_digest, _, _, _) in zip(offsets, slots, strict=True):
+            if slot_digest == digest:
+                return offset
+        for offset, (slot_digest, pos, _, _) in zip(offsets, slots, strict=True):
+            if slot_digest == _EMPTY_DIGEST or not self._is_live(head, pos):
+                return offset
+        # Every slot in the window is live: give each referenced slot a
+        # second chance, then take the first unreferenced one.
+        for offset in offsets:
+            ref_offset = offset + _SLOT_REF
+            if not mm[ref_offset]:
+                return offset
+            mm[ref_offset] = 0
+        return offsets[0]
+
+    def set(self, fingerprint: Fingerprint, name: str, data: bytes) -> None:
+        """Store a page, evicting the oldest pages and a CLOCK victim slot."""
+        length = len(data)
+        if not length or length > self.max_page_size:
+            return
+        digest = self._digest(fingerprint, name)
+        with suppress(OSError, ValueError), self._locked(fcntl.LOCK_EX) as mm:
+            magic, slots, _, data_size, head = _HEADER.unpack_from(mm)
+            # Pages don't wrap around the end of the ring.
+            if head % data_size + length > data_size:
+                head += data_size - head % data_size
+            pos = head
+            start = self._data_start + pos % data_size
+            mm[start : start + length] = data
+            head += length
+            offset = self._choose_slot(mm, digest, head)
+            _SLOT.pack_into(mm, offset, digest, pos, length, 0)
+            _HEADER.pack_into(mm, 0, magic, slots, 0, data_size, head)
+
+    def clear(self) -> None:
+        """Forget every cached page."""
+        with suppress(OSError, ValueError), self._locked(fcntl.LOCK_EX) as mm:
+            mm[_HEADER_SIZE : self._data_start] = bytes(self._data_start - _HEADER_SIZE)
+
+    def close(self) -> None:
+        """Unmap the cache file. The file stays for other processes."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                os.close(self._fd)
+
+    def unlink(self) -> None:
+        """Close and remove the cache file."""
+        self.close()
+        with suppress(FileNotFoundError):
+            self._path.unlink()
+
+    def __enter__(self) -> Self:
+        """Context enter."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Context close."""
+        self.close()
@@ -1,29 +1,175 @@
 """Pages methods."""
 
-from collections.abc import Iterator
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
 
 from comicbox.box.archive.filenames import ComicboxArchiveFilenames
+from comicbox.box.archive.prefetch import (
+    DEFAULT_AHEAD,
+    DEFAULT_MEMORY_LIMIT,
+    PagePrefetcher,
+)
+from comicbox.box.archive.sniff import sniff_mime_type
+from comicbox.read_cache import file_fingerprint
+
+if TYPE_CHECKING:
+    from comicbox.formats import MetadataFormats
+
+_SNIFF_LENGTH = 16
+
+
+class PageSpan(NamedTuple):
+    """Where a page's bytes lie verbatim in the archive file."""
+
+    path: Path
+    offset: int
+    length: int
+    content_type: str
 
 
 class ComicboxArchivePages(ComicboxArchiveFilenames):
     """Pages methods."""
 
+    # Pages read ahead of a sequential reader and the byte budget of the
+    # page cache they land in. See get_page_prefetcher().
+    PREFETCH_AHEAD = DEFAULT_AHEAD
+    PREFETCH_MEMORY_LIMIT = DEFAULT_MEMORY_LIMIT
+
+    def _close_prefetcher(self) -> None:
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _reset_archive(
+        self, fmt: "MetadataFormats | None", metadata: Mapping | str | bytes | None
+    ) -> None:
+        self._close_prefetcher()
+        super()._reset_archive(fmt, metadata)
+
+    def close(self) -> None:
+        """Stop read ahead, then close the archive."""
+        self._close_prefetcher()
+        super().close()
+
+    def get_page_prefetcher(
+        self,
+        ahead: int | None = None,
+        memory_limit: int | None = None,
+        pdf_format: str = "",
+    ) -> PagePrefetcher:
+        """
+        Return a read ahead session for serving pages by index.
+
+        Once a page is served, the next ahead pages are read on a
+        background thread into a cache of up to memory_limit bytes, so a
+        reader turning pages in order is served from memory. Jumping to a
+        page out of order cancels read ahead until reading is sequential
+        again.
+
+        The session reads the archive on its own thread, so read pages
+        through it and not the box while it is open. A box has one session
+        at a time; asking for another, or closing the box, closes it.
+        """
+        self._close_prefetcher()
+        self._prefetcher = PagePrefetcher(
+            self,
+            self.PREFETCH_AHEAD if ahead is None else ahead,
+            self.PREFETCH_MEMORY_LIMIT if memory_limit is None else memory_limit,
+            pdf_format,
+        )
+        return self._prefetcher
+
+    def _get_page_cache_name(self, filename: str, pdf_format: str) -> str:
+        """Pdf pages are cached per format they're read in."""
+        if self._archive_is_pdf:
+            return f"{filename}:{self._get_pdf_format(pdf_format)}"
+        return filename
+
+    def _get_page_cached(self, filename: str, pdf_format: str) -> bytes | None:
+        """Read a page through the shared page cache, or return None."""
+        if (
+            self._page_cache is None
+            or not self._path
+            or self._archive_span(filename) is not None
+        ):
+            # Pages stored verbatim are cheaper to read than to cache.
+            return None
+        try:
+            fingerprint = file_fingerprint(self._path)
+        except OSError:
+            return None
+        name = self._get_page_cache_name(filename, pdf_format)
+        if (data := self._page_cache.get(fingerprint, name)) is None:
+            data = self._archive_readfile(filename, pdf_format=pdf_format)
+            self._page_cache.set(fingerprint, name, data)
+        return data
+
     def get_page_by_filename(self, filename: str, pdf_format: str = "") -> bytes:
-        """Return data for a single page by filename."""
+        """
+        Return data for a single page by filename.
+
+        A box with a shared page cache looks the page up there first.
+        """
+        if (data := self._get_page_cached(filename, pdf_format)) is not None:
+            return data
         return self._archive_readfile(filename, pdf_format=pdf_format)
 
+    def get_page_view(self, filename: str, pdf_format: str = "") -> memoryview:
+        """
+        Return a read only view of a single page by filename.
+
+        STORED zip members are served without a copy, straight out of a
+        memory map of the archive. Deflated members and CBR, CB7, CBT and
+        PDF pages are read as usual and wrapped. Views into the map stay
+        valid after close(), but must be released before the archive file
+        is rewritten.
+        """
+        if (view := self._archive_stored_view(filename)) is not None:
+            return view
+        return memoryview(self.get_page_by_filename(filename, pdf_format=pdf_format))
+
+    def get_page_span(self, filename: str) -> PageSpan | None:
+        """
+        Return the file span holding a page's bytes, for serving it directly.
+
+        Hosts can hand the span to os.sendfile() or an HTTP range response
+        without the page passing through Python. Only STORED zip members
+        and members of uncompressed tars have a span; everything else
+        returns None and must be read with get_page_by_filename().
+        """
+        if not self._path or not (span := self._archive_span(filename)):
+            return None
+        offset, length = span
+        head = self._get_mmap()[offset : offset + min(length, _SNIFF_LENGTH)]
+        content_type = sniff_mime_type(head, filename)
+        return PageSpan(self._path, offset, length, content_type)
+
     def get_pages(
-        self, page_from: int = 0, page_to: int = -1, pdf_format: str = ""
+        self,
+        page_from: int = 0,
+        page_to: int = -1,
+        pdf_format: str = "",
+        *,
+        zero_copy: bool = False,
     ) -> Iterator:
-        """Generate all pages starting with page number."""
-        if pagenames := self.get_pagenames_from(page_from, page_to):
+        """
+        Generate all pages starting with page number.
+
+        With zero_copy, generate views as get_page_view() does instead of
+        bytes.
+        """
+        if not (pagenames := self.get_pagenames_from(page_from, page_to)):
+            return
+        if zero_copy:
             for pagename in pagenames:
-                yield self._archive_readfile(pagename, pdf_format=pdf_format)
+                yield self.get_page_view(pagename, pdf_format=pdf_format)
+        else:
+            for _, data, _ in self._archive_readfiles(pagenames, pdf_format=pdf_format):
+                yield data
 
     def get_page_by_index(self, index: int, pdf_format: str = "") -> bytes | None:
         """Get the page data by index."""
-        if pages_generator := self.get_pages(
-            page_from=index, page_to=index, pdf_format=pdf_format
-        ):
-            return next(pages_generator)
-        return None
+        if (pagename := self.get_pagename(index)) is None:
+            return None
+        return self.get_page_by_filename(pagename, pdf_format=pdf_format)
@@ -0,0 +1,597 @@
+"""
+Read pdf metadata without opening the document in MuPDF.
+
+Reading tags from a pdf only needs the page count, the document info
+dictionary and the names of embedded files. MuPDF loads slowly and opens
+the whole document for them. The probe reads only what they need from a
+memory map of the file: the trailer, the cross reference tables or
+streams, the info dictionary, the catalog, the page tree root and the
+embedded files name tree.
+
+Anything the probe doesn't handle raises PdfProbeError, so the caller
+can fall back to MuPDF. That includes encrypted documents, stream filters
+other than FlateDecode and damaged cross reference data that MuPDF would
+repair.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import zlib
+from dataclasses import dataclass, field
+from math import floor, log10
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_STARTXREF_WINDOW = 2048
+_HEADER_WINDOW = 1024
+_MAX_DEPTH = 32
+_WHITESPACE = b"\x00\t\n\x0c\r "
+_DELIMITERS = b"()<>[]{}/%"
+_TOKEN_RE = re.compile(rb"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+_INT_RE = re.compile(rb"[+-]?\d+")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_VERSION_RE = re.compile(rb"%PDF-(\d+)\.(\d+)")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+_OCTAL = frozenset(b"01234567")
+_KEYWORDS = {b"true": True, b"false": False, b"null": None}
+_PNG_PREDICTOR_MIN = 10
+_INFO_KEYS = (
+    ("title", "Title"),
+    ("author", "Author"),
+    ("subject", "Subject"),
+    ("keywords", "Keywords"),
+    ("creator", "Creator"),
+    ("producer", "Producer"),
+    ("creationDate", "CreationDate"),
+    ("modDate", "ModDate"),
+    ("trapped", "Trapped"),
+)
+# PDFDocEncoding code points that differ from Latin-1.
+_PDFDOC_ENCODING = str.maketrans(
+    dict(
+        zip(
+            [*range(0x18, 0x20), *range(0x80, 0x9F), 0xA0],
+            (
+                "\u02d8\u02c7\u02c6\u02d9\u02dd\u02db\u02da\u02dc"
+                "\u2022\u2020\u2021\u2026\u2014\u2013\u0192\u2044"
+                "\u2039\u203a\u2212\u2030\u201e\u201c\u201d\u2018"
+                "\u2019\u201a\u2122\ufb01\ufb02\u0141\u0152\u0160"
+                "\u0178\u017d\u0131\u0142\u0153\u0161\u017e\u20ac"
+            ),
+            strict=True,
+        )
+    )
+)
+
+
+class PdfProbeError(ValueError):
+    """The probe can't read this pdf; open it with MuPDF instead."""
+
+
+class _Name(str):
+    """A pdf name object."""
+
+    __slots__ = ()
+
+
+class _Ref(NamedTuple):
+    """An indirect object reference."""
+
+    num: int
+    gen: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Stream:
+    """A stream object's dictionary and where its data starts."""
+
+    info: dict
+    start: int
+
+
+def _decode_text(value: Any) -> str:
+    """Decode a pdf text string as MuPDF does; non strings read as empty."""
+    if not isinstance(value, bytes):
+        return ""
+    if value.startswith((b"\xfe\xff", b"\xff\xfe")):
+        codec = "utf-16-be" if value[0] == 0xFE else "utf-16-le"  # noqa: PLR2004
+        return value[2:].decode(codec, errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode(errors="replace")
+    return value.decode("latin-1").translate(_PDFDOC_ENCODING)
+
+
+def _unpredict_png(data: bytes, columns: int) -> bytes:
+    """Undo PNG row prediction, each row prefixed by its filter type."""
+    out = bytearray()
+    prev = bytearray(columns)
+    for start in range(0, len(data), columns + 1):
+        kind = data[start]
+        row = bytearray(data[start + 1 : start + 1 + columns])
+        for i in range(len(row)):
+            left = row[i - 1] if i else 0
+            up = prev[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:  # noqa: PLR2004
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:  # noqa: PLR2004
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:  # noqa: PLR2004
+                up_left = prev[i - 1] if i else 0
+                estimate = left + up - up_left
+                pa, pb, pc = (
+                    abs(estimate - left),
+                    abs(estimate - up),
+                    abs(estimate - up_left),
+                )
+                paeth = left if pa <= pb and pa <= pc else up if pb <= pc else up_left
+                row[i] = (row[i] + paeth) & 0xFF
+            elif kind:
+                reason = f"Unknown PNG predictor {kind}"
+                raise PdfProbeError(reason)
+        out += row
+        prev = row
+    return bytes(out)
+
+
+class _Parser:
+    """Parse pdf objects out of a buffer, resolving them through the xref."""
+
+    def __init__(self, buf: mmap.mmap | bytes) -> None:
+        self._buf = buf
+        self._xref: dict[int, tuple[int, int] | None] = {}
+        self._cache: dict[int, Any] = {}
+        self.trailer: dict = {}
+
+    ###########
+    # Objects #
+    ###########
+
+    def _skip(self, pos: int) -> int:
+        buf = self._buf
+        end = len(buf)
+        while pos < end:
+            char = buf[pos]
+            if char in _WHITESPACE:
+                pos += 1
+            elif char == ord("%"):
+                while pos < end and buf[pos] not in b"\r\n":
+                    pos += 1
+            else:
+                break
+        return pos
+
+    def _parse_escape(self, pos: int, out: bytearray) -> int:
+        """Decode the escape after a backslash at pos into out."""
+        buf = self._buf
+        escaped = buf[pos]
+        pos += 1
+        if escaped in _ESCAPES:
+            out += _ESCAPES[escaped]
+        elif escaped in _OCTAL:
+            digits = bytes([escaped])
+            while len(digits) < 3 and buf[pos] in _OCTAL:  # noqa: PLR2004
+                digits += bytes([buf[pos]])
+                pos += 1
+            out.append(int(digits, 8) & 0xFF)
+        elif escaped == ord("\r"):
+            # Line continuation.
+            if buf[pos] == ord("\n"):
+                pos += 1
+        elif escaped != ord("\n"):
+            out.append(escaped)
+        return pos
+
+    def _parse_literal_string(self, pos: int) -> tuple[bytes, int]:
+        buf = self._buf
+        out = bytearray()
+        depth = 1
+        while True:
+            char = buf[pos]
+            pos += 1
+            if char == ord("\\"):
+                pos = self._parse_escape(pos, out)
+                continue
+            if char == ord("("):
+                depth += 1
+            elif char == ord(")"):
+                depth -= 1
+                if not depth:
+                    return bytes(out), pos
+            out.append(char)
+
+    def _parse_hex_string(self, pos: int) -> tuple[bytes, int]:
+        end = self._buf.find(b">", pos)
+        if end < 0:
+            reason = "Unterminated hex string"
+            raise PdfProbeError(reason)
+        digits = bytes(c for c in self._buf[pos:end] if c not in _WHITESPACE)
+        if len(digits) % 2:
+            digits += b"0"
+        return bytes.fromhex(digits.decode("ascii")), end + 1
+
+    def _parse_name(self, pos: int) -> tuple[_Name, int]:
+        match = _TOKEN_RE.match(self._buf, pos)
+        raw = match.group() if match else b""
+        name = re.sub(
+            rb"#([0-9A-Fa-f]{2})", lambda m: bytes.fromhex(m[1].decode()), raw
+        )
+        return _Name(name.decode("utf-8", errors="replace")), pos + len(raw)
+
+    def _parse_container(self, pos: int, end: bytes) -> tuple[list, int]:
+        items = []
+        while True:
+            pos = self._skip(pos)
+            if self._buf[pos : pos + len(end)] == end:
+                return items, pos + len(end)
+            item, pos = self.parse(pos)
+            items.append(item)
+
+    def _parse_number_or_ref(self, token: bytes, pos: int) -> tuple[Any, int]:
+        if not _INT_RE.fullmatch(token):
+            return float(token), pos
+        value = int(token)
+        # Look ahead for "gen R".
+        gen_pos = self._skip(pos)
+        if gen_match := _INT_RE.match(self._buf, gen_pos):
+            r_pos = self._skip(gen_match.end())
+            if self._buf[r_pos : r_pos + 1] == b"R" and (
+                r_pos + 1 >= len(self._buf)
+                or self._buf[r_pos + 1] in _WHITESPACE + _DELIMITERS
+            ):
+                return _Ref(value, int(gen_match.group())), r_pos + 1
+        return value, pos
+
+    def _parse_dict(self, pos: int) -> tuple[dict, int]:
+        items, pos = self._parse_container(pos + 2, b">>")
+        if len(items) % 2:
+            reason = "Odd dictionary"
+            raise PdfProbeError(reason)
+        return dict(zip(items[::2], items[1::2], strict=True)), pos
+
+    def _parse_token(self, pos: int) -> tuple[Any, int]:
+        match = _TOKEN_RE.match(self._buf, pos)
+        if not match:
+            reason = f"Unexpected {self._buf[pos : pos + 1]!r} at {pos}"
+            raise PdfProbeError(reason)
+        token, pos = match.group(), match.end()
+        if token in _KEYWORDS:
+            return _KEYWORDS[token], pos
+        try:
+            return self._parse_number_or_ref(token, pos)
+        except ValueError:
+            reason = f"Unexpected token {token!r}"
+            raise PdfProbeError(reason) from None
+
+    def parse(self, pos: int) -> tuple[Any, int]:
+        """Parse the object at pos, returning it and the position after it."""
+        pos = self._skip(pos)
+        if self._buf[pos : pos + 2] == b"<<":
+            return self._parse_dict(pos)
+        char = self._buf[pos : pos + 1]
+        if char == b"[":
+            return self._parse_container(pos + 1, b"]")
+        if char == b"(":
+            return self._parse_literal_string(pos + 1)
+        if char == b"<":
+            return self._parse_hex_string(pos + 1)
+        if char == b"/":
+            return self._parse_name(pos + 1)
+        return self._parse_token(pos)
+
+    def _parse_indirect(self, pos: int, num: int | None = None) -> Any:
+        """Parse "num gen obj" at pos, returning a _Stream for streams."""
+        match = _OBJ_HEADER_RE.match(self._buf, pos)
+        if not match or (num is not None and int(match.group(1)) != num):
+            reason = f"No object {num} at {pos}"
+            raise PdfProbeError(reason)
+        obj, pos = self.parse(match.end())
+        pos = self._skip(pos)
+        if isinstance(obj, dict) and self._buf[pos : pos + 6] == b"stream":
+            pos += 6
+            if self._buf[pos : pos + 2] == b"\r\n":
+                pos += 2
+            elif self._buf[pos : pos + 1] in (b"\n", b"\r"):
+                pos += 1
+            return _Stream(obj, pos)
+        return obj
+
+    ###########
+    # Streams #
+    ###########
+
+    def _stream_length(self, stream: _Stream) -> int:
+        length = self.resolve(stream.info.get("Length"))
+        if isinstance(length, int) and length >= 0:
+            end = stream.start + length
+            if self._buf[end : end + 12].lstrip(_WHITESPACE).startswith(b"endstream"):
+                return length
+        end = self._buf.find(b"endstream", stream.start)
+        if end < 0:
+            reason = "Unterminated stream"
+            raise PdfProbeError(reason)
+        return end - stream.start
+
+    def read_stream(self, stream: _Stream) -> bytes:
+        """Return a stream's decoded data."""
+        data = self._buf[stream.start : stream.start + self._stream_length(stream)]
+        filters = self.resolve(stream.info.get("Filter"))
+        params = self.resolve(stream.info.get("DecodeParms"))
+        if isinstance(filters, list):
+            if len(filters) > 1:
+                reason = "Chained stream filters"
+                raise PdfProbeError(reason)
+            filters = filters[0] if filters else None
+            params = params[0] if isinstance(params, list) and params else params
+        if filters is None:
+            return bytes(data)
+        if filters != "FlateDecode":
+            reason = f"Unsupported stream filter {filters}"
+            raise PdfProbeError(reason)
+        try:
+            data = zlib.decompressobj().decompress(data)
+        except zlib.error as exc:
+            raise PdfProbeError(str(exc)) from exc
+        params = self.resolve(params)
+        if not isinstance(params, dict):
+            params = {}
+        predictor = params.get("Predictor", 1)
+        if predictor >= _PNG_PREDICTOR_MIN:
+            data = _unpredict_png(data, params.get("Columns", 1))
+        elif predictor != 1:
+            reason = f"Unsupported predictor {predictor}"
+            raise PdfProbeError(reason)
+        return data
+
+    ########
+    # Xref #
+    ########
+
+    def _add_entry(self, num: int, entry: tuple[int, int] | None) -> None:
+        """Record an xref entry unless a newer section already did."""
+        self._xref.setdefault(num, entry)
+
+    def _load_xref_table(self, pos: int) -> tuple[dict, list[int]]:
+        """
+        Record a classic xref table's in use entries.
+
+        Returns the trailer and the numbers of the free entries, which the
+        caller records after the section's XRefStm: hybrid files mark the
+        objects kept in object streams free in the table.
+        """
+        free = []
+        pos += 4
+        while True:
+            pos = self._skip(pos)
+            if self._buf[pos : pos + 7] == b"trailer":
+                trailer, _ = self.parse(pos + 7)
+                return trailer, free
+            start_match = _INT_RE.match(self._buf, pos)
+            count_match = start_match and _INT_RE.match(
+                self._buf, self._skip(start_match.end())
+            )
+            if not start_match or not count_match:
+                reason = f"Bad xref subsection at {pos}"
+                raise PdfProbeError(reason)
+            start, count = int(start_match.group()), int(count_match.group())
+            pos = count_match.end()
+            for num in range(start, start + count):
+                pos = self._skip(pos)
+                entry = _XREF_ENTRY_RE.match(self._buf, pos)
+                if not entry:
+                    reason = f"Bad xref entry at {pos}"
+                    raise PdfProbeError(reason)
+                offset, kind = int(entry.group(1)), entry.group(3)
+                if kind == b"n":
+                    self._add_entry(num, (0, offset))
+                else:
+                    free.append(num)
+                pos = entry.end()
+
+    def _load_xref_stream(self, pos: int) -> dict:
+        stream = self._parse_indirect(pos)
+        if not isinstance(stream, _Stream) or stream.info.get("Type") != "XRef":
+            reason = f"No xref at {pos}"
+            raise PdfProbeError(reason)
+        info = stream.info
+        widths = info["W"]
+        index = info.get("Index") or [0, info["Size"]]
+        data = self.read_stream(stream)
+        if len(data) < sum(widths) * sum(index[1::2]):
+            reason = "Short xref stream"
+            raise PdfProbeError(reason)
+        pos = 0
+        for start, count in zip(index[::2], index[1::2], strict=True):
+            for num in range(start, start + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos : pos + width], "big"))
+                    pos += width
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    self._add_entry(num, (0, fields[1]))
+                elif kind == 2:  # noqa: PLR2004
+                    self._add_entry(num, (fields[1], fields[2]))
+                elif kind == 0:
+                    self._add_entry(num, None)
+        return info
+
+    def load_xref(self) -> None:
+        """Load every cross reference section, newest first."""
+        tail = self._buf[-_STARTXREF_WINDOW:]
+        matches = list(_STARTXREF_RE.finditer(tail))
+        if not matches:
+            reason = "No startxref"
+            raise PdfProbeError(reason)
+        pos: int | None = int(matches[-1].group(1))
+        seen = set()
+        while pos is not None:
+            if pos in seen or pos >= len(self._buf):
+                reason = f"Bad xref offset {pos}"
+                raise PdfProbeError(reason)
+            seen.add(pos)
+            start = self._skip(pos)
+            if self._buf[start : start + 4] == b"xref":
+                trailer, free = self._load_xref_table(start)
+                if isinstance(xref_stm := trailer.get("XRefStm"), int):
+                    self._load_xref_stream(xref_stm)
+                for num in free:
+                    self._add_entry(num, None)
+            else:
+                trailer = self._load_xref_stream(pos)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            prev = trailer.get("Prev")
+            pos = prev if isinstance(prev, int) else None
+
+    ###########
+    # Resolve #
+    ###########
+
+    def _load_compressed(self, stream_num: int, index: int) -> Any:
+        stream = self.get(stream_num)
+        if not isinstance(stream, _Stream):
+            reason = f"Object stream {stream_num} is not a stream"
+            raise PdfProbeError(reason)
+        data = self.read_stream(stream)
+        sub = _Parser(data)
+        first = stream.info["First"]
+        pos = 0
+        offsets = []
+        for _ in range(stream.info["N"]):
+            _, pos = sub.parse(pos)
+            offset, pos = sub.parse(pos)
+            offsets.append(offset)
+        return sub.parse(first + offsets[index])[0]
+
+    def get(self, num: int) -> Any:
+        """Return an indirect object by number."""
+        if num in self._cache:
+            return self._cache[num]
+        entry = self._xref.get(num)
+        if entry is None:
+            obj = None
+        elif entry[0]:
+            obj = self._load_compressed(*entry)
+        else:
+            obj = self._parse_indirect(entry[1], num)
+        self._cache[num] = obj
+        return obj
+
+    def resolve(self, obj: Any) -> Any:
+        """Follow references to a direct object."""
+        for _ in range(_MAX_DEPTH):
+            if not isinstance(obj, _Ref):
+                return obj
+            obj = self.get(obj.num)
+        reason = "Reference loop"
+        raise PdfProbeError(reason)
+
+
+def _walk_name_tree(
+    parser: _Parser, node: Any, visit: Callable[[bytes], None], depth: int = 0
+) -> None:
+    node = parser.resolve(node)
+    if not isinstance(node, dict) or depth > _MAX_DEPTH:
+        return
+    names = parser.resolve(node.get("Names")) or []
+    for key in names[::2]:
+        visit(parser.resolve(key))
+    for kid in parser.resolve(node.get("Kids")) or []:
+        _walk_name_tree(parser, kid, visit, depth + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class PdfProbe:
+    """Page count, document info and embedded file names of a pdf."""
+
+    page_count: int
+    metadata: dict[str, str | None] = field(default_factory=dict)
+    embedded_files: tuple[str, ...] = ()
+
+    @classmethod
+    def _from_buffer(cls, buf: mmap.mmap) -> PdfProbe:
+        version = _VERSION_RE.search(buf[:_HEADER_WINDOW])
+        if not version:
+            reason = "No pdf header"
+            raise PdfProbeError(reason)
+        parser = _Parser(buf)
+        parser.load_xref()
+        trailer = parser.trailer
+        if "Encrypt" in trailer:
+            reason = "Encrypted pdf"
+            raise PdfProbeError(reason)
+        root = parser.resolve(trailer.get("Root"))
+        pages = parser.resolve(root.get("Pages")) if isinstance(root, dict) else None
+        page_count = (
+            parser.resolve(pages.get("Count")) if isinstance(pages, dict) else None
+        )
+        if not isinstance(page_count, int) or page_count < 1:
+            reason = "No page count"
+            raise PdfProbeError(reason)
+
+        info = parser.resolve(trailer.get("Info"))
+        info = info if isinstance(info, dict) else {}
+        metadata: dict[str, str | None] = {
+            "format": f"PDF {int(version.group(1))}.{int(version.group(2))}"
+        }
+        for key, info_key in _INFO_KEYS:
+            metadata[key] = _decode_text(parser.resolve(info.get(info_key)))
+        metadata["encryption"] = None
+
+        embedded_files = []
+        names = parser.resolve(root.get("Names"))
+        if isinstance(names, dict):
+            _walk_name_tree(
+                parser,
+                names.get("EmbeddedFiles"),
+                lambda key: embedded_files.append(_decode_text(key)),
+            )
+        return cls(page_count, metadata, tuple(embedded_files))
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> PdfProbe:
+        """Probe a pdf file, raising PdfProbeError if it needs MuPDF."""
+        with (
+            Path(path).open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+        ):
+            try:
+                return cls._from_buffer(buf)
+            except PdfProbeError:
+                raise
+            except (
+                AttributeError,
+                IndexError,
+                KeyError,
+                TypeError,
+                ValueError,
+                RecursionError,
+            ) as exc:
+                raise PdfProbeError(str(exc)) from exc
+
+    def pagelist(self) -> list[str]:
+        """Zero padded page names, as pdffile names them."""
+        zero_pad = floor(log10(self.page_count)) + 1
+        return [f"{i:0{zero_pad}}" for i in range(self.page_count)]
+
+    def namelist(self) -> list[str]:
+        """Embedded file names then page names, as pdffile lists them."""
+        return [*self.embedded_files, *self.pagelist()]
@@ -0,0 +1,253 @@
+"""
+Parallel pdf page rendering.
+
+Rendering pdf pages to images, and the rotation detection that decides
+whether an ``image`` read must be rendered, is CPU bound in MuPDF. When
+PdfRenderSettings.workers is raised, reads of many rendered pages, as in
+conversion to CBZ or page extraction, shard the page names into
+contiguous runs across a process pool. Each worker keeps its own open
+document and results come back in page order.
+
+The pool is opt in. Spawned workers import the caller's __main__ and
+pay for an interpreter and MuPDF each, so by default, for small reads
+and for ``pdf`` format page splits, pages render in process. Both paths
+honor the same render DPI and JPEG quality so output doesn't depend on
+the page count.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+from typing import TYPE_CHECKING
+
+from typing_extensions import Self
+
+from comicbox._pdf import PAGE_FORMAT_IMAGE, PAGE_FORMAT_PIXMAP_JPEG, PDFFile
+from comicbox.box.archive.archive import Archive
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from pdffile import PageVerdict
+    from pymupdf import Document
+
+DEFAULT_WORKERS = 1
+DEFAULT_MIN_PAGES = 16
+# Shards per worker: enough to balance uneven pages, few enough to keep
+# per shard overhead small.
+_SHARDS_PER_WORKER = 4
+_WINDOW_PER_WORKER = 2
+# Pymupdf colorspace component counts a jpeg can hold as is.
+_JPEG_COLORSPACES = frozenset({1, 3})
+_PDF_POINTS_PER_INCH = 72.0
+# Page formats that render or classify pages in MuPDF.
+_POOL_FORMATS = frozenset({PAGE_FORMAT_IMAGE, PAGE_FORMAT_PIXMAP_JPEG})
+
+RenderedPage = tuple[str, bytes, dict]
+
+
+@dataclass(frozen=True, slots=True)
+class PdfRenderSettings:
+    """Process pool size and whole page JPEG render options."""
+
+    workers: int = DEFAULT_WORKERS
+    min_pages: int = DEFAULT_MIN_PAGES
+    # None picks the page's embedded image resolution, as pdffile does.
+    dpi: int | None = None
+    # None keeps MuPDF's default JPEG quality.
+    jpeg_quality: int | None = None
+
+    @property
+    def is_default_render(self) -> bool:
+        """Do pages render exactly as pdffile would."""
+        return self.dpi is None and self.jpeg_quality is None
+
+
+class _PdfHandle:
+    """An open pdf for rendering pages."""
+
+    def __init__(
+        self,
+        path: Path | str,
+        settings: PdfRenderSettings,
+        pdf: PDFFile | None = None,
+        verdicts: Sequence[PageVerdict] | None = None,
+    ) -> None:
+        self.path = str(path)
+        self.settings = settings
+        self.verdicts = verdicts
+        # A pdf passed in belongs to the caller and stays open.
+        self._pdf: PDFFile | None = pdf
+        self._owns_pdf = pdf is None
+        self._doc: Document | None = None
+
+    def _get_pdf(self) -> PDFFile:
+        if self._pdf is None:
+            self._pdf = PDFFile(self.path)  # pyright: ignore[reportOptionalCall], # ty: ignore[call-non-callable]
+        return self._pdf
+
+    def _get_doc(self) -> Document:
+        if self._doc is None:
+            from pymupdf import Document
+
+            self._doc = Document(self.path)
+        return self._doc
+
+    def _render_jpeg(self, index: int) -> bytes:
+        """Render a whole page to JPEG with the configured dpi and quality."""
+        from pdffile import choose_pixmap_dpi
+        from pymupdf import Matrix, Pixmap, csRGB
+
+        page = self._get_doc().load_page(index)
+        dpi = self.settings.dpi or choose_pixmap_dpi(page)
+        zoom = dpi / _PDF_POINTS_PER_INCH
+        pix = page.get_pixmap(matrix=Matrix(zoom, zoom))
+        if pix.colorspace and pix.colorspace.n not in _JPEG_COLORSPACES:
+            pix = Pixmap(csRGB, pix)
+        if self.settings.jpeg_quality is None:
+            return pix.tobytes("jpeg")
+        return pix.tobytes("jpeg", jpg_quality=self.settings.jpeg_quality)
+
+    def read(self, filename: str, pdf_format: str) -> RenderedPage:
+        """Read one page or embedded file."""
+        props = {}
+        if pdf_format == PAGE_FORMAT_PIXMAP_JPEG and not (
+            self.settings.is_default_render
+        ):
+            try:
+                index = PDFFile.valid_pagenum(filename)  # pyright: ignore[reportOptionalMemberAccess], # ty: ignore[possibly-missing-attribute]
+            except ValueError:
+                pass
+            else:
+                props["ext"] = "jpeg"
+                return filename, self._render_jpeg(index), props
+        data = Archive.read(
+            self._get_pdf(), filename, None, pdf_format, props, self.verdicts
+        )
+        return filename, data, props
+
+    def close(self) -> None:
+        """Close open documents."""
+        if self._pdf is not None and self._owns_pdf:
+            self._pdf.close()
+        self._pdf = None
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self) -> Self:
+        """Context enter."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Context close."""
+        self.close()
+
+
+# One open document per worker process, reused across its shards.
+_worker_handle: _PdfHandle | None = None
+
+
+def _render_shard(
+    path: str,
+    filenames: Sequence[str],
+    pdf_format: str,
+    settings: PdfRenderSettings,
+    verdicts: Sequence[PageVerdict] | None,
+) -> list[RenderedPage]:
+    """Render a run of pages in a worker process."""
+    global _worker_handle  # noqa: PLW0603
+    if (
+        _worker_handle is None
+        or _worker_handle.path != path
+        or _worker_handle.settings != settings
+    ):
+        if _worker_handle is not None:
+            _worker_handle.close()
+        _worker_handle = _PdfHandle(path, settings)
+    _worker_handle.verdicts = verdicts
+    return [_worker_handle.read(filename, pdf_format) for filename in filenames]
+
+
+def _render_in_process(
+    path: Path | str,
+    filenames: Sequence[str],
+    pdf_format: str,
+    settings: PdfRenderSettings,
+    pdf: PDFFile | None,
+    verdicts: Sequence[PageVerdict] | None,
+) -> Generator[RenderedPage]:
+    with _PdfHandle(path, settings, pdf, verdicts) as handle:
+        for filename in filenames:
+            yield handle.read(filename, pdf_format)
+
+
+def _render_in_pool(
+    path: Path | str,
+    filenames: Sequence[str],
+    pdf_format: str,
+    settings: PdfRenderSettings,
+    verdicts: Sequence[PageVerdict] | None,
+) -> Generator[RenderedPage]:
+    workers = min(settings.workers, len(filenames))
+    shard_size = ceil(len(filenames) / (workers * _SHARDS_PER_WORKER))
+    shards = [
+        filenames[start : start + shard_size]
+        for start in range(0, len(filenames), shard_size)
+    ]
+    # Spawned workers don't inherit MuPDF state or the caller's threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # Only a window of shards is in flight so rendered pages don't pile
+        # up ahead of a slow consumer.
+        pending: deque[Future[list[RenderedPage]]] = deque()
+        try:
+            for shard in shards:
+                pending.append(
+                    executor.submit(
+                        _render_shard,
+                        str(path),
+                        shard,
+                        pdf_format,
+                        settings,
+                        verdicts,
+                    )
+                )
+                if len(pending) >= workers * _WINDOW_PER_WORKER:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def render_pages(
+    path: Path | str,
+    filenames: Sequence[str],
+    pdf_format: str,
+    settings: PdfRenderSettings,
+    pdf: PDFFile | None = None,
+    verdicts: Sequence[PageVerdict] | None = None,
+) -> Generator[RenderedPage]:
+    """
+    Generate (filename, data, props) for pdf pages in order.
+
+    Only rendered page formats use the process pool, and only when the
+    settings ask for more than one worker. An open pdf is reused for
+    reads that stay in process. Page verdicts, when given, spare workers
+    classifying pages again.
+    """
+    if (
+        settings.workers > 1
+        and pdf_format in _POOL_FORMATS
+        and len(filenames) >= max(settings.min_pages, 2)
+    ):
+        return _render_in_pool(path, filenames, pdf_format, settings, verdicts)
+    return _render_in_process(path, filenames, pdf_format, settings, pdf, verdicts)
@@ -0,0 +1,193 @@
+"""
+Process wide pool of open archives for long lived hosts.
+
+Hosts that serve pages open a box per request. Without a pool every
+request reopens the archive and rebuilds its listings. A box created with
+``Comicbox(path, pool=pool)`` takes the idle open state for its path from
+the pool, if the file is unchanged, and hands it back on close() instead
+of closing it.
+
+Each pooled archive is used by one box at a time; a box that finds its
+path already checked out opens the archive as usual. Entries are keyed by
+path and validated against the file fingerprint on the way out and on the
+way back, so a rewritten archive is closed rather than served. Idle
+entries are evicted least recently used first past a handle count or an
+estimated memory budget.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from typing_extensions import Self
+
+from comicbox.read_cache import file_fingerprint
+
+if TYPE_CHECKING:
+    from mmap import mmap
+    from pathlib import Path
+
+    from comicbox.box.archive.archiveinfo import InfoType
+    from comicbox.box.archive.tarindex import TarIndex, TarStreamReader
+    from comicbox.box.archive.zipdir import ZipDirectory
+    from comicbox.box.types import ArchiveType
+    from comicbox.read_cache import Fingerprint
+
+DEFAULT_MAX_HANDLES = 32
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Rough sizes for the memory estimate.
+_ENTRY_BYTES = 4 * 1024
+_MEMBER_BYTES = 512
+_CHECKPOINT_BYTES = 48 * 1024
+
+
+@dataclass
+class PooledArchive:
+    """Open archive state handed between boxes."""
+
+    archive: ArchiveType | None = None
+    namelist: tuple[str, ...] | None = None
+    infolist: tuple[InfoType, ...] | None = None
+    zipdir: ZipDirectory | None = None
+    tar_index: TarIndex | None = None
+    tar_reader: TarStreamReader | None = None
+    mmap: mmap | None = None
+
+    def is_empty(self) -> bool:
+        """Is there nothing worth pooling."""
+        return not any(
+            value is not None
+            for value in (
+                self.archive,
+                self.namelist,
+                self.infolist,
+                self.zipdir,
+                self.tar_index,
+                self.tar_reader,
+                self.mmap,
+            )
+        )
+
+    def estimate_size(self) -> int:
+        """Estimate the memory held, not counting mapped file pages."""
+        members = max(
+            len(self.namelist or ()),
+            len(self.infolist or ()),
+            len(self.zipdir or ()),
+            len(self.tar_index.members) if self.tar_index else 0,
+        )
+        size = _ENTRY_BYTES + members * _MEMBER_BYTES
+        if self.tar_reader is not None:
+            size += self.tar_reader.checkpoint_count() * _CHECKPOINT_BYTES
+        return size
+
+    def close(self) -> None:
+        """Close every open handle."""
+        try:
+            if self.archive is not None and hasattr(self.archive, "close"):
+                self.archive.close()
+            if self.tar_reader is not None:
+                self.tar_reader.close()
+        except Exception as exc:
+            logger.warning(f"closing pooled archive: {exc}")
+        if self.mmap is not None:
+            with suppress(BufferError):
+                self.mmap.close()
+
+
+class ArchivePool:
+    """Thread safe LRU pool of open archives keyed by path."""
+
+    def __init__(
+        self, max_handles: int = DEFAULT_MAX_HANDLES, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize the limits."""
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Fingerprint, PooledArchive, int]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of idle pooled archives."""
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Return the estimated memory held by idle pooled archives."""
+        return self._size
+
+    def _pop(self, key: str) -> tuple[Fingerprint, PooledArchive, int] | None:
+        if item := self._entries.pop(key, None):
+            self._size -= item[2]
+        return item
+
+    def checkout(self, path: Path | str) -> tuple[Fingerprint, PooledArchive | None]:
+        """Take the idle state for an unchanged path out of the pool."""
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            item = self._pop(str(path))
+            if item and item[0] == fingerprint:
+                self.hits += 1
+                return fingerprint, item[1]
+            self.misses += 1
+        if item:
+            item[1].close()
+        return fingerprint, None
+
+    def checkin(
+        self, path: Path | str, fingerprint: Fingerprint, pooled: PooledArchive
+    ) -> None:
+        """Return state to the pool, closing it if the file has changed."""
+        try:
+            current = file_fingerprint(path)
+        except OSError:
+            current = None
+        if current != fingerprint:
+            pooled.close()
+            return
+        size = pooled.estimate_size()
+        evicted = []
+        with self._lock:
+            if old := self._pop(str(path)):
+                evicted.append(old[1])
+            self._entries[str(path)] = (fingerprint, pooled, size)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_handles or self._size > self.max_bytes
+            ):
+                _, (_, lru, lru_size) = self._entries.popitem(last=False)
+                self._size -= lru_size
+                evicted.append(lru)
+        for entry in evicted:
+            entry.close()
+
+    def clear(self) -> None:
+        """Close and forget every idle pooled archive."""
+        with self._lock:
+            entries = [pooled for _, pooled, _ in self._entries.values()]
+            self._entries.clear()
+            self._size = 0
+        for pooled in entries:
+            pooled.close()
+
+    def close(self) -> None:
+        """Close every idle pooled archive."""
+        self.clear()
+
+    def __enter__(self) -> Self:
+        """Context enter."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Context close."""
+        self.close()
@@ -0,0 +1,220 @@
+"""
+Read ahead for sequential page readers.
+
+Comic readers turn pages in order, so once page N is served the next few
+are all but certain to be asked for. A prefetcher reads pages N+1..N+k on
+a background thread into a byte budgeted LRU, so page turns are answered
+from memory. CB7 and CBR pages read ahead in one batch, which costs one
+decompression pass or one unrar run instead of one per page.
+
+Archive objects are not thread safe, so every read of the box, on demand
+or ahead, runs on the prefetcher's single thread. A jump to a page that
+doesn't follow the last one cancels read ahead that hasn't been served;
+read ahead resumes with the next sequential page.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from loguru import logger
+from typing_extensions import Self
+
+from comicbox.enums.comicbox import FileTypeEnum
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+    from comicbox.box.archive.pages import ComicboxArchivePages
+
+DEFAULT_AHEAD = 4
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# Archive types that read many pages in one pass much faster than singly.
+_BATCH_FILE_TYPES = frozenset({FileTypeEnum.CB7, FileTypeEnum.CBR})
+
+
+class PagePrefetcher:
+    """Serve pages by index, reading ahead of sequential access."""
+
+    def __init__(
+        self,
+        box: ComicboxArchivePages,
+        ahead: int = DEFAULT_AHEAD,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        pdf_format: str = "",
+    ) -> None:
+        """Start the read thread."""
+        self._box = box
+        self._pagenames = box.get_page_filenames()
+        self.ahead = ahead
+        self.memory_limit = memory_limit
+        self._pdf_format = pdf_format
+        self._lock = Lock()
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._cache_size = 0
+        self._pending: dict[int, Future[bytes]] = {}
+        self._last_index: int | None = None
+        self._executor: ThreadPoolExecutor | None = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="comicbox-prefetch"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    ##########
+    # Worker #
+    ##########
+
+    def _store(self, index: int, data: bytes) -> None:
+        """Admit a page to the LRU, evicting the least recently used."""
+        with self._lock:
+            if index in self._cache:
+                self._cache_size -= len(self._cache.pop(index))
+            self._cache[index] = data
+            self._cache_size += len(data)
+            # The newest page always stays, even over budget.
+            while self._cache_size > self.memory_limit and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_size -= len(evicted)
+
+    def _resolve(self, index: int, future: Future[bytes], data: bytes) -> None:
+        self._store(index, data)
+        with self._lock:
+            self._pending.pop(index, None)
+        future.set_result(data)
+
+    def _fail(self, index: int, future: Future[bytes], exc: Exception) -> None:
+        with self._lock:
+            self._pending.pop(index, None)
+        if not future.done():
+            future.set_exception(exc)
+
+    def _read_batch(self, claimed: Sequence[tuple[int, Future[bytes]]]) -> None:
+        """Read claimed pages in one pass."""
+        try:
+            names = [self._pagenames[index] for index, _ in claimed]
+            pages = self._box._archive_readfiles(names, pdf_format=self._pdf_format)  # noqa: SLF001
+            for (index, future), (_, data, _) in zip(claimed, pages, strict=True):
+                self._resolve(index, future, data)
+        except Exception as exc:
+            for index, future in claimed:
+                self._fail(index, future, exc)
+
+    def _read(self, batch: Sequence[tuple[int, Future[bytes]]]) -> None:
+        """Read a run of pages on the worker thread and resolve their futures."""
+        if len(batch) > 1 and self._box._file_type in _BATCH_FILE_TYPES:  # noqa: SLF001
+            claimed = [
+                (index, future)
+                for index, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            self._read_batch(claimed)
+            return
+        # Claimed one at a time so a jump cancels the pages not yet read.
+        for index, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                data = self._box.get_page_by_filename(
+                    self._pagenames[index], pdf_format=self._pdf_format
+                )
+            except Exception as exc:
+                self._fail(index, future, exc)
+            else:
+                self._resolve(index, future, data)
+
+    def _submit(self, indexes: Sequence[int]) -> dict[int, Future[bytes]]:
+        """Queue reads of pages, called with the lock held."""
+        if self._executor is None:
+            reason = "Page prefetcher is closed."
+            raise RuntimeError(reason)
+        futures = {index: Future() for index in indexes}
+        self._pending.update(futures)
+        self._executor.submit(self._read, tuple(futures.items()))
+        return futures
+
+    ##########
+    # Client #
+    ##########
+
+    def _cancel_pending(self, keep: int) -> None:
+        """Drop read ahead the reader has jumped away from."""
+        for index, future in tuple(self._pending.items()):
+            if index != keep and future.cancel():
+                del self._pending[index]
+
+    def _read_ahead(self, index: int) -> None:
+        """Queue the pages after index that aren't cached or queued."""
+        end = min(index + 1 + self.ahead, len(self._pagenames))
+        indexes = [
+            i
+            for i in range(index + 1, end)
+            if i not in self._cache and i not in self._pending
+        ]
+        if indexes:
+            self._submit(indexes)
+
+    def _get_cached_or_future(self, index: int) -> bytes | Future[bytes]:
+        with self._lock:
+            sequential = self._last_index is None or index == self._last_index + 1
+            if not sequential:
+                self._cancel_pending(index)
+            if (data := self._cache.get(index)) is not None:
+                self._cache.move_to_end(index)
+                self.hits += 1
+                result: bytes | Future[bytes] = data
+            elif (future := self._pending.get(index)) is not None:
+                self.hits += 1
+                result = future
+            else:
+                self.misses += 1
+                result = self._submit((index,))[index]
+            self._last_index = index
+            if sequential:
+                self._read_ahead(index)
+        return result
+
+    def get_page(self, index: int) -> bytes | None:
+        """Return a page by index, or None if there is no such page."""
+        if not 0 <= index < len(self._pagenames):
+            return None
+        result = self._get_cached_or_future(index)
+        if isinstance(result, bytes):
+            return result
+        try:
+            return result.result()
+        except CancelledError:
+            # Cancelled by a concurrent jump; read it on demand.
+            logger.debug(f"{self._box._path} page {index} read ahead cancelled")  # noqa: SLF001
+            with self._lock:
+                future = self._submit((index,))[index]
+            return future.result()
+
+    def iter_pages(self, start: int = 0) -> Generator[bytes]:
+        """Generate pages in order from start."""
+        for index in range(start, len(self._pagenames)):
+            page = self.get_page(index)
+            if page is not None:
+                yield page
+
+    def close(self) -> None:
+        """Cancel read ahead, wait for the read in progress and free the cache."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._cancel_pending(-1)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._pending.clear()
+            self._cache.clear()
+            self._cache_size = 0
+
+    def __enter__(self) -> Self:
+        """Context enter."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Context close."""
+        self.close()
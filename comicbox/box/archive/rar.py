@@ -0,0 +1,82 @@
+"""
+Batched rar member reads.
+
+rarfile runs a separate unrar process for every member it reads. Reading
+or extracting many members instead extracts them all with one unrar
+invocation into a temporary directory and reads or moves them from there.
+The member names go to unrar in a listfile rather than as arguments, so a
+large archive can't overflow the command line length limit.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+import rarfile
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+# unrar treats these as wildcards in member arguments and has no escape.
+_WILDCARDS = frozenset("*?")
+
+
+def _unrar_cmdline(
+    archive_path: Path, filenames: Sequence[str], dest: Path, listfile: Path
+) -> list:
+    # -scul reads the listfile as UTF-16 whatever the system code page is.
+    cmdline = [rarfile.UNRAR_TOOL, "x", "-inul", "-o+", "-y", "-p-", "-scul", "--"]
+    cmdline.append(str(archive_path))
+    names = frozenset(filenames)
+    if not any(_WILDCARDS.intersection(name) for name in names):
+        # Otherwise extract everything rather than risk a wildcard match.
+        lines = (name.replace("/", os.path.sep) for name in sorted(names))
+        listfile.write_text("\n".join(lines) + "\n", encoding="utf-16")
+        cmdline.append(f"@{listfile}")
+    cmdline.append(str(dest) + os.path.sep)
+    return cmdline
+
+
+def _unrar(
+    archive_path: Path, filenames: Sequence[str], dest: Path, listfile: Path
+) -> None:
+    cmdline = _unrar_cmdline(archive_path, filenames, dest, listfile)
+    proc = rarfile.custom_popen(cmdline)
+    out, _ = proc.communicate()
+    rarfile.check_returncode(proc.returncode, out, rarfile.UNRAR_CONFIG["errmap"])
+
+
+def extract_many(
+    archive_path: Path, filenames: Sequence[str], tmp_parent: Path | None = None
+) -> Generator[tuple[str, Path | None]]:
+    """
+    Extract members with one unrar run and generate their paths in order.
+
+    The paths lie in a temporary directory under tmp_parent that is removed
+    when the generator finishes, so callers move files they keep. Members
+    unrar didn't write where expected, such as links or names it
+    sanitized, generate None so the caller can read them another way.
+    """
+    with TemporaryDirectory(prefix="comicbox-", dir=tmp_parent) as tmp_dir:
+        # Keep the listfile out of the way of the extracted members.
+        root = Path(tmp_dir).resolve()
+        dest = root / "members"
+        dest.mkdir()
+        _unrar(archive_path, filenames, dest, root / "members.lst")
+        for filename in filenames:
+            path = dest / filename
+            if path.is_file() and path.resolve().is_relative_to(dest):
+                yield filename, path
+            else:
+                yield filename, None
+
+
+def read_many(
+    archive_path: Path, filenames: Sequence[str], spill_dir: Path | None = None
+) -> Generator[tuple[str, bytes | None]]:
+    """Extract members with one unrar run and generate them in the requested order."""
+    for filename, path in extract_many(archive_path, filenames, spill_dir):
+        yield filename, path.read_bytes() if path else None
@@ -2,31 +2,155 @@
 
 from __future__ import annotations
 
+import mmap
 import shutil
+from collections.abc import Sequence
+from io import BufferedReader
 from pathlib import Path
-from sys import maxsize
 from typing import TYPE_CHECKING, cast
+from zipfile import ZIP_STORED
 
+from loguru import logger
+
+from comicbox._pdf import PAGE_FORMAT_IMAGE
 from comicbox.box.archive.archive import Archive
+from comicbox.box.archive.imagesize import HEAD_SIZES, image_size
 from comicbox.box.archive.init import ComicboxArchiveInit
+from comicbox.box.archive.pdfprobe import PdfProbe
+from comicbox.box.archive.tarindex import TarIndex, TarStreamReader
+from comicbox.box.archive.zipdir import ZipDirectory, ZipEntry, member_data_offset
 from comicbox.enums.comicbox import FileTypeEnum
 from comicbox.exceptions import ArchiveError, UnsupportedArchiveTypeError
+from comicbox.read_cache import file_fingerprint
 
 if TYPE_CHECKING:
-    from pdffile import PDFFile
-    from py7zr.io import BytesIOFactory
+    from collections.abc import Generator, Iterable
+    from tarfile import TarFile
+    from zipfile import ZipInfo
+
+    from pdffile import PageVerdict, PDFFile
+    from py7zr import SevenZipFile
+    from rarfile import RarFile
+    from zipremove import ZipFile
 
     from comicbox.box.archive.archiveinfo import InfoType
+    from comicbox.box.archive.pdfrender import PdfRenderSettings
+    from comicbox.box.archive.sevenzip import PageBufferFactory, PageBufferStats
+
+_MASK_ENCRYPTED = 0x1
+_TAR_INDEX_KIND = "tar"
+_PDF_VERDICTS_KIND = "pdf-verdicts"
 
 
 class ComicboxArchiveRead(ComicboxArchiveInit):
     """Comic archive read methods."""
 
+    # Bytes of extracted CB7 members a batch read holds in memory before
+    # the rest spill to temporary files.
+    READ_MANY_MEMORY_LIMIT = 256 * 1024 * 1024
+    # Process pool and render options for reading many pdf pages. None
+    # uses PdfRenderSettings defaults.
+    PDF_RENDER_SETTINGS: PdfRenderSettings | None = None
+    # Bytes of CB7 members read one at a time kept in memory for reading
+    # again, and kept in temporary files once pushed out of memory.
+    CB7_BUFFER_MEMORY_LIMIT = 64 * 1024 * 1024
+    CB7_BUFFER_SPILL_LIMIT = 0
+
     def _ensure_read_archive(self) -> None:
         if not self._archive_cls or not self._path:
             reason = "Cannot read archive without a path."
             raise ArchiveError(reason)
 
+    def _get_zip_directory(self) -> ZipDirectory | None:
+        """
+        Return the lightweight central directory table for a CBZ.
+
+        Used for listings and the comment until member bytes are needed.
+        Once the ZipFile is open anyway its own directory is reused, and
+        anything the table can't parse falls back to ZipFile so errors
+        surface exactly as before.
+        """
+        if (
+            self._zipdir is None
+            and self._archive is None
+            and self._file_type == FileTypeEnum.CBZ
+            and self._path
+        ):
+            try:
+                self._zipdir: ZipDirectory | None = ZipDirectory.from_path(self._path)
+            except Exception as exc:
+                logger.debug(f"{self._path} central directory table failed: {exc}")
+        return self._zipdir
+
+    def _load_tar_index(self, path: Path) -> TarIndex:
+        if self._read_cache is None:
+            return TarIndex.from_path(path)
+        fingerprint = file_fingerprint(path)
+        tar_index = self._read_cache.get_index(path, fingerprint, _TAR_INDEX_KIND)
+        if not isinstance(tar_index, TarIndex):
+            tar_index = TarIndex.from_path(path)
+            self._read_cache.set_index(path, fingerprint, _TAR_INDEX_KIND, tar_index)
+        return tar_index
+
+    def _get_tar_index(self) -> TarIndex | None:
+        """
+        Return the member offset index for a CBT.
+
+        Comes from the read cache when the box has one and the archive is
+        unchanged, otherwise from one walk of the archive. Anything the
+        index can't be built for falls back to TarFile.
+        """
+        if (
+            self._tar_index is None
+            and self._file_type == FileTypeEnum.CBT
+            and self._path
+        ):
+            try:
+                self._tar_index: TarIndex | None = self._load_tar_index(self._path)
+            except Exception as exc:
+                logger.debug(f"{self._path} tar index failed: {exc}")
+        return self._tar_index
+
+    def _get_pdf_probe(self) -> PdfProbe | None:
+        """
+        Return the page count, metadata and names of an unopened pdf.
+
+        Read straight from the pdf's cross reference table and trailer,
+        without MuPDF. Once the pdf is open, or for anything the probe
+        doesn't understand, MuPDF answers instead.
+        """
+        if (
+            self._pdf_probe is None
+            and self._archive_is_pdf
+            and self._archive is None
+            and self._path
+        ):
+            try:
+                self._pdf_probe: PdfProbe | None = PdfProbe.from_path(self._path)
+            except (OSError, ValueError) as exc:
+                logger.debug(f"{self._path} pdf probe failed: {exc}")
+        return self._pdf_probe
+
+    def _archive_read_tar_member(
+        self, filename: str, size: int | None = None
+    ) -> bytes | None:
+        """Read a regular CBT member, or its first size bytes, through the index."""
+        tar_index = self._get_tar_index()
+        if (
+            tar_index is None
+            or tar_index.compression is None
+            or (info := tar_index.getmember(filename)) is None
+            or not info.isreg()
+            or info.issparse()
+        ):
+            return None
+        if self._tar_reader is None:
+            self._tar_reader: TarStreamReader | None = TarStreamReader(
+                cast("Path", self._path), tar_index.compression
+            )
+        length = info.size if size is None else min(size, info.size)
+        return self._tar_reader.read(info.offset_data, length)
+
     def namelist(self) -> tuple[str, ...]:
         """Get list of files in the archive."""
         self._ensure_read_archive()
@@ -38,8 +162,14 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
                     self._get_info_fn(i) for i in self._infolist
                 )
             else:
-                archive = self._get_archive()
-                namelist = Archive.namelist(archive)
+                if (zipdir := self._get_zip_directory()) is not None:
+                    namelist = zipdir.namelist()
+                elif (tar_index := self._get_tar_index()) is not None:
+                    namelist = tar_index.namelist()
+                elif (pdf_probe := self._get_pdf_probe()) is not None:
+                    namelist = pdf_probe.namelist()
+                else:
+                    namelist = Archive.namelist(self._get_archive())
                 # SORTED CASE INSENSITIVELY
                 self._namelist = tuple(sorted(namelist, key=lambda x: x.lower()))
         return self._namelist
@@ -50,12 +180,21 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
     def _get_info_size(self, info: InfoType) -> int | None:
         return getattr(info, self._info_size_attr) if self._info_size_attr else None
 
-    def infolist(self) -> tuple[InfoType, ...]:
-        """Get info list of members from the archive."""
+    def _get_infolist(self) -> tuple[InfoType, ...]:
+        """
+        Get the cached info list of members.
+
+        CBZ members are ZipEntry rows from the central directory table,
+        which have the names, sizes, dates and flags internal reads need.
+        """
         self._ensure_read_archive()
         if not self._infolist:
-            archive = self._get_archive()
-            infolist = Archive.infolist(archive)
+            if (zipdir := self._get_zip_directory()) is not None:
+                infolist = zipdir.infolist()
+            elif (tar_index := self._get_tar_index()) is not None:
+                infolist = tar_index.members
+            else:
+                infolist = Archive.infolist(self._get_archive())
             # SORTED CASE INSENSITIVELY
             infolist = tuple(
                 sorted(infolist, key=lambda i: self._get_info_fn(i).lower())
@@ -63,6 +202,19 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
             self._infolist = infolist
         return self._infolist
 
+    def infolist(self) -> tuple[InfoType, ...]:
+        """Get info list of members from the archive."""
+        infolist = self._get_infolist()
+        if infolist and isinstance(infolist[0], ZipEntry):
+            # Callers get full ZipInfos, built when first asked for.
+            if self._zipinfolist is None:
+                archive = cast("ZipFile", self._get_archive())
+                self._zipinfolist = tuple(
+                    sorted(archive.infolist(), key=lambda i: i.filename.lower())
+                )
+            infolist = self._zipinfolist
+        return infolist
+
     @classmethod
     def check_unrar_executable(cls) -> bool:
         """Check for the unrar executable."""
@@ -84,18 +236,72 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
         except UnsupportedArchiveTypeError:
             return False
 
-    def _get_7zfactory(self) -> BytesIOFactory | None:
+    def _get_7zfactory(self) -> PageBufferFactory | None:
         # Use the file-type enum rather than `self._archive_cls == SevenZipFile`
         # so the py7zr import only fires when we actually have a CB7.
         if not self._7zfactory and self._file_type == FileTypeEnum.CB7:
-            from py7zr.io import BytesIOFactory
+            from comicbox.box.archive.sevenzip import PageBufferFactory
 
-            self._7zfactory: BytesIOFactory | None = BytesIOFactory(maxsize)
+            self._7zfactory: PageBufferFactory | None = PageBufferFactory(
+                self.CB7_BUFFER_MEMORY_LIMIT, self.CB7_BUFFER_SPILL_LIMIT
+            )
         return self._7zfactory
 
+    def get_cb7_buffer_stats(self) -> PageBufferStats | None:
+        """Return CB7 page buffer hits, misses and sizes, or None if unused."""
+        return self._7zfactory.stats if self._7zfactory else None
+
     def _get_pdf_format(self, pdf_format: str = "", default: str = "") -> str:
         return pdf_format or (self._config.convert.pdf_pages or default)
 
+    def _classify_pdf_pages(self) -> tuple[PageVerdict, ...]:
+        """Classify every page of the pdf in one pass."""
+        from pdffile import PDF_FALLBACK_VERDICT
+
+        pdf = cast("PDFFile", self._get_archive())
+        verdicts = []
+        for index in range(pdf.get_page_count()):
+            try:
+                verdict = pdf.classify_page(index)
+            except Exception as exc:
+                logger.warning(
+                    f"Rotation detection failed for pdf page {index} of "
+                    f"{self._path}, extracting as stored: {exc}"
+                )
+                verdict = PDF_FALLBACK_VERDICT
+            verdicts.append(verdict)
+        return tuple(verdicts)
+
+    def _get_pdf_page_verdicts(self) -> tuple[PageVerdict, ...] | None:
+        """
+        Return how each pdf page is served, as classified by pdffile.
+
+        Image reads consult the verdicts for page rotation. They come from
+        the read cache when the box has one and the pdf is unchanged,
+        otherwise from classifying every page once.
+        """
+        if self._pdf_page_verdicts is None and self._archive_is_pdf and self._path:
+            fingerprint = None
+            if self._read_cache is not None:
+                fingerprint = file_fingerprint(self._path)
+                verdicts = self._read_cache.get_index(
+                    self._path, fingerprint, _PDF_VERDICTS_KIND
+                )
+                if isinstance(verdicts, tuple):
+                    self._pdf_page_verdicts = verdicts
+                    return verdicts
+            self._pdf_page_verdicts: tuple[PageVerdict, ...] | None = (
+                self._classify_pdf_pages()
+            )
+            if self._read_cache is not None and fingerprint is not None:
+                self._read_cache.set_index(
+                    self._path,
+                    fingerprint,
+                    _PDF_VERDICTS_KIND,
+                    self._pdf_page_verdicts,
+                )
+        return self._pdf_page_verdicts
+
     def _archive_read_pdf_range(
         self, index_from: int, index_to: int, props: dict | None = None
     ) -> bytes:
@@ -119,12 +325,22 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
         if Path(filename).is_dir():
             return data
         self._ensure_read_archive()
+        if (tar_data := self._archive_read_tar_member(filename)) is not None:
+            return tar_data
         archive = self._get_archive()
         factory = self._get_7zfactory()
         pdf_format = self._get_pdf_format(pdf_format)
+        verdicts = (
+            self._get_pdf_page_verdicts() if pdf_format == PAGE_FORMAT_IMAGE else None
+        )
         try:
             data = Archive.read(
-                archive, filename, factory, pdf_format=pdf_format, props=props
+                archive,
+                filename,
+                factory,
+                pdf_format=pdf_format,
+                props=props,
+                pdf_verdicts=verdicts,
             )
         except Exception as exc:
             # BadRarFile only originates from CBR reads; the lazy import
@@ -137,10 +353,234 @@ class ComicboxArchiveRead(ComicboxArchiveInit):
             raise
         return data
 
+    def _archive_readfiles_batch(
+        self, filenames: Sequence[str]
+    ) -> Generator[tuple[str, bytes | None]] | None:
+        """Return a generator reading CB7 or CBR members in one pass, or None."""
+        if self._file_type == FileTypeEnum.CB7:
+            from comicbox.box.archive.sevenzip import read_many
+
+            self._ensure_read_archive()
+            archive = cast("SevenZipFile", self._get_archive())
+            return read_many(archive, filenames, self.READ_MANY_MEMORY_LIMIT)
+        if (
+            self._file_type == FileTypeEnum.CBR
+            and self._path
+            and self.is_unrar_supported()
+        ):
+            from comicbox.box.archive.rar import read_many
+
+            return read_many(self._path, filenames)
+        return None
+
+    def _archive_render_pdf_pages(
+        self, filenames: Sequence[str], pdf_format: str
+    ) -> Generator[tuple[str, bytes, dict]] | None:
+        """Return a generator rendering many pdf pages, or None."""
+        if not self._archive_is_pdf or not self._path:
+            return None
+        from comicbox.box.archive.pdfrender import PdfRenderSettings, render_pages
+
+        self._ensure_read_archive()
+        settings = self.PDF_RENDER_SETTINGS or PdfRenderSettings()
+        pdf = cast("PDFFile", self._get_archive())
+        pdf_format = self._get_pdf_format(pdf_format)
+        verdicts = (
+            self._get_pdf_page_verdicts() if pdf_format == PAGE_FORMAT_IMAGE else None
+        )
+        return render_pages(
+            self._path, filenames, pdf_format, settings, pdf=pdf, verdicts=verdicts
+        )
+
+    def _archive_readfiles(
+        self, filenames: Iterable[str], pdf_format: str = ""
+    ) -> Generator[tuple[str, bytes, dict]]:
+        """
+        Generate (filename, data, props) for archive files in order.
+
+        Several CB7 members are decompressed in one pass instead of one
+        pass each, several CBR members come from a single unrar run
+        instead of one run each and many pdf pages render across a
+        process pool. Everything else, including lazy generators of names,
+        is read one file at a time.
+        """
+        if isinstance(filenames, Sequence) and len(filenames) > 1:
+            rendered = self._archive_render_pdf_pages(filenames, pdf_format)
+            if rendered is not None:
+                yield from rendered
+                return
+            if (batch := self._archive_readfiles_batch(filenames)) is not None:
+                for filename, data in batch:
+                    if data is None:
+                        yield filename, self._archive_readfile(filename), {}
+                    else:
+                        yield filename, data, {}
+                return
+        for filename in filenames:
+            props = {}
+            data = self._archive_readfile(filename, pdf_format=pdf_format, props=props)
+            yield filename, data, props
+
+    def _archive_read_head(self, filename: str, size: int) -> bytes:
+        """
+        Read up to size bytes from the start of a member.
+
+        Members stored verbatim are sliced from the file, compressed CBZ
+        and CBR members decompress through a stream that stops after size
+        bytes and CBT members read through the tar index. A CB7 member
+        can't be streamed on its own so is read whole. For many CB7 or CBR
+        members use _archive_read_image_sizes, which reads them in one pass.
+        """
+        self._ensure_read_archive()
+        if (span := self._archive_span(filename)) is not None:
+            offset, length = span
+            return self._get_mmap()[offset : offset + min(size, length)]
+        if (tar_data := self._archive_read_tar_member(filename, size)) is not None:
+            return tar_data
+        if self._file_type in (FileTypeEnum.CBZ, FileTypeEnum.CBR):
+            archive = cast("ZipFile | RarFile", self._get_archive())
+            with archive.open(filename) as member:
+                return member.read(size)
+        return self._archive_readfile(filename)[:size]
+
+    def _archive_read_image_size(self, filename: str) -> tuple[int, int] | None:
+        """Return a member image's (width, height) from its header bytes."""
+        for size in HEAD_SIZES:
+            head = self._archive_read_head(filename, size)
+            try:
+                return image_size(head)
+            except EOFError:
+                if len(head) < size:
+                    break
+        return None
+
+    def _archive_read_image_sizes(
+        self, filenames: Sequence[str]
+    ) -> Generator[tuple[str, tuple[int, int] | None]]:
+        """
+        Generate (filename, (width, height) or None) for member images.
+
+        CB7 and CBR members are read in one batch, as reading each head
+        alone decompresses a solid archive again or runs unrar again for
+        every member. Other archives read each member's head. A member
+        that can't be read or measured gets None.
+        """
+        done = set()
+        batch = self._archive_readfiles_batch(filenames) if len(filenames) > 1 else None
+        if batch is not None:
+            try:
+                for filename, data in batch:
+                    if data is None:
+                        continue
+                    done.add(filename)
+                    try:
+                        dimensions = image_size(data[: HEAD_SIZES[-1]])
+                    except Exception as exc:
+                        logger.debug(f"{self._path}: {filename} image size: {exc}")
+                        dimensions = None
+                    yield filename, dimensions
+            except Exception as exc:
+                logger.debug(f"{self._path} batch image size read: {exc}")
+        for filename in filenames:
+            if filename in done:
+                continue
+            try:
+                dimensions = self._archive_read_image_size(filename)
+            except Exception as exc:
+                logger.debug(f"{self._path}: {filename} image size: {exc}")
+                dimensions = None
+            yield filename, dimensions
+
+    def _get_mmap(self) -> mmap.mmap:
+        """Map the whole archive read only, once per open box."""
+        if self._mmap is None:
+            self._ensure_read_archive()
+            with cast("Path", self._path).open("rb") as f:
+                self._mmap: mmap.mmap | None = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        return self._mmap
+
+    def _get_zip_member(self, filename: str) -> ZipEntry | ZipInfo | None:
+        """Return the central directory entry for a CBZ member."""
+        zipdir = self._get_zip_directory()
+        try:
+            if zipdir is not None:
+                return zipdir.getinfo(filename)
+            return cast("ZipFile", self._get_archive()).getinfo(filename)
+        except KeyError:
+            return None
+
+    def _archive_stored_view(self, filename: str) -> memoryview | None:
+        """
+        Return a zero copy view of a STORED CBZ member, or None.
+
+        The view slices the archive's memory map at the member's data
+        offset. Unlike ZipFile.read the CRC is not checked, since that
+        would touch every byte the view exists to avoid copying.
+        """
+        if self._file_type != FileTypeEnum.CBZ or not (
+            span := self._archive_zip_span(filename)
+        ):
+            return None
+        offset, length = span
+        return memoryview(self._get_mmap())[offset : offset + length]
+
+    def _archive_zip_span(self, filename: str) -> tuple[int, int] | None:
+        info = self._get_zip_member(filename)
+        if (
+            info is None
+            or info.compress_type != ZIP_STORED
+            or info.flag_bits & _MASK_ENCRYPTED
+        ):
+            return None
+        offset = member_data_offset(self._get_mmap(), info.header_offset)
+        return offset, info.compress_size
+
+    def _archive_tar_span(self, filename: str) -> tuple[int, int] | None:
+        tar_index = self._get_tar_index()
+        if tar_index is None:
+            archive = cast("TarFile", self._get_archive())
+            if not isinstance(archive.fileobj, BufferedReader):
+                return None
+            try:
+                info = archive.getmember(filename)
+            except KeyError:
+                return None
+        elif tar_index.compression != "":
+            # Compressed member offsets don't index the file on disk.
+            return None
+        else:
+            info = tar_index.getmember(filename)
+        if info is None or not info.isreg() or info.issparse():
+            return None
+        return info.offset_data, info.size
+
+    def _archive_span(self, filename: str) -> tuple[int, int] | None:
+        """
+        Return the (offset, length) of a member's raw bytes in the archive file.
+
+        Only STORED zip members and members of uncompressed tars lie in
+        the file verbatim; everything else returns None.
+        """
+        if self._file_type == FileTypeEnum.CBZ:
+            return self._archive_zip_span(filename)
+        if self._file_type == FileTypeEnum.CBT:
+            return self._archive_tar_span(filename)
+        return None
+
+    def _get_raw_comment(self) -> bytes | str:
+        """Get the comment as the archive library reports it."""
+        if (zipdir := self._get_zip_directory()) is not None:
+            return zipdir.comment
+        if self._get_tar_index() is not None:
+            # Tars have no comment.
+            return b""
+        return getattr(self._get_archive(), "comment", b"")
+
     def _get_comment(self) -> bytes:
         """Get the comment from the archive."""
-        archive = self._get_archive()
-        comment = getattr(archive, "comment", b"")
+        comment = self._get_raw_comment()
         if isinstance(comment, str):
             comment = comment.encode(errors="replace")
         return comment
@@ -0,0 +1,308 @@
+"""
+Batched 7zip member reads.
+
+py7zr decompresses a solid block from its start every time extract() runs,
+so reading members one at a time re-decodes the block for every member.
+Extracting every wanted member in a single pass decodes each block once.
+Extracted members are kept in memory up to a byte budget shared by the
+whole batch; members that would exceed it spill to temporary files.
+Extraction to disk writes each member's file as it decompresses.
+
+Members read one at a time stay in a page buffer, so a box reading a page
+again doesn't decompress it again. The buffer holds a byte budget of
+members in memory, least recently used out first, and optionally spills
+them to temporary files under a second budget.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import SpooledTemporaryFile, TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from py7zr.io import Py7zIO, WriterFactory
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+    from py7zr import SevenZipFile
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+DEFAULT_BUFFER_MEMORY_LIMIT = 64 * 1024 * 1024
+
+
+class SpooledIO(Py7zIO):
+    """A member buffer that can move from memory to a temporary file."""
+
+    def __init__(self, factory: SpooledIOFactory) -> None:
+        """Initialize the spooled buffer."""
+        self._factory = factory
+        self._file = SpooledTemporaryFile(dir=factory.spill_dir)  # noqa: SIM115
+        self.spilled = False
+
+    def write(self, s: bytes | bytearray) -> int:
+        """Write decompressed data and charge it to its budget."""
+        length = self._file.write(s)
+        if self.spilled:
+            self._factory.charge_spill(self, length)
+        else:
+            self._factory.charge(self, length)
+        return length
+
+    def read(self, size: int | None = None) -> bytes:
+        """Read data back."""
+        return self._file.read(-1 if size is None else size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        """Seek the buffer."""
+        return self._file.seek(offset, whence)
+
+    def flush(self) -> None:
+        """Flush the buffer."""
+        self._file.flush()
+
+    def size(self) -> int:
+        """Return the size of the buffered data."""
+        pos = self._file.tell()
+        size = self._file.seek(0, 2)
+        self._file.seek(pos)
+        return size
+
+    def close(self) -> None:
+        """Keep the data when py7zr finishes the member; see release()."""
+
+    def spill(self) -> None:
+        """Move the buffer to a temporary file."""
+        self._file.rollover()
+        self.spilled = True
+
+    def release(self) -> None:
+        """Discard the buffer."""
+        self._file.close()
+
+
+class SpooledIOFactory(WriterFactory):
+    """Create member buffers that share one memory budget."""
+
+    def __init__(
+        self, memory_limit: int = DEFAULT_MEMORY_LIMIT, spill_dir: Path | None = None
+    ) -> None:
+        """Initialize the budget."""
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.memory_size = 0
+        self.products: dict[str, SpooledIO] = {}
+
+    def create(self, filename: str) -> Py7zIO:
+        """Create the buffer for one member."""
+        if old_product := self.products.get(filename):
+            self._discard(old_product)
+        product = SpooledIO(self)
+        self.products[filename] = product
+        return product
+
+    def charge(self, product: SpooledIO, length: int) -> None:
+        """Account for bytes held in memory, spilling past the budget."""
+        self.memory_size += length
+        if self.memory_size > self.memory_limit:
+            self.memory_size -= product.size()
+            product.spill()
+
+    def charge_spill(self, product: SpooledIO, length: int) -> None:
+        """Account for bytes written to a spilled buffer."""
+
+    def _discard(self, product: SpooledIO) -> None:
+        if not product.spilled:
+            self.memory_size -= product.size()
+        product.release()
+
+    def read(self, filename: str, *, release: bool = True) -> bytes:
+        """Return a member's data, freeing its buffer unless asked again."""
+        product = self.products.get(filename)
+        if not product:
+            return b""
+        product.seek(0)
+        data = product.read()
+        if release:
+            del self.products[filename]
+            self._discard(product)
+        return data
+
+    def close(self) -> None:
+        """Free every remaining buffer."""
+        for product in self.products.values():
+            product.release()
+        self.products.clear()
+        self.memory_size = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PageBufferStats:
+    """Page buffer counters for tuning its budgets."""
+
+    hits: int
+    misses: int
+    spills: int
+    evictions: int
+    memory_size: int
+    spill_size: int
+
+
+class PageBufferFactory(SpooledIOFactory):
+    """Keep members read one at a time under memory and spill budgets."""
+
+    def __init__(
+        self,
+        memory_limit: int = DEFAULT_BUFFER_MEMORY_LIMIT,
+        spill_limit: int = 0,
+        spill_dir: Path | None = None,
+    ) -> None:
+        """
+        Initialize the budgets.
+
+        Members pushed out of memory spill to temporary files in spill_dir
+        while they fit in spill_limit, and are dropped otherwise. A zero
+        spill_limit never keeps spilled members.
+        """
+        super().__init__(memory_limit, spill_dir)
+        self.spill_limit = spill_limit
+        self.spill_size = 0
+        self.products: OrderedDict[str, SpooledIO] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.evictions = 0
+
+    def create(self, filename: str) -> Py7zIO:
+        """Create the buffer for one member as the most recently used."""
+        product = super().create(filename)
+        self.products.move_to_end(filename)
+        return product
+
+    def _spill(self, product: SpooledIO) -> None:
+        size = product.size()
+        self.memory_size -= size
+        product.spill()
+        self.spill_size += size
+        self.spills += 1
+
+    def _evict(self, filename: str) -> None:
+        self._discard(self.products.pop(filename))
+        self.evictions += 1
+
+    def charge(self, product: SpooledIO, length: int) -> None:
+        """Account for bytes held in memory, pushing out the least recent."""
+        self.memory_size += length
+        for filename, other in tuple(self.products.items()):
+            if self.memory_size <= self.memory_limit:
+                return
+            if other is product or other.spilled:
+                continue
+            if other.size() <= self.spill_limit:
+                self._spill(other)
+                self._trim(product)
+            else:
+                self._evict(filename)
+        # The member being written is over budget by itself. It spills
+        # until it's read, as it can't be dropped while py7zr writes it.
+        if self.memory_size > self.memory_limit:
+            self._spill(product)
+
+    def charge_spill(self, product: SpooledIO, length: int) -> None:
+        """Account for bytes written after spilling, trimming other members."""
+        self.spill_size += length
+        self._trim(product)
+
+    def _discard(self, product: SpooledIO) -> None:
+        if product.spilled:
+            self.spill_size -= product.size()
+        else:
+            self.memory_size -= product.size()
+        product.release()
+
+    def _trim(self, writing: SpooledIO | None = None) -> None:
+        """Drop the least recently used spilled members over the spill budget."""
+        for filename, product in tuple(self.products.items()):
+            if self.spill_size <= self.spill_limit:
+                return
+            if product.spilled and product is not writing:
+                self._evict(filename)
+
+    def get(self, filename: str) -> bytes | None:
+        """Return a buffered member, or None if it must be extracted."""
+        if filename not in self.products:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.products.move_to_end(filename)
+        return super().read(filename, release=False)
+
+    def read(self, filename: str, *, release: bool = False) -> bytes:
+        """Return a just extracted member, keeping it within the budgets."""
+        data = super().read(filename, release=release)
+        self._trim()
+        return data
+
+    @property
+    def stats(self) -> PageBufferStats:
+        """Return the buffer counters and sizes."""
+        return PageBufferStats(
+            self.hits,
+            self.misses,
+            self.spills,
+            self.evictions,
+            self.memory_size,
+            self.spill_size,
+        )
+
+    def close(self) -> None:
+        """Free every buffer and its spill file."""
+        super().close()
+        self.spill_size = 0
+
+
+def read_many(
+    archive: SevenZipFile,
+    filenames: Sequence[str],
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    spill_dir: Path | None = None,
+) -> Generator[tuple[str, bytes]]:
+    """Extract members in one pass and generate them in the requested order."""
+    factory = SpooledIOFactory(memory_limit, spill_dir)
+    try:
+        try:
+            archive.extract(targets=list(dict.fromkeys(filenames)), factory=factory)
+        finally:
+            archive.reset()
+        remaining = Counter(filenames)
+        for filename in filenames:
+            remaining[filename] -= 1
+            yield filename, factory.read(filename, release=not remaining[filename])
+    finally:
+        factory.close()
+
+
+def extract_many(
+    archive: SevenZipFile, filenames: Sequence[str], tmp_parent: Path | None = None
+) -> Generator[tuple[str, Path | None]]:
+    """
+    Extract members to files in one pass and generate their paths in order.
+
+    The paths lie in a temporary directory under tmp_parent that is removed
+    when the generator finishes, so callers move files they keep. Members
+    py7zr didn't write as regular files generate None.
+    """
+    with TemporaryDirectory(prefix="comicbox-", dir=tmp_parent) as tmp_dir:
+        dest = Path(tmp_dir).resolve()
+        try:
+            archive.extract(path=dest, targets=list(dict.fromkeys(filenames)))
+        finally:
+            archive.reset()
+        for filename in filenames:
+            path = dest / filename
+            if path.is_file() and path.resolve().is_relative_to(dest):
+                yield filename, path
+            else:
+                yield filename, None
@@ -1,5 +1,9 @@
 """Identify file formats by their leading magic bytes."""
 
+import bz2
+import lzma
+import tarfile
+import zlib
 from types import MappingProxyType
 from typing import Final
 
@@ -31,6 +35,27 @@ _PNM_EXTS: Final = MappingProxyType(
 )
 
 
+_EXT_MIME_TYPES: Final = MappingProxyType(
+    {
+        "gif": "image/gif",
+        "jpeg": "image/jpeg",
+        "jpg": "image/jpeg",
+        "jpx": "image/jpx",
+        "jxl": "image/jxl",
+        "pam": "image/x-portable-arbitrarymap",
+        "pbm": "image/x-portable-bitmap",
+        "pdf": "application/pdf",
+        "pgm": "image/x-portable-graymap",
+        "png": "image/png",
+        "ppm": "image/x-portable-pixmap",
+        "tif": "image/tiff",
+        "tiff": "image/tiff",
+        "webp": "image/webp",
+    }
+)
+_DEFAULT_MIME_TYPE = "application/octet-stream"
+
+
 def _sniff_pnm(data: bytes) -> str:
     if data[:1] != b"P" or not data[2:3].isspace():
         return ""
@@ -47,3 +72,83 @@ def sniff_ext(data: bytes) -> str:
         if data.startswith(magic):
             return ext
     return _sniff_webp(data) or _sniff_pnm(data)
+
+
+def sniff_mime_type(data: bytes, filename: str = "") -> str:
+    """Return the mime type for data, falling back to the filename suffix."""
+    ext = sniff_ext(data) or filename.rsplit(".", 1)[-1].lower()
+    return _EXT_MIME_TYPES.get(ext, _DEFAULT_MIME_TYPE)
+
+
+# Archive detection reads the head and tail of the file once and tests every
+# type against those bytes rather than letting each library open the file.
+ARCHIVE_HEAD_SIZE: Final = 8 * 1024
+# The zip end of central directory record and the longest possible comment.
+ARCHIVE_TAIL_SIZE: Final = 22 + 0xFFFF
+_ARCHIVE_MAGIC_TYPES: Final[tuple[tuple[bytes, str], ...]] = (
+    (b"%PDF", "pdf"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+)
+_ZIP_EOCD: Final = b"PK\x05\x06"
+_ZIP_EOCD_SIZE: Final = 22
+# Self extracting rars put a stub before the signature.
+_RAR_MAGICS: Final = (b"Rar!\x1a\x07\x00", b"Rar!\x1a\x07\x01\x00")
+_TAR_BLOCK_SIZE: Final = tarfile.BLOCKSIZE
+_TAR_DECOMPRESSORS: Final = (
+    (b"\x1f\x8b", lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)),
+    (b"BZh", bz2.BZ2Decompressor),
+    (b"\xfd7zXZ\x00", lzma.LZMADecompressor),
+)
+
+
+def _sniff_zip(tail: bytes) -> bool:
+    pos = tail.rfind(_ZIP_EOCD)
+    return pos >= 0 and pos + _ZIP_EOCD_SIZE <= len(tail)
+
+
+def _sniff_rar(head: bytes) -> bool:
+    return any(magic in head for magic in _RAR_MAGICS)
+
+
+def _tar_first_block(head: bytes) -> bytes:
+    """Return the first tar block of the head, decompressing if needed."""
+    for magic, decompressor in _TAR_DECOMPRESSORS:
+        if head.startswith(magic):
+            try:
+                return decompressor().decompress(head, _TAR_BLOCK_SIZE)
+            except (OSError, EOFError, lzma.LZMAError, zlib.error):
+                return b""
+    return head[:_TAR_BLOCK_SIZE]
+
+
+def _sniff_tar(head: bytes) -> bool:
+    block = _tar_first_block(head)
+    if len(block) < _TAR_BLOCK_SIZE:
+        # Too short to tell; bzip2 only emits data a whole block at a time.
+        return False
+    try:
+        tarfile.TarInfo.frombuf(block, tarfile.ENCODING, "surrogateescape")
+    except tarfile.HeaderError:
+        return False
+    return True
+
+
+def sniff_archive_types(head: bytes, tail: bytes) -> frozenset[str]:
+    """
+    Return the archive types the head and tail of a file match.
+
+    An empty result only means the bytes weren't enough to tell, as with
+    a rar stub longer than the head or a bzip2 tar.
+    """
+    types = {
+        archive_type
+        for magic, archive_type in _ARCHIVE_MAGIC_TYPES
+        if head.startswith(magic)
+    }
+    if _sniff_zip(tail):
+        types.add("zip")
+    if _sniff_rar(head):
+        types.add("rar")
+    if _sniff_tar(head):
+        types.add("tar")
+    return frozenset(types)
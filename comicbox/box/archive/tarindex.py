@@ -0,0 +1,190 @@
+"""
+Random access member index for tar archives.
+
+``tarfile`` lists members by walking every header, which for a compressed
+tar means decompressing the whole archive, and it reads a member by
+seeking its stream, which for a compressed tar re-decompresses from the
+start on every backward seek. The index records each member's data
+offset once so listings need no walk, and reads go through a stream that
+keeps decompression checkpoints so a member is reached from the nearest
+checkpoint before it rather than from the start.
+
+Checkpoints snapshot the decompressor, which only zlib can copy, so gzip
+tars get one every ``CHECKPOINT_SPACING`` bytes of output. bzip2 and xz
+tars restart from the beginning on backward reads but continue in place
+on forward ones, the order pages are usually read in.
+"""
+
+from __future__ import annotations
+
+import bz2
+import lzma
+import tarfile
+import zlib
+from bisect import bisect_right
+from io import BufferedReader
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+CHECKPOINT_SPACING = 4 * 1024 * 1024
+_READ_CHUNK = 64 * 1024
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+_MAGIC: tuple[tuple[bytes, str], ...] = (
+    (b"\x1f\x8b", "gz"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+_MAGIC_LENGTH = max(len(magic) for magic, _ in _MAGIC)
+
+
+def _detect_compression(path: Path) -> str | None:
+    with path.open("rb") as f:
+        head = f.read(_MAGIC_LENGTH)
+    for magic, compression in _MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _new_decompressor(compression: str) -> Any:
+    if compression == "gz":
+        return zlib.decompressobj(_GZIP_WBITS)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+class TarIndex:
+    """
+    Members of a tar archive and its compression.
+
+    compression is "" for a plain tar and None for a stream tarfile can
+    decompress but this module can't, whose members must be read with
+    tarfile.
+    """
+
+    def __init__(
+        self, compression: str | None, members: tuple[tarfile.TarInfo, ...]
+    ) -> None:
+        """Initialize the index."""
+        self.compression = compression
+        self.members = members
+        self._name_index: dict[str, tarfile.TarInfo] | None = None
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> TarIndex:
+        """Walk the archive once and record every member."""
+        path = Path(path)
+        with tarfile.open(path) as archive:
+            members = tuple(archive.getmembers())
+            plain = isinstance(archive.fileobj, BufferedReader)
+        return cls("" if plain else _detect_compression(path), members)
+
+    def __reduce__(self) -> tuple:
+        """Pickle without the name lookup table."""
+        return (self.__class__, (self.compression, self.members))
+
+    def namelist(self) -> tuple[str, ...]:
+        """Return member names in archive order."""
+        return tuple(member.name for member in self.members)
+
+    def getmember(self, name: str) -> tarfile.TarInfo | None:
+        """Return a member by name, the last one if duplicated."""
+        if self._name_index is None:
+            self._name_index = {member.name: member for member in self.members}
+        return self._name_index.get(name)
+
+
+class TarStreamReader:
+    """Read byte ranges of a tar's uncompressed stream."""
+
+    def __init__(self, path: Path | str, compression: str) -> None:
+        """Open the archive file."""
+        self._file: BinaryIO = Path(path).open("rb")  # noqa: SIM115
+        self._compression = compression
+        self._checkpoints: list[tuple[int, int, Any]] = []
+        self._next_checkpoint = CHECKPOINT_SPACING
+        self._restart()
+
+    def _restart(self) -> None:
+        self._file.seek(0)
+        self._decompressor = _new_decompressor(self._compression)
+        self._pos = 0
+        self._buf = bytearray()
+
+    def _restore(self, offset: int) -> None:
+        """Resume decompressing from the last checkpoint at or before offset."""
+        index = bisect_right(self._checkpoints, offset, key=itemgetter(0))
+        if not index:
+            self._restart()
+            return
+        out_pos, in_pos, decompressor = self._checkpoints[index - 1]
+        self._file.seek(in_pos)
+        self._decompressor = decompressor.copy()
+        self._pos = out_pos
+        self._buf = bytearray()
+
+    def _checkpoint(self) -> None:
+        end = self._pos + len(self._buf)
+        if end < self._next_checkpoint or self._decompressor.eof:
+            return
+        self._checkpoints.append((end, self._file.tell(), self._decompressor.copy()))
+        self._next_checkpoint = end + CHECKPOINT_SPACING
+
+    def _fill(self) -> bool:
+        """Decompress the next chunk of the file into the buffer."""
+        data = self._file.read(_READ_CHUNK)
+        if not data:
+            return False
+        while data:
+            if self._decompressor.eof:
+                # Concatenated streams each need a fresh decompressor. Zero
+                # padding after the last one is not a stream.
+                if not data.strip(b"\0"):
+                    break
+                self._decompressor = _new_decompressor(self._compression)
+            self._buf += self._decompressor.decompress(data)
+            data = self._decompressor.unused_data if self._decompressor.eof else b""
+        if self._compression == "gz":
+            self._checkpoint()
+        return True
+
+    def _read_compressed(self, offset: int, size: int) -> bytes:
+        if offset < self._pos:
+            self._restore(offset)
+        chunks = []
+        while size > 0:
+            if not self._buf and not self._fill():
+                break
+            if offset > self._pos:
+                skip = min(offset - self._pos, len(self._buf))
+                del self._buf[:skip]
+                self._pos += skip
+                continue
+            chunk = self._buf[:size]
+            del self._buf[:size]
+            self._pos += len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Read size bytes at offset in the uncompressed stream."""
+        if not self._compression:
+            self._file.seek(offset)
+            return self._file.read(size)
+        return self._read_compressed(offset, size)
+
+    def checkpoint_count(self) -> int:
+        """Return the number of decompression checkpoints held."""
+        return len(self._checkpoints)
+
+    def close(self) -> None:
+        """Close the archive file and drop the checkpoints."""
+        self._file.close()
+        self._checkpoints = []
+        self._buf = bytearray()
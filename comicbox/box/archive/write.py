@@ -1,7 +1,8 @@
 """Comicboxs methods for writing to the archive."""
 
-from collections.abc import Mapping
+from collections.abc import Generator, Mapping, Sequence
 from pathlib import Path
+from typing import cast
 
 from loguru import logger
 from zipremove import ZIP_DEFLATED, ZIP_STORED, ZipFile
@@ -9,6 +10,13 @@ from zipremove import ZIP_DEFLATED, ZIP_STORED, ZipFile
 from comicbox._pdf import PAGE_FORMAT_PIXMAP_JPEG
 from comicbox.box.archive.archiveinfo import ArchiveInfo, InfoType
 from comicbox.box.archive.read import ComicboxArchiveRead
+from comicbox.box.archive.zipcopy import copy_member
+from comicbox.box.archive.zippipeline import (
+    DEFAULT_MEMORY_BUDGET,
+    DEFAULT_QUEUE_DEPTH,
+    DEFAULT_WORKERS,
+    ZipWritePipeline,
+)
 from comicbox.exceptions import ArchiveWriteError
 from comicbox.formats.sources import MetadataSources
 
@@ -26,10 +34,19 @@ _ALL_ARCHIVE_METADATA_FILENAMES = frozenset(
 class ComicboxArchiveWrite(ComicboxArchiveRead):
     """Comicboxs methods for writing to the archive."""
 
+    # Conversion pipeline limits: deflate threads, members in flight and
+    # bytes read but not yet written.
+    CONVERT_WORKERS = DEFAULT_WORKERS
+    CONVERT_QUEUE_DEPTH = DEFAULT_QUEUE_DEPTH
+    CONVERT_MEMORY_BUDGET = DEFAULT_MEMORY_BUDGET
+
     def _get_new_archive_path(self) -> Path:
         if not self._path:
             reason = "Cannot write zipfile metadata without a path."
             raise ArchiveWriteError(reason)
+        if self._archive_cls == ZipFile:
+            # Zips are rebuilt in place.
+            return self._path
         new_path = self._path.with_suffix(_CBZ_SUFFIX)
         if new_path.is_file() and new_path != self._path:
             reason = f"{new_path} already exists."
@@ -53,6 +70,36 @@ class ComicboxArchiveWrite(ComicboxArchiveRead):
                 old_path.unlink()
                 logger.info(f"Removed: {old_path}")
 
+    @staticmethod
+    def _is_metadata_filename(filename: str) -> bool:
+        return Path(filename).name.lower() in _ALL_ARCHIVE_METADATA_FILENAMES
+
+    @classmethod
+    def _get_metadata_tail_offset(cls, zf: ZipFile) -> int | None:
+        """
+        Return where the run of metadata members at the end of a zip starts.
+
+        None if a metadata member sits before a page, so dropping the
+        metadata means moving pages.
+        """
+        tail_offset = zf.start_dir
+        last_page_offset = -1
+        for info in zf.infolist():
+            if cls._is_metadata_filename(info.filename):
+                tail_offset = min(tail_offset, info.header_offset)
+            else:
+                last_page_offset = max(last_page_offset, info.header_offset)
+        return tail_offset if last_page_offset < tail_offset else None
+
+    def _archive_truncate_metadata_files(self, zf: ZipFile, offset: int) -> None:
+        """Drop trailing metadata members by writing over them."""
+        for info in tuple(zf.infolist()):
+            if self._is_metadata_filename(info.filename):
+                zf.remove(info)  # pyright: ignore[reportAttributeAccessIssue], # ty: ignore[unresolved-attribute]
+        # New members and the central directory are written from here and
+        # closing an append mode ZipFile truncates whatever is left after.
+        zf.start_dir = offset
+
     def _archive_remove_metadata_files(self, zf: ZipFile) -> None:
         """Remove metadata files from archive."""
         for path in self.namelist():
@@ -105,23 +152,48 @@ class ComicboxArchiveWrite(ComicboxArchiveRead):
             filename += suffix
         return filename
 
+    def _copy_zip_files_to_new_archive(
+        self, zf: ZipFile, filenames: Sequence[str]
+    ) -> None:
+        """Copy zip members across still compressed."""
+        source = cast("ZipFile", self._get_archive())
+        for filename in filenames:
+            arcname = self._ensure_image_suffix(filename, None)
+            copy_member(source, source.getinfo(filename), zf, arcname)
+
     def _copy_archive_files_to_new_archive(self, zf: ZipFile) -> None:
         # copy all files that are *not* metadata files into new archive.
         if not self._archive_cls or not self._path:
             reason = "Cannot write archive metadata without and archive path."
             raise ArchiveWriteError(reason)
-        infolist = self.infolist()
-        for info in infolist:
-            filename = self._get_filename_from_info(info)
-            if not filename:
-                continue
-            # Default pdf pages to whole-page jpegs: comic readers (and
-            # comicbox's own page regex) don't recognize raw pixmap ppm
-            # data, and the page render applies pdf display rotation.
-            pdf_format = self._get_pdf_format(default=PAGE_FORMAT_PIXMAP_JPEG)
-            props = {}
-            data = self._archive_readfile(filename, pdf_format=pdf_format, props=props)
-            filename = self._ensure_image_suffix(filename, props)
+        filenames = tuple(
+            filename
+            for info in self._get_infolist()
+            if (filename := self._get_filename_from_info(info))
+        )
+        if self._archive_cls == ZipFile:
+            self._copy_zip_files_to_new_archive(zf, filenames)
+            return
+        pipeline = ZipWritePipeline(
+            zf,
+            workers=self.CONVERT_WORKERS,
+            queue_depth=self.CONVERT_QUEUE_DEPTH,
+            memory_budget=self.CONVERT_MEMORY_BUDGET,
+        )
+        pipeline.run(self._iter_converted_members(filenames))
+
+    def _iter_converted_members(
+        self, filenames: Sequence[str]
+    ) -> Generator[tuple[str, bytes, int]]:
+        """Read members to convert with their final names and compression."""
+        # Default pdf pages to whole-page jpegs: comic readers (and
+        # comicbox's own page regex) don't recognize raw pixmap ppm
+        # data, and the page render applies pdf display rotation.
+        pdf_format = self._get_pdf_format(default=PAGE_FORMAT_PIXMAP_JPEG)
+        for name, data, props in self._archive_readfiles(
+            filenames, pdf_format=pdf_format
+        ):
+            filename = self._ensure_image_suffix(name, props)
             # images usually end up slightly larger with zip compression,
             # so store them. Decide from the final name — pdf pages only
             # gain their image suffix above.
@@ -130,23 +202,28 @@ class ComicboxArchiveWrite(ComicboxArchiveRead):
                 if self.IMAGE_EXT_RE.search(filename) is None
                 else ZIP_STORED
             )
-            zf.writestr(
-                filename,
-                data,
-                compress_type=compress,
-                compresslevel=9,
-            )
+            yield filename, data, compress
 
     def _patch_zipfile(self, files: Mapping[str, bytes], comment: bytes) -> None:
-        """In place remove and append to existing zipfile."""
+        """
+        In place remove and append to existing zipfile.
+
+        Metadata members already at the end of the archive are truncated
+        and rewritten, which costs the size of the metadata rather than
+        the archive. Otherwise the archive is rebuilt once with raw member
+        copies and the metadata last, so later writes truncate.
+        """
         if not self._path:
             reason = "No zipfile path to write to."
             raise ArchiveWriteError(reason)
         self.close()
         with ZipFile(self._path, "a") as zf:
-            self._archive_remove_metadata_files(zf)
-            self._archive_write_metadata_files(zf, files)
-            zf.comment = comment
+            if (tail_offset := self._get_metadata_tail_offset(zf)) is not None:
+                self._archive_truncate_metadata_files(zf, tail_offset)
+                self._archive_write_metadata_files(zf, files)
+                zf.comment = comment
+                return
+        self._create_zipfile(files, comment)
 
     def _create_zipfile(self, files: Mapping, comment: bytes) -> None:
         """Create new zipfile."""
@@ -158,8 +235,9 @@ class ComicboxArchiveWrite(ComicboxArchiveRead):
         tmp_path.unlink(missing_ok=True)
         logger.info(f"Creating {new_path}...")
         with ZipFile(tmp_path, "x") as zf:
-            self._archive_write_metadata_files(zf, files)
+            # Metadata goes last so later writes can truncate and append it.
             self._copy_archive_files_to_new_archive(zf)
+            self._archive_write_metadata_files(zf, files)
             zf.comment = comment
 
         # Cleanup
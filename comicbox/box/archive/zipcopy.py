@@ -0,0 +1,205 @@
+"""
+Raw member copies between zip files.
+
+Rebuilding a CBZ used to inflate every member and deflate it again. A
+member carried over unchanged can instead have its compressed bytes
+copied verbatim behind a fresh local file header, so a rebuild costs
+disk bandwidth rather than zlib time. The bytes move with
+``os.copy_file_range`` where the platform and both files allow it, which
+lets the kernel do the copy or share extents on reflink file systems,
+and with a buffered copy otherwise.
+
+The same header bookkeeping lets callers that compress members
+themselves, off the writing thread, append the finished bytes.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import struct
+from copy import copy
+from typing import TYPE_CHECKING, BinaryIO
+from zipfile import ZIP64_LIMIT, BadZipFile
+
+if TYPE_CHECKING:
+    from zipfile import ZipFile, ZipInfo
+
+_LOCAL_SIG = b"PK\x03\x04"
+_LOCAL = struct.Struct("<4s2B4HL2L2H")
+_EXTRA_HEADER = struct.Struct("<HH")
+_ZIP64_EXTRA_ID = 0x0001
+_MASK_ENCRYPTED = 0x01
+_MASK_USE_DATA_DESCRIPTOR = 0x08
+_DD_SIG = b"PK\x07\x08"
+_DD = struct.Struct("<4s3L")
+_DD64 = struct.Struct("<4sL2Q")
+_CHUNK_SIZE = 1024 * 1024
+# copy_file_range refusals that mean "copy it yourself" rather than failure.
+_FALLBACK_ERRNOS = frozenset(
+    {
+        errno.EXDEV,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.EOPNOTSUPP,
+        errno.EBADF,
+        errno.EPERM,
+    }
+)
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Drop ZIP64 extra fields; the new header computes its own."""
+    fields = []
+    while len(extra) >= _EXTRA_HEADER.size:
+        tp, ln = _EXTRA_HEADER.unpack_from(extra)
+        end = _EXTRA_HEADER.size + ln
+        if tp != _ZIP64_EXTRA_ID:
+            fields.append(extra[:end])
+        extra = extra[end:]
+    return b"".join(fields)
+
+
+def _data_offset(fp: BinaryIO, header_offset: int) -> int:
+    """Return the offset of a member's data past its local file header."""
+    fp.seek(header_offset)
+    header = fp.read(_LOCAL.size)
+    if len(header) != _LOCAL.size:
+        reason = "Truncated file header"
+        raise BadZipFile(reason)
+    fields = _LOCAL.unpack(header)
+    if fields[0] != _LOCAL_SIG:
+        reason = "Bad magic number for file header"
+        raise BadZipFile(reason)
+    return header_offset + _LOCAL.size + fields[10] + fields[11]
+
+
+def _fileno(fp: BinaryIO) -> int | None:
+    try:
+        return fp.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def _copy_file_range(
+    src: BinaryIO, dest: BinaryIO, src_offset: int, dest_offset: int, size: int
+) -> int:
+    """Copy with the kernel, returning how many bytes it managed."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    src_fd, dest_fd = _fileno(src), _fileno(dest)
+    if copy_file_range is None or src_fd is None or dest_fd is None:
+        return 0
+    dest.flush()
+    done = 0
+    while done < size:
+        try:
+            copied = copy_file_range(
+                src_fd, dest_fd, size - done, src_offset + done, dest_offset + done
+            )
+        except OSError as exc:
+            if exc.errno not in _FALLBACK_ERRNOS:
+                raise
+            break
+        if not copied:
+            break
+        done += copied
+    return done
+
+
+def _copy_buffered(
+    src: BinaryIO, dest: BinaryIO, src_offset: int, dest_offset: int, size: int
+) -> None:
+    done = 0
+    while done < size:
+        src.seek(src_offset + done)
+        data = src.read(min(size - done, _CHUNK_SIZE))
+        if not data:
+            reason = (
+                f"Truncated data while copying (expected {size} bytes"
+                f" at offset {src_offset})"
+            )
+            raise BadZipFile(reason)
+        dest.seek(dest_offset + done)
+        dest.write(data)
+        done += len(data)
+
+
+def copy_range(
+    src: BinaryIO, dest: BinaryIO, src_offset: int, dest_offset: int, size: int
+) -> None:
+    """Copy size bytes between open files, with the kernel where it can."""
+    done = _copy_file_range(src, dest, src_offset, dest_offset, size)
+    if done < size:
+        _copy_buffered(src, dest, src_offset + done, dest_offset + done, size - done)
+
+
+def _write_header(dest: ZipFile, info: ZipInfo) -> int:
+    """Write a local file header at the end of dest, return the data offset."""
+    if not dest.fp:
+        reason = "Attempt to write to ZIP archive that was already closed"
+        raise ValueError(reason)
+    info.header_offset = dest.start_dir
+    if hasattr(info, "_end_offset"):
+        info._end_offset = None  # noqa: SLF001
+    dest.fp.seek(info.header_offset)
+    dest.fp.write(info.FileHeader())
+    return dest.fp.tell()
+
+
+def _add_member(dest: ZipFile, info: ZipInfo, end: int) -> None:
+    """Register a member whose data ends at end."""
+    dest.fp.seek(end)  # pyright: ignore[reportOptionalMemberAccess], # ty: ignore[possibly-missing-attribute]
+    dest.start_dir = end
+    dest.filelist.append(info)
+    dest.NameToInfo[info.filename] = info
+    dest._didModify = True  # noqa: SLF001
+
+
+def _write_data_descriptor(dest: ZipFile, info: ZipInfo, end: int) -> int:
+    """Write a data descriptor at end, return its length."""
+    if info.compress_size > ZIP64_LIMIT or info.file_size > ZIP64_LIMIT:
+        descriptor = _DD64.pack(_DD_SIG, info.CRC, info.compress_size, info.file_size)
+    else:
+        descriptor = _DD.pack(_DD_SIG, info.CRC, info.compress_size, info.file_size)
+    dest.fp.seek(end)  # pyright: ignore[reportOptionalMemberAccess], # ty: ignore[possibly-missing-attribute]
+    dest.fp.write(descriptor)  # pyright: ignore[reportOptionalMemberAccess], # ty: ignore[possibly-missing-attribute]
+    return len(descriptor)
+
+
+def write_compressed(dest: ZipFile, info: ZipInfo, data: bytes) -> None:
+    """Append a member already compressed as info describes."""
+    offset = _write_header(dest, info)
+    dest.fp.write(data)  # pyright: ignore[reportOptionalMemberAccess], # ty: ignore[possibly-missing-attribute]
+    _add_member(dest, info, offset + len(data))
+
+
+def copy_member(
+    source: ZipFile, info: ZipInfo, dest: ZipFile, arcname: str | None = None
+) -> ZipInfo:
+    """
+    Append a member of source to dest without recompressing it.
+
+    The new local header carries the sizes and CRC from the central
+    directory, so a source data descriptor is dropped rather than copied.
+    Encrypted members keep the descriptor flag, which decides the byte
+    their password check compares against, and get a fresh descriptor.
+    """
+    if not source.fp or not dest.fp:
+        reason = "Attempt to copy with a closed ZIP archive"
+        raise ValueError(reason)
+    new_info = copy(info)
+    if arcname is not None and arcname != info.filename:
+        new_info.filename = new_info.orig_filename = arcname
+    if not info.flag_bits & _MASK_ENCRYPTED:
+        new_info.flag_bits &= ~_MASK_USE_DATA_DESCRIPTOR
+    new_info.extra = _strip_zip64_extra(info.extra)
+
+    src_offset = _data_offset(source.fp, info.header_offset)  # pyright: ignore[reportArgumentType], # ty: ignore[invalid-argument-type]
+    dest_offset = _write_header(dest, new_info)
+    size = info.compress_size
+    copy_range(source.fp, dest.fp, src_offset, dest_offset, size)  # pyright: ignore[reportArgumentType], # ty: ignore[invalid-argument-type]
+    end = dest_offset + size
+    if new_info.flag_bits & _MASK_USE_DATA_DESCRIPTOR:
+        end += _write_data_descriptor(dest, new_info, end)
+    _add_member(dest, new_info, end)
+    return new_info
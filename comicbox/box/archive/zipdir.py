@@ -0,0 +1,323 @@
+"""
+Lightweight zip central directory reader.
+
+``zipfile.ZipFile`` builds and decodes a full ``ZipInfo`` object for every
+member when it opens an archive. Most reads only need member names, sizes,
+CRCs, dates and the archive comment, so this reader memory maps the file,
+locates the end of central directory records (including ZIP64) and decodes
+the central directory straight out of the map into parallel arrays. Entry
+objects are only built on demand.
+
+Decoding mirrors ``zipfile.ZipFile._RealGetContents`` so names, sizes and
+offsets are identical to what ``ZipFile`` would report.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+from zipfile import BadZipFile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_EOCD_SIG = b"PK\x05\x06"
+_EOCD = struct.Struct("<4s4H2LH")
+_EOCD64_LOCATOR_SIG = b"PK\x06\x07"
+_EOCD64_LOCATOR = struct.Struct("<4sLQL")
+_EOCD64_SIG = b"PK\x06\x06"
+_EOCD64 = struct.Struct("<4sQ2H2L4Q")
+_CD_SIG = b"PK\x01\x02"
+_CD = struct.Struct("<4s4B4HL2L5H2L")
+_LOCAL_SIG = b"PK\x03\x04"
+_LOCAL = struct.Struct("<4s2B4HL2L2H")
+_EXTRA_HEADER = struct.Struct("<HH")
+_ZIP64_EXTRA_ID = 0x0001
+_UINT64 = struct.Struct("<Q")
+_MAX_COMMENT = (1 << 16) - 1
+_MASK_UTF_FILENAME = 0x800
+_ZIP64_LIMIT = 0xFFFF_FFFF
+_ZIP64_FILE_SIZE_LIMITS = frozenset({0xFFFF_FFFF_FFFF_FFFF, _ZIP64_LIMIT})
+
+
+class ZipEntry(NamedTuple):
+    """ZipInfo like view of one central directory row."""
+
+    filename: str
+    file_size: int
+    compress_size: int
+    CRC: int
+    compress_type: int
+    flag_bits: int
+    header_offset: int
+    date_time: tuple[int, int, int, int, int, int]
+
+    def is_dir(self) -> bool:
+        """Is a directory."""
+        return self.filename.endswith("/")
+
+
+@lru_cache(maxsize=4096)
+def _dos_date_time(dos_date_time: int) -> tuple[int, int, int, int, int, int]:
+    """Convert a packed dos date and time to the ZipInfo.date_time tuple."""
+    dos_date, dos_time = dos_date_time >> 16, dos_date_time & 0xFFFF
+    return (
+        (dos_date >> 9) + 1980,
+        (dos_date >> 5) & 0xF,
+        dos_date & 0x1F,
+        dos_time >> 11,
+        (dos_time >> 5) & 0x3F,
+        (dos_time & 0x1F) * 2,
+    )
+
+
+def _decode_filename(raw: bytes, flag_bits: int) -> str:
+    """Decode a member name the way ZipInfo does."""
+    if raw.isascii():
+        # Identical in both encodings and much faster than the cp437 codec.
+        filename = raw.decode("ascii")
+    else:
+        encoding = "utf-8" if flag_bits & _MASK_UTF_FILENAME else "cp437"
+        filename = raw.decode(encoding)
+    if "\0" in filename:
+        filename = filename[: filename.index("\0")]
+    return filename
+
+
+def _decode_zip64_extra(
+    extra: bytes, file_size: int, compress_size: int, header_offset: int
+) -> tuple[int, int, int]:
+    """Replace saturated sizes and offsets from the ZIP64 extra field."""
+    while len(extra) >= _EXTRA_HEADER.size:
+        tp, ln = _EXTRA_HEADER.unpack_from(extra)
+        if ln + _EXTRA_HEADER.size > len(extra):
+            reason = f"Corrupt extra field {tp:04x} (size={ln})"
+            raise BadZipFile(reason)
+        if tp == _ZIP64_EXTRA_ID:
+            data = extra[_EXTRA_HEADER.size : ln + _EXTRA_HEADER.size]
+            try:
+                if file_size in _ZIP64_FILE_SIZE_LIMITS:
+                    (file_size,) = _UINT64.unpack_from(data)
+                    data = data[_UINT64.size :]
+                if compress_size == _ZIP64_LIMIT:
+                    (compress_size,) = _UINT64.unpack_from(data)
+                    data = data[_UINT64.size :]
+                if header_offset == _ZIP64_LIMIT:
+                    (header_offset,) = _UINT64.unpack_from(data)
+            except struct.error as exc:
+                reason = "Corrupt zip64 extra field."
+                raise BadZipFile(reason) from exc
+        extra = extra[ln + _EXTRA_HEADER.size :]
+    return file_size, compress_size, header_offset
+
+
+def _find_eocd(mm: mmap.mmap) -> int:
+    """Return the offset of the end of central directory record."""
+    size = len(mm)
+    fast = size - _EOCD.size
+    if fast >= 0 and mm[fast : fast + 4] == _EOCD_SIG and mm[-2:] == b"\0\0":
+        return fast
+    start = mm.rfind(_EOCD_SIG, max(fast - _MAX_COMMENT - 1, 0))
+    if start < 0 or start + _EOCD.size > size:
+        reason = "File is not a zip file"
+        raise BadZipFile(reason)
+    return start
+
+
+def _read_eocd64(mm: mmap.mmap, eocd_pos: int) -> tuple[int, int] | None:
+    """Return the ZIP64 (size, offset) of the central directory if present."""
+    locator_pos = eocd_pos - _EOCD64_LOCATOR.size
+    if locator_pos < 0:
+        return None
+    sig, disk_num, _rel_offset, disks = _EOCD64_LOCATOR.unpack_from(mm, locator_pos)
+    if sig != _EOCD64_LOCATOR_SIG:
+        return None
+    if disk_num != 0 or disks > 1:
+        reason = "zipfiles that span multiple disks are not supported"
+        raise BadZipFile(reason)
+    eocd64_pos = locator_pos - _EOCD64.size
+    if eocd64_pos < 0:
+        return None
+    eocd64 = _EOCD64.unpack_from(mm, eocd64_pos)
+    if eocd64[0] != _EOCD64_SIG:
+        return None
+    return eocd64[8], eocd64[9]
+
+
+def member_data_offset(buf: mmap.mmap, header_offset: int) -> int:
+    """Return the offset of a member's data past its local file header."""
+    if header_offset + _LOCAL.size > len(buf):
+        reason = "Truncated file header"
+        raise BadZipFile(reason)
+    header = _LOCAL.unpack_from(buf, header_offset)
+    if header[0] != _LOCAL_SIG:
+        reason = "Bad magic number for file header"
+        raise BadZipFile(reason)
+    return header_offset + _LOCAL.size + header[10] + header[11]
+
+
+class ZipDirectory:
+    """Struct-of-arrays table of a zip's central directory."""
+
+    __slots__ = (
+        "comment",
+        "compress_sizes",
+        "compress_types",
+        "crcs",
+        "dos_date_times",
+        "file_sizes",
+        "filenames",
+        "flag_bits",
+        "header_offsets",
+        "name_index",
+    )
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+        self.comment: bytes = b""
+        self.filenames: tuple[str, ...] = ()
+        self.file_sizes = array("Q")
+        self.compress_sizes = array("Q")
+        self.header_offsets = array("Q")
+        self.crcs = array("L")
+        self.dos_date_times = array("L")
+        self.compress_types = array("H")
+        self.flag_bits = array("H")
+        self.name_index: dict[str, int] | None = None
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> ZipDirectory:
+        """Read the central directory of the zip file at path."""
+        with Path(path).open("rb") as f:
+            if not f.seek(0, 2):
+                reason = "File is not a zip file"
+                raise BadZipFile(reason)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return cls.from_buffer(mm)
+
+    @classmethod
+    def from_buffer(cls, mm: mmap.mmap) -> ZipDirectory:
+        """Read the central directory from an open read only map."""
+        table = cls()
+        eocd_pos = _find_eocd(mm)
+        eocd = _EOCD.unpack_from(mm, eocd_pos)
+        size_cd, offset_cd, comment_size = eocd[5], eocd[6], eocd[7]
+        comment_start = eocd_pos + _EOCD.size
+        table.comment = mm[comment_start : comment_start + comment_size]
+        # "concat" is zero unless the zip was appended to another file.
+        concat = eocd_pos - size_cd - offset_cd
+        if zip64 := _read_eocd64(mm, eocd_pos):
+            size_cd, offset_cd = zip64
+            concat = eocd_pos - size_cd - offset_cd
+            concat -= _EOCD64.size + _EOCD64_LOCATOR.size
+        start_cd = offset_cd + concat
+        if start_cd < 0:
+            reason = "Bad offset for central directory"
+            raise BadZipFile(reason)
+        table._decode_central_directory(mm, start_cd, size_cd, concat)
+        return table
+
+    def _decode_central_directory(
+        self, mm: mmap.mmap, start_cd: int, size_cd: int, concat: int
+    ) -> None:
+        if start_cd + size_cd > len(mm):
+            reason = "Truncated central directory"
+            raise BadZipFile(reason)
+        # One copy of the directory; slicing bytes is far cheaper than
+        # slicing the map once per field.
+        data = mm[start_cd : start_cd + size_cd]
+        unpack_from = _CD.unpack_from
+        cd_size = _CD.size
+        filenames = []
+        rows = []
+        pos = 0
+        while pos < size_cd:
+            if pos + cd_size > size_cd:
+                reason = "Truncated central directory"
+                raise BadZipFile(reason)
+            cd = unpack_from(data, pos)
+            if cd[0] != _CD_SIG:
+                reason = "Bad magic number for central directory"
+                raise BadZipFile(reason)
+            name_start = pos + cd_size
+            extra_start = name_start + cd[12]
+            extra_end = extra_start + cd[13]
+            filenames.append(_decode_filename(data[name_start:extra_start], cd[5]))
+            file_size, compress_size, header_offset = cd[11], cd[10], cd[18]
+            if _ZIP64_LIMIT in (file_size, compress_size, header_offset):
+                file_size, compress_size, header_offset = _decode_zip64_extra(
+                    data[extra_start:extra_end], file_size, compress_size, header_offset
+                )
+            rows.append(
+                (
+                    file_size,
+                    compress_size,
+                    header_offset + concat,
+                    cd[9],
+                    (cd[8] << 16) | cd[7],
+                    cd[6],
+                    cd[5],
+                )
+            )
+            pos = extra_end + cd[14]
+        self.filenames = tuple(filenames)
+        if rows:
+            columns = tuple(zip(*rows, strict=True))
+            self.file_sizes = array("Q", columns[0])
+            self.compress_sizes = array("Q", columns[1])
+            self.header_offsets = array("Q", columns[2])
+            self.crcs = array("L", columns[3])
+            self.dos_date_times = array("L", columns[4])
+            self.compress_types = array("H", columns[5])
+            self.flag_bits = array("H", columns[6])
+
+    def __len__(self) -> int:
+        """Return the number of members."""
+        return len(self.filenames)
+
+    def entry(self, index: int) -> ZipEntry:
+        """Build the entry for one row."""
+        return ZipEntry(
+            self.filenames[index],
+            self.file_sizes[index],
+            self.compress_sizes[index],
+            self.crcs[index],
+            self.compress_types[index],
+            self.flag_bits[index],
+            self.header_offsets[index],
+            _dos_date_time(self.dos_date_times[index]),
+        )
+
+    def getinfo(self, name: str) -> ZipEntry:
+        """Return the entry for a member name, the last one if duplicated."""
+        if self.name_index is None:
+            self.name_index = {
+                filename: index for index, filename in enumerate(self.filenames)
+            }
+        return self.entry(self.name_index[name])
+
+    def namelist(self) -> tuple[str, ...]:
+        """Return member names in central directory order."""
+        return self.filenames
+
+    def iter_entries(self) -> Iterator[ZipEntry]:
+        """Generate entries in central directory order."""
+        return map(
+            ZipEntry,
+            self.filenames,
+            self.file_sizes,
+            self.compress_sizes,
+            self.crcs,
+            self.compress_types,
+            self.flag_bits,
+            self.header_offsets,
+            map(_dos_date_time, self.dos_date_times),
+        )
+
+    def infolist(self) -> tuple[ZipEntry, ...]:
+        """Return entries in central directory order."""
+        return tuple(self.iter_entries())
@@ -0,0 +1,165 @@
+"""
+Pipelined CBZ writer for archive conversion.
+
+Converting to CBZ used to read a member, compress it and write it before
+reading the next one. Here a reader thread pulls members from the source
+archive, a thread pool deflates them (zlib releases the GIL) and the
+calling thread appends the finished members to the ZipFile in source
+order. Reading, decompressing the source and writing then overlap.
+
+The pipeline is bounded by the number of members in flight and by the
+bytes read but not yet written, so a large archive never sits in memory.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, Full, Queue
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZipInfo
+
+from comicbox.box.archive.zipcopy import write_compressed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from zipfile import ZipFile
+
+DEFAULT_QUEUE_DEPTH = 16
+DEFAULT_MEMORY_BUDGET = 128 * 1024 * 1024
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+_COMPRESS_LEVEL = 9
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+class _ByteBudget:
+    """Blocks the reader while too many bytes are in flight."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int, stop: threading.Event) -> bool:
+        """Reserve size bytes, return False if the pipeline stopped."""
+        with self._cond:
+            # A single member bigger than the budget still goes alone.
+            while self.used and self.used + size > self.limit and not stop.is_set():
+                self._cond.wait(_POLL_SECONDS)
+            if stop.is_set():
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int) -> None:
+        """Return size bytes."""
+        with self._cond:
+            self.used -= size
+            self._cond.notify_all()
+
+
+def _compress(filename: str, data: bytes, compress_type: int) -> tuple[ZipInfo, bytes]:
+    """Build the member the way ZipFile.writestr would."""
+    info = ZipInfo(filename, date_time=time.localtime(time.time())[:6])
+    info.compress_type = compress_type
+    info.external_attr = 0o600 << 16
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if compress_type == ZIP_DEFLATED:
+        compressor = zlib.compressobj(_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+    else:
+        payload = data
+    info.compress_size = len(payload)
+    return info, payload
+
+
+class ZipWritePipeline:
+    """Bounded reader, compressor and ordered writer stages."""
+
+    def __init__(
+        self,
+        zf: ZipFile,
+        workers: int = DEFAULT_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        """Initialize the limits."""
+        self._zf = zf
+        self._workers = max(1, workers)
+        self._queue: Queue = Queue(maxsize=max(1, queue_depth))
+        self._budget = _ByteBudget(memory_budget)
+        self._stop = threading.Event()
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+            except Full:
+                continue
+            return True
+        return False
+
+    def _read(
+        self, members: Iterable[tuple[str, bytes, int]], executor: ThreadPoolExecutor
+    ) -> None:
+        """Reader stage, run in its own thread."""
+        try:
+            for filename, data, compress_type in members:
+                size = len(data)
+                if not self._budget.acquire(size, self._stop):
+                    return
+                future = executor.submit(_compress, filename, data, compress_type)
+                if not self._put((future, size)):
+                    return
+            self._put(_DONE)
+        except BaseException as exc:
+            self._put(exc)
+        finally:
+            if close := getattr(members, "close", None):
+                close()
+
+    def _write(self) -> None:
+        """Writer stage, run in the calling thread."""
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            future, size = item
+            future: Future[tuple[ZipInfo, bytes]]
+            info, payload = future.result()
+            write_compressed(self._zf, info, payload)
+            self._budget.release(size)
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()
+            except Empty:
+                return
+
+    def run(self, members: Iterable[tuple[str, bytes, int]]) -> None:
+        """Write (filename, data, compress_type) members in order."""
+        with ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix="comicbox-zip"
+        ) as executor:
+            reader = threading.Thread(
+                target=self._read,
+                args=(members, executor),
+                name="comicbox-zip-reader",
+                daemon=True,
+            )
+            reader.start()
+            try:
+                self._write()
+            finally:
+                self._stop.set()
+                self._drain()
+                reader.join()
+                executor.shutdown(cancel_futures=True)
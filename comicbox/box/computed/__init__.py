@@ -1,7 +1,6 @@
 """Computed metadata methods."""
 
 from collections.abc import Callable, Mapping
-from copy import deepcopy
 from dataclasses import dataclass
 from types import MappingProxyType
 from typing import Any
@@ -75,18 +74,20 @@ class ComicboxComputed(ComicboxComputedStoriesTitle):
         for index, old_reprint in enumerate(old_reprints):
             if index in merged_indexes:
                 continue
+            # Merge into a copy, the merged metadata shares the original.
+            new_reprint = dict(old_reprint)
             for sub_index, compare_old_reprint in enumerate(old_reprints[index:]):
                 diff = DeepDiff(
-                    old_reprint,
+                    new_reprint,
                     compare_old_reprint,
                     ignore_order=True,
                     ignore_string_case=True,
                     ignore_encoding_errors=True,
                 )
                 if "values_changed" not in diff:
-                    AdditiveMerger.merge(old_reprint, compare_old_reprint)
+                    AdditiveMerger.merge(new_reprint, compare_old_reprint)
                     merged_indexes.add(index + sub_index)
-            new_reprints.append(old_reprint)
+            new_reprints.append(new_reprint)
 
         if len(old_reprints) != len(new_reprints):
             return {REPRINTS_KEY: new_reprints}
@@ -112,10 +113,9 @@ class ComicboxComputed(ComicboxComputedStoriesTitle):
     def _set_computed_metadata(self) -> None:
         computed_list = []
         merged_md = self.get_merged_metadata()
-        # Deep copy: actions receive sub_data and some (reprints) merge
-        # entries in place; without the copy they'd silently mutate the
-        # cached merged metadata they're supposed to derive from.
-        sub_data = deepcopy(dict(merged_md.get(ComicboxSchemaMixin.ROOT_TAG, {})))
+        # Shallow copy: actions share sub_data's subtrees with the cached
+        # merged metadata, so they must not change them in place.
+        sub_data = dict(merged_md.get(ComicboxSchemaMixin.ROOT_TAG, {}))
 
         # Compute each
         for label, actions in self.COMPUTED_ACTIONS.items():
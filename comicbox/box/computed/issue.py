@@ -58,6 +58,8 @@ class ComicboxComputedIssue(ComicboxComputedStamp):
         issue = sub_data.get(issue_key)
         if not issue:
             return None
+        # Parse into a copy, the merged metadata shares the original.
+        issue = dict(issue)
         issue_name = issue.get(NAME_KEY)
         old_issue_number = issue.get(NUMBER_KEY)
         old_issue_suffix = issue.get(ISSUE_SUFFIX_KEY)
@@ -103,8 +105,7 @@ class ComicboxComputedIssue(ComicboxComputedStamp):
         issue_suffix = issue.get(ISSUE_SUFFIX_KEY, "")
         # Decimal removes unspecified decimal points
         if issue_name := f"{issue_number}{issue_suffix}".strip():
-            issue[NAME_KEY] = issue_name
-            return {issue_key: issue}
+            return {issue_key: {**issue, NAME_KEY: issue_name}}
         return None
 
     def _get_computed_issue(
@@ -13,8 +13,11 @@ from comicbox.formats.comicbox.schema import (
     BOOKMARK_KEY,
     PAGE_BOOKMARK_KEY,
     PAGE_COUNT_KEY,
+    PAGE_DOUBLE_PAGE_KEY,
+    PAGE_HEIGHT_KEY,
     PAGE_SIZE_KEY,
     PAGE_TYPE_KEY,
+    PAGE_WIDTH_KEY,
     PAGES_KEY,
 )
 from comicbox.merge import AdditiveMerger, Merger, ReplaceMerger
@@ -64,7 +67,8 @@ class ComicboxComputedPages(ComicboxComputedNotes):
             if page.get(PAGE_TYPE_KEY) == ComicInfoPageTypeEnum.FRONT_COVER:
                 return
 
-        pages[0][PAGE_TYPE_KEY] = ComicInfoPageTypeEnum.FRONT_COVER
+        # Copy on write: the page may be shared with the merged metadata.
+        pages[0] = {**pages[0], PAGE_TYPE_KEY: ComicInfoPageTypeEnum.FRONT_COVER}
 
     def _get_max_page_index(self) -> int:
         if self._path:
@@ -87,29 +91,47 @@ class ComicboxComputedPages(ComicboxComputedNotes):
         self._ensure_pages_front_cover_metadata(computed_pages)
         return computed_pages
 
+    @staticmethod
+    def _set_computed_page_dimensions(
+        computed_page: dict[str, Any], dimensions: tuple[int, int] | None
+    ) -> None:
+        """Add image dimensions read from the page's header bytes."""
+        if not dimensions:
+            return
+        width, height = dimensions
+        computed_page[PAGE_WIDTH_KEY] = width
+        computed_page[PAGE_HEIGHT_KEY] = height
+        if width > height:
+            computed_page[PAGE_DOUBLE_PAGE_KEY] = True
+
     def _get_computed_pages_metadata(
         self, sub_md: dict[str, Any]
     ) -> dict[str, MutableMapping] | None:
-        """Recompute the tag image sizes for the ComicRack PageInfo list."""
+        """Recompute the tag image sizes and dimensions for the ComicRack PageInfo list."""
         if not self._enable_page_compute_attribute(PAGES_KEY, sub_md):
             return None
         pages = {}
+        page_filenames = {}
         bookmark = sub_md.get(BOOKMARK_KEY)
         try:
             index = 0
-            for info in self.infolist():
+            for info in self._get_infolist():
                 filename = self._get_info_fn(info)
                 if self.IMAGE_EXT_RE.search(filename) is None:
                     continue
                 size = self._get_info_size(info)
-                # height & width could go here.
                 if size is not None:
                     computed_page = {}
                     if index == bookmark:
                         computed_page[PAGE_BOOKMARK_KEY] = True
                     computed_page[PAGE_SIZE_KEY] = size
                     pages[index] = computed_page
+                    page_filenames[filename] = computed_page
                 index += 1
+            for filename, dimensions in self._archive_read_image_sizes(
+                tuple(page_filenames)
+            ):
+                self._set_computed_page_dimensions(page_filenames[filename], dimensions)
         except Exception as exc:
             logger.warning(f"{self._path}: Compute pages metadata: {exc}")
         if pages:
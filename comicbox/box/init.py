@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 import stat
 import sys
 from contextlib import suppress
@@ -23,14 +24,23 @@ if TYPE_CHECKING:
     from argparse import Namespace
     from collections.abc import Callable, Mapping
     from datetime import datetime
+    from mmap import mmap
+    from zipfile import ZipInfo
 
-    from pdffile import PDFFile
-    from py7zr.io import BytesIOFactory
+    from pdffile import PageVerdict, PDFFile
 
     from comicbox.box.archive.archiveinfo import InfoType
+    from comicbox.box.archive.pagecache import SharedPageCache
+    from comicbox.box.archive.pdfprobe import PdfProbe
+    from comicbox.box.archive.pool import ArchivePool
+    from comicbox.box.archive.prefetch import PagePrefetcher
+    from comicbox.box.archive.sevenzip import PageBufferFactory
+    from comicbox.box.archive.tarindex import TarIndex, TarStreamReader
+    from comicbox.box.archive.zipdir import ZipDirectory
     from comicbox.box.types import ArchiveType
     from comicbox.formats import MetadataFormats
     from comicbox.formats.sources import MetadataSources
+    from comicbox.read_cache import Fingerprint, ReadCache
 else:
     from comicbox._pdf import PDFFile
 
@@ -78,6 +88,10 @@ class ComicboxInit:
         config: ComicboxSettings | Namespace | Mapping | None = None,
         metadata: Mapping | str | bytes | None = None,
         fmt: MetadataFormats | None = None,
+        *,
+        read_cache: ReadCache | None = None,
+        pool: ArchivePool | None = None,
+        page_cache: SharedPageCache | None = None,
     ) -> None:
         """
         Initialize the archive with a path to the archive.
@@ -91,6 +105,14 @@ class ComicboxInit:
             also accepted (pass ``fmt`` to skip detection).
         fmt: the MetadataFormats member describing the format of ``metadata``;
             None means the comicbox format.
+        read_cache: a ReadCache to load and store archive indexes in, such
+            as CBT member offsets, so reopening an unchanged archive skips
+            rebuilding them.
+        pool: an ArchivePool to take the open archive from and return it
+            to on close(), so boxes reopened on the same path reuse it.
+        page_cache: a SharedPageCache to look pages up in before reading
+            them and to store decompressed pages in, shared by every
+            process on the host.
 
         Logging is never (re)configured here: comicbox is a library, and its
         modules log through whatever loguru sinks the host application
@@ -98,6 +120,11 @@ class ComicboxInit:
         ``comicbox.logger.init_logging`` themselves.
         """
         self._path = self._validate_path(path)
+        self._read_cache = read_cache
+        self._pool = pool
+        self._page_cache = page_cache
+        self._pool_fingerprint: Fingerprint | None = None
+        self._prefetcher: PagePrefetcher | None = None
         if isinstance(config, ComicboxSettings):
             self._config: ComicboxSettings = config
         else:
@@ -130,7 +157,14 @@ class ComicboxInit:
         self._archive: ArchiveType | None = None
         self._namelist: tuple[str, ...] | None = None
         self._infolist: tuple[InfoType, ...] | None = None
-        self._7zfactory: BytesIOFactory | None = None
+        self._zipinfolist: tuple[ZipInfo, ...] | None = None
+        self._zipdir: ZipDirectory | None = None
+        self._mmap: mmap | None = None
+        self._tar_index: TarIndex | None = None
+        self._tar_reader: TarStreamReader | None = None
+        self._7zfactory: PageBufferFactory | None = None
+        self._pdf_probe: PdfProbe | None = None
+        self._pdf_page_verdicts: tuple[PageVerdict, ...] | None = None
 
         self._transform_cache: dict = {}
         self._page_filenames: tuple[str, ...] | None = None
@@ -155,60 +189,67 @@ class ComicboxInit:
         """Are PDFs supported."""
         return "pdffile" in sys.modules
 
-    def _set_archive_cls_pdf(self) -> bool:
+    def _set_archive_pdf(self) -> bool:
         """PDFFile is only optionally installed."""
         if not PDF_ENABLED:
-            return self._archive_is_pdf
+            return False
+        # Both attributes get unconditional defaults at the top of
+        # _set_archive_cls; the suppressions cover the documented
+        # init-in-reset-method pattern, not a real lifecycle gap.
+        self._archive_is_pdf = True  # pyright: ignore[reportUninitializedInstanceVariable]
+        self._archive_cls = PDFFile
+        self._pdf_suffix = PDFFile.SUFFIX  # pyright: ignore[reportUninitializedInstanceVariable]
+        self._file_type = FileTypeEnum.PDF
+        return True
+
+    def _set_archive_7z(self) -> bool:
+        # py7zr is imported lazily — CB7 is rare and the package is heavy.
+        from py7zr import SevenZipFile
+
+        self._archive_cls = SevenZipFile
+        self._file_type = FileTypeEnum.CB7
+        return True
+
+    def _set_archive_zip(self) -> bool:
+        self._archive_cls = ZipFile
+        self._file_type = FileTypeEnum.CBZ
+        return True
+
+    def _set_archive_rar(self) -> bool:
+        # rarfile is imported lazily — defers the heavy package init for
+        # workers that only see CBZs (the common case at bulk-read scale).
+        from rarfile import RarFile
+
+        self._archive_cls = RarFile
+        self._file_type = FileTypeEnum.CBR
+        return True
+
+    def _set_archive_tar(self) -> bool:
+        self._archive_cls = tarfile_open
+        self._file_type = FileTypeEnum.CBT
+        return True
+
+    def _try_detect_pdf(self, path: Path) -> bool:
         with suppress(OSError):
-            if PDFFile.is_pdffile(str(self._path)):
-                # Both attributes get unconditional defaults at the top of
-                # _set_archive_cls; the suppressions cover the documented
-                # init-in-reset-method pattern, not a real lifecycle gap.
-                self._archive_is_pdf = True  # pyright: ignore[reportUninitializedInstanceVariable]
-                self._archive_cls = PDFFile
-                self._pdf_suffix = PDFFile.SUFFIX  # pyright: ignore[reportUninitializedInstanceVariable]
-        return self._archive_is_pdf
-
-    def _try_detect_pdf(self, _path: Path) -> bool:
-        if self._set_archive_cls_pdf():
-            self._file_type = FileTypeEnum.PDF
-            return True
+            if PDF_ENABLED and PDFFile.is_pdffile(str(path)):
+                return self._set_archive_pdf()
         return False
 
     def _try_detect_7z(self, path: Path) -> bool:
-        # py7zr is imported lazily — CB7 is rare and the package is heavy.
-        from py7zr import SevenZipFile, is_7zfile
+        from py7zr import is_7zfile
 
-        if is_7zfile(path):
-            self._archive_cls = SevenZipFile
-            self._file_type = FileTypeEnum.CB7
-            return True
-        return False
+        return is_7zfile(path) and self._set_archive_7z()
 
     def _try_detect_zip(self, path: Path) -> bool:
-        if is_zipfile(path):
-            self._archive_cls = ZipFile
-            self._file_type = FileTypeEnum.CBZ
-            return True
-        return False
+        return is_zipfile(path) and self._set_archive_zip()
 
     def _try_detect_rar(self, path: Path) -> bool:
-        # rarfile is imported lazily — defers the heavy package init for
-        # workers that only see CBZs (the common case at bulk-read scale).
-        from rarfile import RarFile, is_rarfile
+        from rarfile import is_rarfile
 
-        if is_rarfile(path):
-            self._archive_cls = RarFile
-            self._file_type = FileTypeEnum.CBR
-            return True
-        return False
+        return is_rarfile(path) and self._set_archive_rar()
 
     def _try_detect_tar(self, path: Path) -> bool:
-        if is_tarfile(path):
-            self._archive_cls = tarfile_open
-            self._file_type = FileTypeEnum.CBT
-            return True
-        return False
+        return is_tarfile(path) and self._set_archive_tar()
 
     # Full detection order (default when no extension hint)
     _FULL_DETECT_ORDER: tuple[str, ...] = ("pdf", "7z", "zip", "rar", "tar")
@@ -233,12 +274,57 @@ class ComicboxInit:
         }
         return detectors[key](path)
 
+    def _set_sniffed_archive_type(self, key: str) -> bool:
+        """Set an archive type the file's magic bytes matched."""
+        setters = {
+            "pdf": self._set_archive_pdf,
+            "7z": self._set_archive_7z,
+            "zip": self._set_archive_zip,
+            "rar": self._set_archive_rar,
+            "tar": self._set_archive_tar,
+        }
+        return setters[key]()
+
+    @staticmethod
+    def _sniff_archive_types(path: Path) -> frozenset[str]:
+        """Match archive types against one read of the file's head and tail."""
+        # Lazy import: comicbox.box.archive imports this module.
+        from comicbox.box.archive.sniff import (
+            ARCHIVE_HEAD_SIZE,
+            ARCHIVE_TAIL_SIZE,
+            sniff_archive_types,
+        )
+
+        try:
+            with path.open("rb") as f:
+                head = f.read(ARCHIVE_HEAD_SIZE)
+                size = f.seek(0, os.SEEK_END)
+                if size <= len(head):
+                    tail = head
+                else:
+                    f.seek(max(size - ARCHIVE_TAIL_SIZE, 0))
+                    tail = f.read()
+        except OSError:
+            return frozenset()
+        return sniff_archive_types(head, tail)
+
     def _detect_archive_cls(self, path: Path) -> None:
-        """Try each detector in hint-first priority order; raise if none match."""
+        """
+        Detect the archive type in hint-first priority order; raise if none match.
+
+        Magic bytes decide almost every file in one read. Only files they
+        can't place, like rars with long self extracting stubs, fall back
+        to asking each archive library in turn.
+        """
         suffix = path.suffix.lower()
         hinted = self._EXTENSION_HINT.get(suffix, ())
         remaining = tuple(k for k in self._FULL_DETECT_ORDER if k not in hinted)
-        for key in hinted + remaining:
+        order = hinted + remaining
+        if sniffed := self._sniff_archive_types(path):
+            for key in order:
+                if key in sniffed and self._set_sniffed_archive_type(key):
+                    return
+        for key in order:
             if self._try_detect(key, path):
                 return
         reason = f"Unsupported archive type: {path}"
@@ -264,6 +350,8 @@ class ComicboxInit:
             # Tarfile info objects use different attribute names.
             self._info_size_attr = "size"
             self._info_fn_attr = "name"
+        elif self._file_type == FileTypeEnum.CB7:
+            self._info_size_attr = "uncompressed"
 
     def get_path(self) -> Path | None:
         """Get the path for the archive."""
@@ -1,7 +1,6 @@
 """Get Metadata mixin."""
 
 from collections.abc import Mapping
-from copy import deepcopy
 from types import MappingProxyType
 from typing import Any
 
@@ -12,6 +11,7 @@ from comicbox.box.computed import ComicboxComputed
 from comicbox.formats import MetadataFormats
 from comicbox.formats.base.schemas.cache import get_schema
 from comicbox.formats.comicbox.schema import ComicboxSchemaMixin
+from comicbox.merge.cow import copy_keypath
 
 
 class ComicboxMetadata(ComicboxComputed):
@@ -20,8 +20,12 @@ class ComicboxMetadata(ComicboxComputed):
     def _set_computed_merged_metadata_delete(self, merged_md: dict[str, Any]) -> None:
         """Delete keys with glom."""
         sub_data = merged_md.get(ComicboxSchemaMixin.ROOT_TAG)
+        if sub_data:
+            # Copy on write: the deleted paths may be shared with the merged cache.
+            sub_data = merged_md[ComicboxSchemaMixin.ROOT_TAG] = dict(sub_data)
         for key_path in sorted(self._config.general.delete_keys):
             try:
+                copy_keypath(sub_data, key_path)
                 delete = Delete(key_path, ignore_missing=True)
                 glom(sub_data, delete)
             except Exception as exc:
@@ -30,10 +34,10 @@ class ComicboxMetadata(ComicboxComputed):
     def _set_computed_merged_metadata(self) -> None:
         merged_md = self.get_merged_metadata()
         computed_md = self.get_computed_metadata()
-        # Deep copy, not dict(): the mergers below recurse into nested
-        # dicts, and a shallow copy would share (and mutate) the same
-        # nested objects the _merged_metadata cache still references.
-        merged_md = deepcopy(dict(merged_md))
+        # A shallow copy is enough: the mergers below copy nested dicts
+        # before changing them, so the _merged_metadata cache they share
+        # subtrees with stays intact.
+        merged_md = dict(merged_md)
 
         for computed_data in computed_md:
             computed_sub_data = computed_data.metadata.get(ComicboxSchemaMixin.ROOT_TAG)
@@ -1,10 +1,12 @@
 """Cover Page filename methods."""
 
 from collections.abc import Generator
+from typing import TYPE_CHECKING
 
 from glom import glom
 from loguru import logger
 
+from comicbox._pdf import PAGE_FORMAT_PIXMAP_JPEG
 from comicbox.box.metadata import ComicboxMetadata
 from comicbox.enums.comicinfo import ComicInfoPageTypeEnum
 from comicbox.formats.comicbox.schema import (
@@ -12,9 +14,17 @@ from comicbox.formats.comicbox.schema import (
     PAGES_KEY,
     ComicboxSchemaMixin,
 )
+from comicbox.formats.sources import MetadataSources
+from comicbox.read_cache import file_fingerprint, read_config_key
+from comicbox.thumbnails import DEFAULT_FORMAT, DEFAULT_QUALITY
+
+if TYPE_CHECKING:
+    from comicbox.read_cache import Fingerprint
+    from comicbox.thumbnails import ThumbnailCache, ThumbnailSize
 
 PAGES_KEYPATH = f"{ComicboxSchemaMixin.ROOT_KEYPATH}.{PAGES_KEY}"
 _COVER_IMAGE_KEYPATH = f"{ComicboxSchemaMixin.ROOT_KEYPATH}.{COVER_IMAGE_KEY}"
+_COVER_INDEX_KIND = "cover"
 
 
 class ComicboxPagesCovers(ComicboxMetadata):
@@ -58,6 +68,46 @@ class ComicboxPagesCovers(ComicboxMetadata):
             self._cover_paths = self._get_cover_paths()
         return self._cover_paths  # pyright: ignore[reportReturnType], #ty: ignore[invalid-return-type]
 
+    def _get_cover_index_fingerprint(self) -> "Fingerprint | None":
+        """
+        Return the fingerprint to index the cover under, if indexing applies.
+
+        Metadata passed to the box can name a different cover than the
+        archive's own, so boxes given metadata through the API aren't
+        indexed. Metadata and read formats from the config are folded into
+        the index kind instead.
+        """
+        if (
+            self._read_cache is None
+            or not self._path
+            or MetadataSources.API in self._sources
+        ):
+            return None
+        try:
+            return file_fingerprint(self._path)
+        except OSError:
+            return None
+
+    def _get_cover_index_kind(self) -> str:
+        return f"{_COVER_INDEX_KIND}:{read_config_key(self._config)}"
+
+    def _get_indexed_cover_path(self, fingerprint: "Fingerprint | None") -> str:
+        if fingerprint is None or self._read_cache is None:
+            return ""
+        cover_path = self._read_cache.get_index(
+            self._path, fingerprint, self._get_cover_index_kind()
+        )
+        return cover_path if isinstance(cover_path, str) else ""
+
+    def _set_indexed_cover_path(
+        self, fingerprint: "Fingerprint | None", cover_path: str
+    ) -> None:
+        if fingerprint is None or self._read_cache is None:
+            return
+        self._read_cache.set_index(
+            self._path, fingerprint, self._get_cover_index_kind(), cover_path
+        )
+
     def _get_cover_page_skip_metadata(self, pdf_format: str = "") -> bytes:
         first_pagename = self.get_pagename(0)
         if not first_pagename:
@@ -73,18 +123,27 @@ class ComicboxPagesCovers(ComicboxMetadata):
     ) -> bytes:
         if skip_metadata:
             return self._get_cover_page_skip_metadata(pdf_format=pdf_format)
+        fingerprint = self._get_cover_index_fingerprint()
+        bad_cover_paths = set()
+        if cover_path := self._get_indexed_cover_path(fingerprint):
+            try:
+                return self._archive_readfile(cover_path, pdf_format=pdf_format)
+            except Exception as exc:
+                logger.debug(f"{self._path} reading indexed cover: {cover_path}: {exc}")
+                bad_cover_paths.add(cover_path)
         data = b""
         cover_paths = self.generate_cover_paths()
-        bad_cover_paths = set()
         for cover_path in cover_paths:
             if cover_path in bad_cover_paths:
                 continue
             try:
                 data = self._archive_readfile(cover_path, pdf_format=pdf_format)
-                break
             except Exception as exc:
                 logger.warning(f"{self._path} reading cover: {cover_path}: {exc}")
                 bad_cover_paths.add(cover_path)
+            else:
+                self._set_indexed_cover_path(fingerprint, cover_path)
+                break
         return data
 
     def get_cover_page(
@@ -93,9 +152,78 @@ class ComicboxPagesCovers(ComicboxMetadata):
         """
         Return cover image data.
 
+        With a read cache, the chosen cover filename is indexed under the
+        archive fingerprint, so reopening an unchanged archive reads the
+        cover without parsing its metadata.
+
         When skip_metadata is True, bypass cover-hint metadata parsing and
         return the bytes of the first archive page directly. Useful for
         callers that only need a thumbnail and want to avoid the cost of
         schema instantiation and Union resolution.
         """
         return self._get_cover_page(pdf_format=pdf_format, skip_metadata=skip_metadata)
+
+    def _generate_cover_thumbnail_paths(
+        self, indexed_cover_path: str, *, skip_metadata: bool
+    ) -> Generator[str]:
+        if skip_metadata:
+            if first_pagename := self.get_pagename(0):
+                yield first_pagename
+            return
+        if indexed_cover_path:
+            yield indexed_cover_path
+        # The metadata is only parsed if the indexed cover fails.
+        for cover_path in self.get_cover_paths():
+            if cover_path != indexed_cover_path:
+                yield cover_path
+
+    def get_cover_thumbnail(
+        self,
+        size: "ThumbnailSize",
+        fmt: str = DEFAULT_FORMAT,
+        *,
+        cache: "ThumbnailCache | None" = None,
+        skip_metadata: bool = False,
+        pdf_format: str = "",
+        quality: int = DEFAULT_QUALITY,
+    ) -> bytes:
+        """
+        Return a cover thumbnail that fits inside size.
+
+        size is a bounding box (width, height) or one number for both. With
+        a cache, thumbnails are looked up and stored under the archive
+        fingerprint, the cover filename, the size, the format and quality
+        and the pdf page format. PDF covers render as whole page jpegs
+        unless pdf_format says otherwise.
+        """
+        from comicbox.thumbnails import make_thumbnail
+
+        fingerprint = file_fingerprint(self._path) if cache and self._path else None
+        index_fingerprint = (
+            None if skip_metadata else self._get_cover_index_fingerprint()
+        )
+        indexed_cover_path = self._get_indexed_cover_path(index_fingerprint)
+        pdf_format = self._get_pdf_format(pdf_format, default=PAGE_FORMAT_PIXMAP_JPEG)
+        key_pdf_format = pdf_format if self._archive_is_pdf else ""
+        for cover_path in self._generate_cover_thumbnail_paths(
+            indexed_cover_path, skip_metadata=skip_metadata
+        ):
+            key = ""
+            if cache and fingerprint:
+                key = cache.key(
+                    fingerprint, cover_path, size, fmt, quality, key_pdf_format
+                )
+                if (thumbnail := cache.get(key, fmt)) is not None:
+                    return thumbnail
+            try:
+                data = self._archive_readfile(cover_path, pdf_format=pdf_format)
+                thumbnail = make_thumbnail(data, size, fmt, quality)
+            except Exception as exc:
+                logger.warning(f"{self._path} thumbnail of cover: {cover_path}: {exc}")
+                continue
+            if cache and key:
+                cache.set(key, fmt, thumbnail)
+            if cover_path != indexed_cover_path:
+                self._set_indexed_cover_path(index_fingerprint, cover_path)
+            return thumbnail
+        return b""
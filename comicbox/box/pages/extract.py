@@ -1,14 +1,28 @@
 """Methods for extracting files from the archive."""
 
-from collections.abc import Generator, Iterable, Sequence
+import os
+import shutil
+from collections.abc import Generator, Iterable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, cast
 
 from loguru import logger
 
 from comicbox._pdf import PAGE_FORMAT_PDF
+from comicbox.box.archive.zipcopy import copy_range
 from comicbox.box.pages.covers import ComicboxPagesCovers
+from comicbox.enums.comicbox import FileTypeEnum
 from comicbox.exceptions import ExportError
 
+if TYPE_CHECKING:
+    from tarfile import TarFile
+
+    from py7zr import SevenZipFile
+    from zipremove import ZipFile
+
 
 def _validate_extract_path(path: Path, dest_dir: Path) -> None:
     """Validate that the extract path doesn't escape the destination directory."""
@@ -17,31 +31,186 @@ def _validate_extract_path(path: Path, dest_dir: Path) -> None:
         raise ExportError(reason)
 
 
+@contextmanager
+def _page_warning(fn: str) -> Generator[None]:
+    """Warn which page failed before the error aborts the extraction."""
+    try:
+        yield
+    except Exception as exc:
+        logger.warning(f"Could not extract page {fn}: {exc}")
+        raise
+
+
+def _extract_span(archive_path: Path, span: tuple[int, int], path: Path) -> None:
+    """Copy a member stored verbatim in the archive file to path."""
+    offset, length = span
+    with archive_path.open("rb") as src, path.open("wb") as dest:
+        copy_range(src, dest, offset, 0, length)
+
+
 class ComicboxExtractPages(ComicboxPagesCovers):
     """Methods for extracting files from the archive."""
 
+    # Threads streaming independent CBZ and CBT members to disk at once.
+    EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
     def _extract_page_get_path(self, path: Path, fn: str) -> Path:
         path = path / Path(fn).name if path.is_dir() else path
         if self._archive_is_pdf:
             path = path.with_suffix(self._pdf_suffix)
         return path
 
-    def _extract_page(self, dest_path: Path, fn: str) -> None:
+    def _extract_page(self, dest_path: Path, fn: str, data: bytes, props: dict) -> None:
         path = self._extract_page_get_path(dest_path, fn)
-        props = {}
-        data = self._archive_readfile(fn, props=props)
         if ext := props.get("ext", ""):
             path = path.with_suffix("." + ext)
         dest_dir = dest_path if dest_path.is_dir() else dest_path.parent
         _validate_extract_path(path, dest_dir)
         path.write_bytes(data)
 
+    def _extract_zip_member(self, filename: str, path: Path, lock: Lock) -> None:
+        """Stream a compressed CBZ member to path through the shared ZipFile."""
+        archive = cast("ZipFile", self._get_archive())
+        # ZipFile serializes member reads itself but not opening and closing.
+        with lock:
+            src = archive.open(filename)
+        try:
+            with path.open("wb") as dest:
+                shutil.copyfileobj(src, dest)
+        finally:
+            with lock:
+                src.close()
+
+    def _extract_tar_member(self, filename: str, path: Path) -> None:
+        """Stream a compressed CBT member to path."""
+        src = cast("TarFile", self._get_archive()).extractfile(filename)
+        if src is None:
+            reason = f"{filename} is not a regular file"
+            raise ExportError(reason)
+        with src, path.open("wb") as dest:
+            shutil.copyfileobj(src, dest)
+
+    def _extract_streamed(self, members: Mapping[Path, str]) -> int:
+        """
+        Stream CBZ and CBT members to their paths across threads.
+
+        Members stored verbatim are copied straight from the archive file,
+        by the kernel where it can. Compressed zip members decompress
+        concurrently. A compressed tar is one stream, so its members are
+        copied in order on this thread. Returns the number of files written.
+        """
+        spans = {path: self._archive_span(fn) for path, fn in members.items()}
+        serial: list[tuple[Path, str]] = []
+        lock = Lock()
+        archive_path = cast("Path", self._path)
+        futures: list[tuple[str, Future]] = []
+        count = 0
+        with ThreadPoolExecutor(max_workers=self.EXTRACT_WORKERS) as executor:
+            try:
+                for path, fn in members.items():
+                    if span := spans[path]:
+                        future = executor.submit(
+                            _extract_span, archive_path, span, path
+                        )
+                    elif self._file_type == FileTypeEnum.CBZ:
+                        # Open the archive before the threads share it.
+                        self._get_archive()
+                        future = executor.submit(
+                            self._extract_zip_member, fn, path, lock
+                        )
+                    else:
+                        serial.append((path, fn))
+                        continue
+                    futures.append((fn, future))
+                for path, fn in serial:
+                    with _page_warning(fn):
+                        self._extract_tar_member(fn, path)
+                    count += 1
+                for fn, future in futures:
+                    with _page_warning(fn):
+                        future.result()
+                    count += 1
+            finally:
+                for _, future in futures:
+                    future.cancel()
+        return count
+
+    def _extract_moved(
+        self, extracted: Iterable[tuple[str, Path | None]], members: Mapping[Path, str]
+    ) -> int:
+        """Move members extracted in one pass into place, returning the count."""
+        paths = {fn: path for path, fn in members.items()}
+        count = 0
+        for fn, tmp_path in extracted:
+            if (path := paths.get(fn)) is None:
+                continue
+            with _page_warning(fn):
+                if tmp_path is None:
+                    path.write_bytes(self._archive_readfile(fn))
+                else:
+                    tmp_path.replace(path)
+            count += 1
+        return count
+
+    def _extract_concurrent(
+        self, pagenames: Iterable[str], dest_dir: Path
+    ) -> int | None:
+        """
+        Extract many pages to a directory without holding any page whole.
+
+        Returns the number of files written, or None if the archive type
+        extracts through memory.
+        """
+        if not isinstance(pagenames, Sequence) or len(pagenames) < 2:  # noqa: PLR2004
+            return None
+        file_type = self._file_type
+        if file_type == FileTypeEnum.CBR and not self.is_unrar_supported():
+            return None
+        if file_type not in (
+            FileTypeEnum.CBZ,
+            FileTypeEnum.CBT,
+            FileTypeEnum.CB7,
+            FileTypeEnum.CBR,
+        ):
+            return None
+        self._ensure_read_archive()
+        # Pages sharing a file name overwrite each other, the last one
+        # winning as in serial extraction.
+        paths: dict[str, Path] = {}
+        for fn in pagenames:
+            path = self._extract_page_get_path(dest_dir, fn)
+            _validate_extract_path(path, dest_dir)
+            paths[fn] = path
+        members = {path: fn for fn, path in paths.items()}
+        if file_type == FileTypeEnum.CB7:
+            from comicbox.box.archive.sevenzip import extract_many
+
+            archive = cast("SevenZipFile", self._get_archive())
+            extracted = extract_many(archive, tuple(members.values()), dest_dir)
+            count = self._extract_moved(extracted, members)
+        elif file_type == FileTypeEnum.CBR:
+            from comicbox.box.archive.rar import extract_many
+
+            archive_path = cast("Path", self._path)
+            extracted = extract_many(archive_path, tuple(members.values()), dest_dir)
+            count = self._extract_moved(extracted, members)
+        else:
+            count = self._extract_streamed(members)
+        return count
+
     def _extract_all_pagenames(self, pagenames: Iterable[str], path: Path) -> None:
         success_page_count = 0
         try:
-            for fn in pagenames:
+            if (
+                path.is_dir()
+                and (count := self._extract_concurrent(pagenames, path)) is not None
+            ):
+                plural = "s" if count > 1 else ""
+                logger.info(f"Saved {count} page{plural} to {path}")
+                return
+            for fn, data, props in self._archive_readfiles(pagenames):
                 try:
-                    self._extract_page(path, fn)
+                    self._extract_page(path, fn, data, props)
                     success_page_count += 1
                     if not path.is_dir():
                         break
@@ -110,6 +110,21 @@ class ComicboxSources(ComicboxArchive):
             logger.warning(f"Error reading archive comment from {self._path}: {exc}")
         return source_data_list
 
+    def _get_pdf_metadata(self) -> dict:
+        """Get pdf metadata from the probe if it can, otherwise from MuPDF."""
+        if (pdf_probe := self._get_pdf_probe()) is None:
+            return self._get_archive().get_metadata()  # pyright: ignore[reportAttributeAccessIssue], # ty: ignore[unresolved-attribute]
+        from pdffile import PDFFile
+
+        md = dict(pdf_probe.metadata)
+        # Convert values as PDFFile.get_metadata does.
+        if (trapped := md.get("trapped")) is not None:
+            md["trapped"] = PDFFile.to_bool(trapped)
+        for key in ("creationDate", "modDate"):
+            if (value := md.get(key)) is not None:
+                md[key] = PDFFile.to_datetime(value)
+        return md
+
     def _get_source_pdf_metadata(self) -> list[SourceData]:
         """If an archive is a pdf and we're configured to read pdf metadata, get the pdf metadata as source."""
         source_data_list = []
@@ -122,10 +137,9 @@ class ComicboxSources(ComicboxArchive):
         if not pdf_fmts:
             return source_data_list
         try:
-            archive = self._get_archive()
-            if not archive or not self._archive_is_pdf:
+            if not self._archive_is_pdf:
                 return source_data_list
-            if md := archive.get_metadata():  # pyright: ignore[reportAttributeAccessIssue], # ty: ignore[unresolved-attribute]
+            if md := self._get_pdf_metadata():
                 md = MappingProxyType({MuPDFSchema.ROOT_TAG: md})
                 source_data_list = [
                     SourceData(md, fmt=MetadataFormats.PDF, from_archive=True)
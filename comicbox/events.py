@@ -50,14 +50,18 @@ class BatchStarted(Event):
 @dataclass(frozen=True, slots=True, kw_only=True)
 class FileShortCircuited(Event):
     """
-    Worker decided the embedded metadata had not changed and skipped parse.
+    The embedded metadata had not changed, so the parse was skipped.
 
     ``reason="mtime_unchanged"`` — embedded mtime <= caller's ``old_mtime``.
     ``reason="filtered"``        — caller passed ``full_metadata=False`` so
                                    the worker only collected envelope fields.
+    ``reason="cache_hit"``       — the archive fingerprint matched the read
+                                   cache; no worker was involved at all.
     """
 
-    reason: Literal["mtime_unchanged", "filtered", "dry_run"] = "mtime_unchanged"
+    reason: Literal["mtime_unchanged", "filtered", "dry_run", "cache_hit"] = (
+        "mtime_unchanged"
+    )
     kind: Literal["file_short_circuited"] = "file_short_circuited"
 
 
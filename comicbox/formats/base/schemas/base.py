@@ -1,9 +1,12 @@
 """Skip keys instead of throwing errors."""
 
 from abc import ABC
+from collections.abc import Mapping
+from functools import cached_property
+from os import environ
 from pathlib import Path
 from types import MappingProxyType
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 from marshmallow import EXCLUDE
@@ -13,7 +16,7 @@ from marshmallow.decorators import (
     pre_dump,
     pre_load,
 )
-from marshmallow.types import RenderModule, StrSequenceOrSet
+from marshmallow.types import RenderModule, StrSequenceOrSet, UnknownOption
 from typing_extensions import override
 
 from comicbox.empty import is_empty
@@ -21,6 +24,17 @@ from comicbox.formats.base.fields.fields import StringField
 from comicbox.formats.base.schemas.decorators import trap_error
 from comicbox.formats.base.schemas.error_store import ClearingErrorStoreSchema
 
+if TYPE_CHECKING:
+    from comicbox.formats.base.schemas.compiler import CompiledSchema
+
+
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def _env_flag(name: str) -> bool:
+    """Return whether an environment variable is set to a true value."""
+    return environ.get(name, "").strip().lower() in _TRUE_VALUES
+
 
 class BaseRenderModule(RenderModule, ABC):
     """Base Render Module."""
@@ -38,6 +52,8 @@ class BaseSubSchema(ClearingErrorStoreSchema, ABC):
     # Currently only mapping "pages" and "reprints" fields for each schema for Codex out of laziness
     # But this should speed up Codex reads
     DELETE_KEY_MAP = MappingProxyType({})
+    # Opt in to loading and dumping with functions compiled from the fields.
+    COMPILED: bool = _env_flag("COMICBOX_COMPILED_SCHEMAS")
 
     def _create_exclude(self, exclude: StrSequenceOrSet) -> set[str]:
         final_exclude = set()
@@ -59,6 +75,52 @@ class BaseSubSchema(ClearingErrorStoreSchema, ABC):
         exclude = self._create_exclude(exclude)
         super().__init__(*args, exclude=exclude, **kwargs)
 
+    @cached_property
+    def _compiled_schema(self) -> "CompiledSchema | None":
+        """Compile this schema's load and dump once."""
+        from comicbox.formats.base.schemas.compiler import (
+            SchemaCompileError,
+            compile_schema,
+        )
+
+        try:
+            return compile_schema(self)
+        except SchemaCompileError as exc:
+            logger.debug(exc)
+            return None
+
+    @override
+    def load(
+        self,
+        data: Any,
+        *,
+        many: bool | None = None,
+        partial: bool | StrSequenceOrSet | None = None,
+        unknown: UnknownOption | None = None,
+    ) -> Any:
+        """Load with the compiled function if enabled."""
+        if (
+            self.COMPILED
+            and not many
+            and partial in (None, True)
+            and unknown in (None, self.unknown)
+            and (compiled := self._compiled_schema)
+        ):
+            return compiled.load(data)
+        return super().load(data, many=many, partial=partial, unknown=unknown)
+
+    @override
+    def dump(self, obj: Any, *, many: bool | None = None) -> Any:
+        """Dump with the compiled function if enabled."""
+        if (
+            self.COMPILED
+            and not many
+            and isinstance(obj, Mapping)
+            and (compiled := self._compiled_schema)
+        ):
+            return compiled.dump(obj)
+        return super().dump(obj, many=many)
+
     @classmethod
     def pre_load_validate(cls, data: dict[str, Any] | None) -> dict[str, Any] | None:
         """Validate schema type first thing to fail as early as possible."""
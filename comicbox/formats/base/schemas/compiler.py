@@ -0,0 +1,294 @@
+"""
+Compile schema loads and dumps into Python functions.
+
+Schema.load and Schema.dump run marshmallow's generic machinery for
+every schema and nested schema: hook lookups, error stores, a getter
+closure per field, and the clean_empties and sort_dump passes that go
+over the result again. compile_schema generates one load and one dump
+function per schema instance from its declared fields. Field values are
+still converted by the fields themselves, but the per field bookkeeping,
+the empty value filter and the dump key order are decided once at
+compile time.
+
+Schemas with hooks or options the compiler doesn't know raise
+SchemaCompileError so the caller keeps using marshmallow.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+from marshmallow import EXCLUDE, Schema, ValidationError, missing
+from marshmallow.decorators import (
+    POST_DUMP,
+    POST_LOAD,
+    PRE_DUMP,
+    PRE_LOAD,
+    VALIDATES,
+    VALIDATES_SCHEMA,
+)
+from marshmallow.error_store import ErrorStore
+from marshmallow.fields import Field
+
+from comicbox.empty import is_empty
+from comicbox.formats.base.schemas.base import BaseSubSchema
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_INDENT = "    "
+_HOOK_TAGS = frozenset({PRE_LOAD, POST_LOAD, PRE_DUMP, POST_DUMP})
+
+
+class SchemaCompileError(ValueError):
+    """A schema the compiler can't express as code."""
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    """Compiled load and dump functions for one schema instance."""
+
+    load: Callable[[Any], Any]
+    dump: Callable[[Any], Any]
+
+
+def _same_function(cls: type, name: str) -> bool:
+    """Is the class attribute the BaseSubSchema one."""
+    attr = getattr(cls, name)
+    base_attr = getattr(BaseSubSchema, name)
+    return getattr(attr, "__func__", attr) is getattr(base_attr, "__func__", base_attr)
+
+
+def _inline_post_load(schema: Schema) -> bool:
+    """Can the base clean_empties post_load run as field value checks."""
+    cls = type(schema)
+    return bool(
+        getattr(schema, "SUPPRESS_ERRORS", False)
+        and _same_function(cls, "post_load")
+        and _same_function(cls, "clean_empties")
+    )
+
+
+def _inline_post_dump(schema: Schema) -> bool:
+    """Can the base sort_dump post_dump run as a static key order."""
+    cls = type(schema)
+    return (
+        _same_function(cls, "post_dump")
+        and _same_function(cls, "sort_dump")
+        and _same_function(cls, "_sort_tag_by_order")
+    )
+
+
+def _inline_serialize(schema: Schema, field: Field) -> bool:
+    """Can the field's value lookup be inlined."""
+    cls = type(field)
+    return (
+        field._CHECK_ATTRIBUTE  # noqa: SLF001
+        and field.attribute is None
+        and cls.serialize is Field.serialize
+        and cls.get_value is Field.get_value
+        and type(schema).get_attribute is Schema.get_attribute
+    )
+
+
+def _check_schema(schema: Schema) -> None:
+    hooks = schema._hooks  # noqa: SLF001
+    reason = ""
+    if schema.many or schema.partial is not True or schema.unknown != EXCLUDE:
+        reason = "Unsupported schema options"
+    elif hooks[VALIDATES] or hooks[VALIDATES_SCHEMA]:
+        reason = "Unsupported validators"
+    elif frozenset(tag for tag, tag_hooks in hooks.items() if tag_hooks) - _HOOK_TAGS:
+        reason = "Unsupported hooks"
+    elif any(
+        hook_many or kwargs.get("pass_original")
+        for tag in _HOOK_TAGS
+        for _, hook_many, kwargs in hooks[tag]
+    ):
+        reason = "Unsupported hook options"
+    else:
+        for attr_name, field in schema.fields.items():
+            key = field.attribute or attr_name
+            if "." in key:
+                reason = f"Unsupported field keypath {key}"
+                break
+    if reason:
+        reason = f"{type(schema).__name__}: {reason}"
+        raise SchemaCompileError(reason)
+
+
+class _SchemaCompiler:
+    """Generate the source of a schema's load and dump functions."""
+
+    def __init__(self, schema: Schema) -> None:
+        self.schema = schema
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {
+            "_Mapping": Mapping,
+            "_ErrorStore": ErrorStore,
+            "_ValidationError": ValidationError,
+            "_is_empty": is_empty,
+            "_missing": missing,
+            "_schema": schema,
+        }
+        self._names = count()
+
+    def _bind(self, value: Any) -> str:
+        """Name an object for the generated code."""
+        name = f"_c{next(self._names)}"
+        self.namespace[name] = value
+        return name
+
+    def _var(self) -> str:
+        return f"v{next(self._names)}"
+
+    def _emit(self, depth: int, line: str) -> None:
+        self.lines.append(_INDENT * depth + line)
+
+    def _emit_hooks(self, tag: str, var: str, kwargs: str, skip: str = "") -> None:
+        """Call a schema's processor hooks in registration order."""
+        for attr_name, _, _ in self.schema._hooks[tag]:  # noqa: SLF001
+            if attr_name == skip and _same_function(type(self.schema), skip):
+                continue
+            hook = self._bind(getattr(self.schema, attr_name))
+            self._emit(1, f"{var} = {hook}({var}, many=False{kwargs})")
+
+    ########
+    # Load #
+    ########
+
+    def _emit_load_field(self, attr_name: str, field: Field, *, inline: bool) -> None:
+        suppress = getattr(self.schema, "SUPPRESS_ERRORS", False)
+        field_name = field.data_key if field.data_key is not None else attr_name
+        key = field.attribute or attr_name
+        deserialize = self._bind(field.deserialize)
+        raw = self._var()
+        value = self._var()
+        self._emit(2, f"{raw} = data.get({field_name!r}, _missing)")
+        self._emit(2, f"if {raw} is not _missing:")
+        self._emit(3, "try:")
+        self._emit(
+            4, f"{value} = {deserialize}({raw}, {field_name!r}, data, partial=True)"
+        )
+        self._emit(3, "except _ValidationError as err:")
+        if not suppress:
+            self._emit(4, f"errors.store_error(err.messages, {field_name!r})")
+        self._emit(4, f"{value} = err.valid_data or _missing")
+        condition = f"{value} is not _missing"
+        if inline:
+            condition += f" and not _is_empty({value})"
+        self._emit(3, f"if {condition}:")
+        self._emit(4, f"result[{key!r}] = {value}")
+
+    def _emit_load(self, name: str) -> None:
+        schema = self.schema
+        suppress = getattr(schema, "SUPPRESS_ERRORS", False)
+        inline = _inline_post_load(schema)
+        hook_kwargs = f", partial=True, unknown={schema.unknown!r}"
+        self._emit(0, f"def {name}(data):")
+        self._emit(1, "original = data")
+        self._emit_hooks(PRE_LOAD, "data", hook_kwargs)
+        self._emit(1, "result = {}")
+        if not suppress:
+            self._emit(1, "errors = _ErrorStore()")
+        self._emit(1, "if isinstance(data, _Mapping):")
+        for attr_name, field in schema.load_fields.items():
+            self._emit_load_field(attr_name, field, inline=inline)
+        if not schema.load_fields:
+            self._emit(2, "pass")
+        if not suppress:
+            self._emit(1, "else:")
+            self._emit(2, f"errors.store_error([{schema.error_messages['type']!r}])")
+            self._emit(1, "if errors.errors:")
+            self._emit(
+                2,
+                "exc = _ValidationError(errors.errors, data=original, "
+                "valid_data=result)",
+            )
+            self._emit(
+                2, "_schema.handle_error(exc, original, many=False, partial=True)"
+            )
+            self._emit(2, "raise exc")
+        self._emit_hooks(
+            POST_LOAD, "result", hook_kwargs, "post_load" if inline else ""
+        )
+        self._emit(1, "return result")
+
+    ########
+    # Dump #
+    ########
+
+    def _emit_dump_field(self, attr_name: str, field: Field, value: str) -> None:
+        if not _inline_serialize(self.schema, field):
+            serialize = self._bind(field.serialize)
+            accessor = self._bind(self.schema.get_attribute)
+            self._emit(
+                1, f"{value} = {serialize}({attr_name!r}, obj, accessor={accessor})"
+            )
+            return
+        self._emit(1, "try:")
+        self._emit(2, f"{value} = obj[{attr_name!r}]")
+        self._emit(1, "except (KeyError, IndexError, TypeError, AttributeError):")
+        self._emit(2, f"{value} = getattr(obj, {attr_name!r}, _missing)")
+        default = field.dump_default
+        if default is not missing:
+            default_var = self._bind(default)
+            expr = f"{default_var}()" if callable(default) else default_var
+            self._emit(1, f"if {value} is _missing:")
+            self._emit(2, f"{value} = {expr}")
+        serialize = self._bind(field._serialize)  # noqa: SLF001
+        self._emit(1, f"if {value} is not _missing:")
+        self._emit(2, f"{value} = {serialize}({value}, {attr_name!r}, obj)")
+
+    def _dump_key_order(self, keys: list[str]) -> list[str]:
+        """Order keys as the base sort_dump post_dump does."""
+        tag_order = type(self.schema).TAG_ORDER
+        if tag_order:
+            return [tag for tag in tag_order if tag in keys]
+        return sorted(keys)
+
+    def _emit_dump(self, name: str) -> None:
+        schema = self.schema
+        inline = _inline_post_dump(schema)
+        self._emit(0, f"def {name}(obj):")
+        self._emit_hooks(PRE_DUMP, "obj", "")
+        values = {}
+        for attr_name, field in schema.dump_fields.items():
+            key = field.data_key if field.data_key is not None else attr_name
+            values[key] = self._var()
+            self._emit_dump_field(attr_name, field, values[key])
+        self._emit(1, "result = {}")
+        keys = self._dump_key_order(list(values)) if inline else list(values)
+        for key in keys:
+            value = values[key]
+            condition = f"{value} is not _missing"
+            if inline:
+                condition += f" and not _is_empty({value})"
+            self._emit(1, f"if {condition}:")
+            self._emit(2, f"result[{key!r}] = {value}")
+        self._emit_hooks(POST_DUMP, "result", "", "post_dump" if inline else "")
+        self._emit(1, "return result")
+
+    def compile(self) -> CompiledSchema:
+        _check_schema(self.schema)
+        prefix = type(self.schema).__name__
+        load_name, dump_name = f"load_{prefix}", f"dump_{prefix}"
+        self._emit_load(load_name)
+        self._emit_dump(dump_name)
+        source = "\n".join(self.lines)
+        code = compile(source, f"<compiled schema {prefix}>", "exec")
+        exec(code, self.namespace)  # noqa: S102
+        return CompiledSchema(self.namespace[load_name], self.namespace[dump_name])
+
+
+def compile_schema(schema: Schema) -> CompiledSchema:
+    """
+    Compile a schema instance's load and dump into functions.
+
+    The functions return what schema.load(data) and schema.dump(obj)
+    return for a single mapping.
+    """
+    return _SchemaCompiler(schema).compile()
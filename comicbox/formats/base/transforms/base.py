@@ -1,14 +1,15 @@
 """Transform to and from a format and comicbox format."""
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from types import MappingProxyType
-from typing import Any
+from typing import Any, ClassVar
 
-from glom import glom
+from glom import GlomError, glom
 
 from comicbox.formats.base.schemas.base import BaseSchema
 from comicbox.formats.base.schemas.cache import get_schema
+from comicbox.formats.base.transforms.compiler import SpecCompileError, compile_specs
 
 
 def skip_not(val: Any) -> bool:
@@ -22,6 +23,9 @@ class BaseTransform:
     SCHEMA_CLASS: type[BaseSchema] = BaseSchema
     SPECS_TO: MappingProxyType[str, Any] = MappingProxyType({})
     SPECS_FROM: MappingProxyType[str, Any] = MappingProxyType({})
+    # Compiled specs by transform class and specs attribute. None marks
+    # specs that only glom can interpret.
+    _SPEC_FUNCTIONS: ClassVar[dict[tuple[type, str], Callable | None]] = {}
 
     def __init__(self, path: Path | None = None) -> None:
         """Initialize instances."""
@@ -35,6 +39,32 @@ class BaseTransform:
         ):
             transformed_data[self._schema.ROOT_DATA_KEY] = root
 
+    @classmethod
+    def _get_spec_function(cls, specs_attr: str) -> Callable | None:
+        """Compile a specs attribute once per class."""
+        key = (cls, specs_attr)
+        if key not in cls._SPEC_FUNCTIONS:
+            try:
+                func = compile_specs(
+                    getattr(cls, specs_attr), f"{cls.__name__}_{specs_attr}"
+                )
+            except SpecCompileError:
+                func = None
+            cls._SPEC_FUNCTIONS[key] = func
+        return cls._SPEC_FUNCTIONS[key]
+
+    def _apply_specs(self, data: Mapping, specs_attr: str) -> dict:
+        """Transform data with compiled specs, or with glom if they never compiled."""
+        if not (func := self._get_spec_function(specs_attr)):
+            return glom(dict(data), dict(getattr(self, specs_attr)))
+        try:
+            return func(dict(data))
+        except GlomError:
+            raise
+        except Exception as exc:
+            # Raise what glom would.
+            raise GlomError.wrap(exc) from exc
+
     def to_comicbox(self, data: Mapping) -> MappingProxyType:
         """Transform the data to a normalized comicbox schema."""
         # Deferred import to break a load-time cycle: every format module
@@ -44,13 +74,13 @@ class BaseTransform:
         from comicbox.formats.comicbox.schema.yaml import ComicboxYamlSchema
 
         schema = get_schema(ComicboxYamlSchema, path=self._path)
-        transformed_data = glom(dict(data), dict(self.SPECS_TO))
+        transformed_data = self._apply_specs(data, "SPECS_TO")
         loaded_data: dict = schema.load(transformed_data)  # pyright: ignore[reportAssignmentType]
         return MappingProxyType(loaded_data)
 
     def from_comicbox(self, data: Mapping) -> MappingProxyType:
         """Transform the data from the comicbox schema to this schema."""
-        transformed_data = glom(dict(data), dict(self.SPECS_FROM))
+        transformed_data = self._apply_specs(data, "SPECS_FROM")
         self._swap_data_key(transformed_data)
         loaded_data: dict = self._schema.load(transformed_data)  # pyright: ignore[reportAssignmentType]
         return MappingProxyType(loaded_data)
@@ -0,0 +1,259 @@
+"""
+Compile transform specs into Python functions.
+
+The specs that create_specs_to_comicbox and create_specs_from_comicbox
+build are nested dicts of Coalesce leaves, and glom interprets every
+Coalesce, Path and Val of every leaf on every transform. compile_specs
+generates one function per spec dict that does the same lookups, skips,
+calls and global scope assignments as straight line code.
+
+Leaf steps that are glom specs rather than plain functions, like Fill or
+Group, still run through glom. Specs of any other shape raise
+SpecCompileError so the caller keeps interpreting them.
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+from glom import SKIP, STOP, A, Coalesce, GlomError, Path, S, T, glom
+
+from comicbox.empty import is_empty
+from comicbox.formats.base.transforms.spec import GLOBAL_SCOPE_PREFIX
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+_MISSING = object()
+_INDENT = "    "
+_SCOPE_KEY = GLOBAL_SCOPE_PREFIX.rsplit(".", 1)[-1]
+# A.globals.comicbox and S.globals.comicbox
+_SCOPE_OPS = (".", "globals", ".", _SCOPE_KEY)
+_PLAIN_CALLABLE_EXCLUDES = (dict, list, tuple, str)
+
+
+class SpecCompileError(ValueError):
+    """A spec the compiler can't express as code."""
+
+
+def _get(target: Any, key: str) -> Any:
+    """Look up a Path segment as glom's default target registry does."""
+    if isinstance(target, dict):
+        return target[key]
+    if isinstance(target, list | tuple):
+        return target[int(key)]
+    return getattr(target, key)
+
+
+def _coalesce_kwargs(spec: Any) -> dict | None:
+    """Return the keyword arguments of a single subspec Coalesce."""
+    if type(spec) is not Coalesce or len(spec.subspecs) != 1:
+        return None
+    return spec._orig_kwargs  # noqa: SLF001
+
+
+def _is_plain_callable(spec: Any) -> bool:
+    return (
+        callable(spec)
+        and not hasattr(spec, "glomit")
+        and not isinstance(spec, _PLAIN_CALLABLE_EXCLUDES)
+    )
+
+
+class _SpecCompiler:
+    """Generate the source of one spec function."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {
+            "_MISSING": _MISSING,
+            "_SKIP": SKIP,
+            "_STOP": STOP,
+            "_GlomError": GlomError,
+            "_get": _get,
+            "_glom": glom,
+            "_is_empty": is_empty,
+        }
+        self._names = count()
+
+    def _bind(self, value: Any) -> str:
+        """Name an object for the generated code."""
+        name = f"_c{next(self._names)}"
+        self.namespace[name] = value
+        return name
+
+    def _var(self) -> str:
+        return f"v{next(self._names)}"
+
+    def _emit(self, depth: int, line: str) -> None:
+        self.lines.append(_INDENT * depth + line)
+
+    #################
+    # Value sources #
+    #################
+
+    def _emit_path_lookup(self, depth: int, var: str, path: Path) -> None:
+        """Look up a Path, leaving _MISSING in var if any segment fails."""
+        items = path.items()
+        if not items or any(op != "P" or not isinstance(arg, str) for op, arg in items):
+            reason = f"Unsupported path {path!r}"
+            raise SpecCompileError(reason)
+        self._emit(depth, "try:")
+        self._emit(depth + 1, f"{var} = target")
+        for _, segment in items:
+            key = repr(segment)
+            self._emit(
+                depth + 1,
+                f"{var} = {var}[{key}] if type({var}) is dict else _get({var}, {key})",
+            )
+        self._emit(depth, "except Exception:")
+        self._emit(depth + 1, f"{var} = _MISSING")
+
+    def _emit_scope_lookup(self, depth: int, var: str, spec: Any) -> None:
+        """Look up S.globals.comicbox[...], leaving _MISSING in var if it fails."""
+        ops = spec.__ops__
+        keys = ops[1 + len(_SCOPE_OPS) :]
+        if (
+            ops[1 : 1 + len(_SCOPE_OPS)] != _SCOPE_OPS
+            or len(keys) % 2
+            or any(op != "[" for op in keys[::2])
+        ):
+            reason = f"Unsupported scope path {spec!r}"
+            raise SpecCompileError(reason)
+        subscripts = "".join(f"[{self._bind(key)}]" for key in keys[1::2])
+        self._emit(depth, "try:")
+        self._emit(depth + 1, f"{var} = scope[{_SCOPE_KEY!r}]{subscripts}")
+        self._emit(depth, "except (KeyError, IndexError, TypeError):")
+        self._emit(depth + 1, f"{var} = _MISSING")
+
+    def _emit_lookup(self, depth: int, var: str, spec: Any) -> None:
+        if isinstance(spec, Path):
+            self._emit_path_lookup(depth, var, spec)
+        elif getattr(spec, "__ops__", (None,))[0] is S:
+            self._emit_scope_lookup(depth, var, spec)
+        else:
+            reason = f"Unsupported source {spec!r}"
+            raise SpecCompileError(reason)
+
+    def _emit_single_source(self, depth: int, var: str, spec: Coalesce) -> None:
+        """Look up a value that fails the whole leaf when missing or empty."""
+        self._emit_lookup(depth, var, spec.subspecs[0])
+        self._emit(depth, f"if {var} is _MISSING or _is_empty({var}):")
+        self._emit(depth + 1, "raise _Miss")
+
+    def _emit_multi_source(self, depth: int, var: str, spec: dict) -> None:
+        """Look up a dict of values, each None when missing or empty."""
+        self._emit(depth, f"{var} = {{}}")
+        value_var = self._var()
+        for key, value_spec in spec.items():
+            if not isinstance(key, str) or _coalesce_kwargs(value_spec) != {
+                "skip": is_empty,
+                "default": None,
+            }:
+                reason = f"Unsupported multiple value source {value_spec!r}"
+                raise SpecCompileError(reason)
+            self._emit_lookup(depth, value_var, value_spec.subspecs[0])
+            self._emit(
+                depth,
+                f"{var}[{key!r}] = None if {value_var} is _MISSING or "
+                f"_is_empty({value_var}) else {value_var}",
+            )
+
+    #########
+    # Steps #
+    #########
+
+    def _emit_call(self, depth: int, var: str, call: str) -> None:
+        """Apply a step's result as a glom tuple does."""
+        result = self._var()
+        self._emit(depth, f"{result} = {call}")
+        self._emit(depth, f"if {result} is _STOP:")
+        self._emit(depth + 1, "break")
+        self._emit(depth, f"if {result} is not _SKIP:")
+        self._emit(depth + 1, f"{var} = {result}")
+
+    def _emit_step(self, depth: int, var: str, step: Any) -> None:
+        ops = getattr(step, "__ops__", None)
+        if ops and ops[0] is A and ops[1:] == _SCOPE_OPS:
+            # Assign the value to the global scope; the value passes through.
+            self._emit(depth, f"scope[{_SCOPE_KEY!r}] = {var}")
+        elif ops and ops[0] is T and len(ops) == 3 and ops[1] == "[":  # noqa: PLR2004
+            self._emit(depth, "try:")
+            self._emit(depth + 1, f"{var} = {var}[{self._bind(ops[2])}]")
+            self._emit(depth, "except (KeyError, IndexError, TypeError):")
+            self._emit(depth + 1, "raise _Miss from None")
+        elif _is_plain_callable(step):
+            self._emit_call(depth, var, f"{self._bind(step)}({var})")
+        else:
+            # Glom specs like Fill or Group.
+            self._emit_call(
+                depth, var, f"_glom({var}, {self._bind(step)}, glom_debug=True)"
+            )
+
+    ########
+    # Leaf #
+    ########
+
+    def _emit_leaf(self, var: str, leaf: Any) -> None:
+        """Evaluate Coalesce(spec, default=None) into var."""
+        if _coalesce_kwargs(leaf) != {"default": None}:
+            reason = f"Unsupported leaf {leaf!r}"
+            raise SpecCompileError(reason)
+        spec = leaf.subspecs[0]
+        steps = list(spec) if isinstance(spec, tuple) else [spec]
+        self._emit(1, "try:")
+        self._emit(2, "while True:")
+        first = steps[0] if steps else None
+        if _coalesce_kwargs(first) == {"skip": is_empty}:
+            self._emit_single_source(3, var, first)
+            steps.pop(0)
+        elif isinstance(first, dict):
+            self._emit_multi_source(3, var, first)
+            steps.pop(0)
+        else:
+            self._emit(3, f"{var} = target")
+        for step in steps:
+            self._emit_step(3, var, step)
+        self._emit(3, "break")
+        self._emit(1, "except (_Miss, _GlomError):")
+        self._emit(2, f"{var} = None")
+
+    def _emit_dict(self, specs: Mapping) -> str:
+        """Emit the leaves of a spec dict in order and return its literal."""
+        items = []
+        for key, value in specs.items():
+            if not isinstance(key, str):
+                reason = f"Unsupported key {key!r}"
+                raise SpecCompileError(reason)
+            if isinstance(value, dict):
+                expr = self._emit_dict(value)
+            else:
+                expr = self._var()
+                self._emit_leaf(expr, value)
+            items.append(f"{key!r}: {expr}")
+        return "{" + ", ".join(items) + "}"
+
+    def compile(self, specs: Mapping, name: str) -> Callable[[dict], dict]:
+        self.lines = [f"def {name}(target):", f"{_INDENT}scope = {{}}"]
+        expr = self._emit_dict(specs)
+        self._emit(1, f"return {expr}")
+        source = "\n".join(self.lines)
+        self.namespace["_Miss"] = _Miss
+        code = compile(source, f"<compiled specs {name}>", "exec")
+        exec(code, self.namespace)  # noqa: S102
+        return self.namespace[name]
+
+
+class _Miss(Exception):  # noqa: N818
+    """A required source value is missing or empty."""
+
+
+def compile_specs(specs: Mapping, name: str = "specs") -> Callable[[dict], dict]:
+    """
+    Compile a spec dict into a function that transforms a target dict.
+
+    The function returns what glom(target, dict(specs)) returns. Errors
+    raised by transform functions propagate without glom's wrapping.
+    """
+    return _SpecCompiler().compile(specs, name)
@@ -50,7 +50,8 @@ def merge_url_and_explicit_identifiers(
     # authoritative id, but keep an already-present real ``url``.
     for explicit_identifiers in explicit_identifier_dicts:
         for id_source_str, identifier in explicit_identifiers.items():
-            dest = merged.setdefault(id_source_str, {})
+            # Copy on write: the merge shares url_identifiers' dicts.
+            dest = merged[id_source_str] = dict(merged.get(id_source_str, {}))
             for field, value in identifier.items():
                 if not value:
                     continue
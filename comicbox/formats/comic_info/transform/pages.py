@@ -39,9 +39,9 @@ def _pages_from_cb(values: Mapping, page_spec: dict) -> list:
     if not comicbox_pages:
         return cix_pages
     comicbox_bookmark = values.get(BOOKMARK_KEY)
-    for index, comicbox_page in comicbox_pages.items():
+    for index, shared_page in comicbox_pages.items():
         try:
-            comicbox_page[PAGE_INDEX_KEY] = index
+            comicbox_page = {**shared_page, PAGE_INDEX_KEY: index}
             if index == comicbox_bookmark:
                 comicbox_page[BOOKMARK_KEY] = "true"
             if cix_page := glom(comicbox_page, page_spec):
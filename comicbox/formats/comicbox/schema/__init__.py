@@ -84,16 +84,19 @@ ORIGINAL_FORMAT_KEY = "original_format"
 PAGES_KEY = "pages"
 PAGE_BOOKMARK_KEY = "bookmark"
 PAGE_COUNT_KEY = "page_count"
+PAGE_DOUBLE_PAGE_KEY = "double_page"
+PAGE_HEIGHT_KEY = "height"
 PAGE_INDEX_KEY = "index"  # only used in transform
 PAGE_TYPE_KEY = "page_type"
 PAGE_SIZE_KEY = "size"
+PAGE_WIDTH_KEY = "width"
 PAGE_KEYS = frozenset(
     {
         PAGE_TYPE_KEY,
         PAGE_BOOKMARK_KEY,
-        "height",
-        "width",
-        "double_page",
+        PAGE_HEIGHT_KEY,
+        PAGE_WIDTH_KEY,
+        PAGE_DOUBLE_PAGE_KEY,
         "key",
         PAGE_SIZE_KEY,
     }
@@ -6,7 +6,8 @@ from collections.abc import Mapping, MutableMapping
 from typing_extensions import override
 
 from comicbox.formats.comicbox.schema import ComicboxSchemaMixin
-from comicbox.merge.mergedeep import Strategy, merge
+from comicbox.merge.cow import merge
+from comicbox.merge.mergedeep import Strategy
 
 
 class Merger(ABC):
@@ -20,23 +21,23 @@ class Merger(ABC):
 
 
 class AdditiveMerger(Merger):
-    """Merge with mergedeep."""
+    """Merge with the copy on write deep merge."""
 
     @override
     @staticmethod
     def merge(dest: MutableMapping, *sources: Mapping) -> MutableMapping:
-        """Merge with mergedeep."""
+        """Merge with the copy on write deep merge."""
         merge(dest, *sources, strategy=Strategy.ADDITIVE)
         return dest
 
 
 class ReplaceMerger(Merger):
-    """Merge with mergedeep."""
+    """Merge with the copy on write deep merge."""
 
     @override
     @staticmethod
     def merge(dest: MutableMapping, *sources: Mapping) -> MutableMapping:
-        """Merge with mergedeep."""
+        """Merge with the copy on write deep merge."""
         merge(dest, *sources, strategy=Strategy.REPLACE)
         return dest
 
@@ -49,6 +50,9 @@ class UpdateMerger(Merger):
     def merge(dest: MutableMapping, *sources: Mapping) -> MutableMapping:
         """Merge with update."""
         dest_sub_md = dest.get(ComicboxSchemaMixin.ROOT_TAG, {})
+        if ComicboxSchemaMixin.ROOT_TAG in dest:
+            # Copy on write: dest's sub dict may be shared with a source.
+            dest_sub_md = dest[ComicboxSchemaMixin.ROOT_TAG] = dict(dest_sub_md)
         for source in sources:
             source_sub_md = source.get(ComicboxSchemaMixin.ROOT_TAG, {})
             dest_sub_md.update(source_sub_md)
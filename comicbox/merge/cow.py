@@ -0,0 +1,160 @@
+"""
+A copy on write deep merge.
+
+Merges the same way as the vendored mergedeep, but shares instead of
+copies. Source values are inserted into dest by reference, and a
+container in dest is copied only when the merge is about to change it.
+Sources and the containers dest already held are never mutated, so
+unchanged subtrees are shared between the sources and the merged result.
+
+Callers must treat merged results as read only below the top level, or
+copy a path before changing it, as copy_keypath does.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Mapping, MutableMapping
+from copy import copy
+from functools import partial, reduce
+from types import MappingProxyType
+from typing import Any
+
+from comicbox.merge.mergedeep import Strategy
+
+
+class _Merge:
+    """The containers one merge call made and shared."""
+
+    def __init__(self, dest: MutableMapping, strategy: Strategy) -> None:
+        self._strategy = strategy
+        # Keyed by id, holding the object so the id can't be reused.
+        self._owned: dict[int, Any] = {id(dest): dest}
+        self._shared: dict[int, Any] = {}
+
+    def _own(self, parent: MutableMapping, key: Any) -> Any:
+        """Return parent[key], copying it first if this merge didn't make it."""
+        value = parent[key]
+        if id(value) not in self._owned:
+            value = copy(value)
+            parent[key] = value
+            self._owned[id(value)] = value
+        return value
+
+    def _share(self, parent: MutableMapping, key: Any, value: Any) -> None:
+        parent[key] = value
+        self._shared[id(value)] = value
+
+    ###########
+    # REPLACE #
+    ###########
+
+    def _handle_replace(
+        self, dest_parent: MutableMapping, source_parent: Mapping, key: Any
+    ) -> None:
+        if isinstance(dest_parent[key], MutableMapping) and isinstance(
+            source_parent[key], Mapping
+        ):
+            # Merges Counter as well
+            self.deepmerge(self._own(dest_parent, key), source_parent[key])
+        else:
+            self._share(dest_parent, key, source_parent[key])
+
+    ############
+    # ADDITIVE #
+    ############
+
+    def _merge_counter(self, dest_parent: MutableMapping, source: Counter, key: Any):
+        self._own(dest_parent, key).update(source)
+
+    def _merge_mapping(self, dest_parent: MutableMapping, source: Mapping, key: Any):
+        self.deepmerge(self._own(dest_parent, key), source)
+
+    def _merge_list(self, dest_parent: MutableMapping, source: list, key: Any):
+        self._own(dest_parent, key).extend(source)
+
+    def _merge_tuple(self, *_args: Any) -> None:
+        # The vendored mergedeep leaves tuple dests unchanged.
+        return
+
+    def _merge_set(self, dest_parent: MutableMapping, source: set, key: Any):
+        self._own(dest_parent, key).update(source)
+
+    _MERGE_MAP: MappingProxyType[tuple, Callable] = MappingProxyType(
+        {
+            (Counter, Counter): _merge_counter,
+            (MutableMapping, Mapping): _merge_mapping,
+            (list, list | tuple): _merge_list,
+            (tuple, list | tuple): _merge_tuple,
+            (set, set | frozenset): _merge_set,
+        }
+    )
+
+    def _handle_additive(
+        self, dest_parent: MutableMapping, source_parent: Mapping, key: Any
+    ) -> None:
+        # Values are combined into one long collection.
+        dest = dest_parent[key]
+        source = source_parent[key]
+        for types, merge_func in self._MERGE_MAP.items():
+            dest_type, source_type = types
+            if isinstance(dest, dest_type) and isinstance(source, source_type):
+                merge_func(self, dest_parent, source, key)
+                break
+        else:
+            self._handle_replace(dest_parent, source_parent, key)
+
+    ################
+    # END ADDITIVE #
+    ################
+
+    def deepmerge(self, dest: MutableMapping, source: Mapping) -> MutableMapping:
+        handle = (
+            self._handle_additive
+            if self._strategy == Strategy.ADDITIVE
+            else self._handle_replace
+        )
+        for key in source:
+            if key not in dest:
+                self._share(dest, key, source[key])
+            elif dest[key] is not source[key] or id(dest[key]) in self._shared:
+                # The same object is only skipped when the caller put it in both
+                # dest and source. Values this merge shared stand in for copies.
+                handle(dest, source, key)
+        return dest
+
+
+def merge(
+    dest: MutableMapping,
+    *sources: Mapping,
+    strategy: Strategy = Strategy.REPLACE,
+) -> MutableMapping:
+    """
+    Merge sources into dest according to strategy, sharing unchanged values.
+
+    :param dest: The dest mapping, changed in place.
+    :param sources: The source mappings, never changed.
+    :param strategy: The merge strategy.
+    :return: dest
+    """
+    return reduce(partial(_Merge.deepmerge, _Merge(dest, strategy)), sources, dest)
+
+
+def copy_keypath(data: MutableMapping, keypath: str) -> None:
+    """Copy the containers along a dotted keypath so it can be changed in place."""
+    parent: Any = data
+    for part in keypath.split(".")[:-1]:
+        key: Any = part
+        if isinstance(parent, list):
+            try:
+                key = int(part)
+                value = parent[key]
+            except (ValueError, IndexError):
+                return
+        elif isinstance(parent, MutableMapping) and part in parent:
+            value = parent[part]
+        else:
+            return
+        if not isinstance(value, MutableMapping | list):
+            return
+        value = copy(value)
+        parent[key] = value
+        parent = value
@@ -23,11 +23,12 @@ from comicbox.exceptions import UnsupportedArchiveTypeError
 from comicbox.formats import MetadataFormats
 
 if TYPE_CHECKING:
-    import datetime
+    import datetime as dt
     from collections.abc import Generator, Iterable, Mapping
 
     from comicbox.config.settings import ComicboxSettings
     from comicbox.events import EventHandler
+    from comicbox.read_cache import Fingerprint, ReadCache
 
 
 @cache
@@ -64,7 +65,7 @@ class ReadResult(TypedDict):
     found", which would force the caller to clear those links.
     """
 
-    metadata_mtime: datetime.datetime | None
+    metadata_mtime: dt.datetime | None
     page_count: int | None
     file_type: str | None
     tags: dict[str, Any] | None
@@ -80,17 +81,97 @@ def _empty_read_result() -> ReadResult:
     )
 
 
+def _cached_read_result(
+    cached: ReadResult,
+    old_mtime: dt.datetime | None,
+    *,
+    full_metadata: bool,
+) -> ReadResult | None:
+    """
+    Shape a read cache row like the worker would have, or None on a miss.
+
+    The cached row stores whatever the last worker produced, which may be
+    envelope-only. It answers any request that doesn't need tags, and any
+    request that does only if it carries them.
+    """
+    if not full_metadata:
+        return ReadResult(
+            metadata_mtime=None,
+            page_count=cached["page_count"],
+            file_type=cached["file_type"],
+            tags=None,
+        )
+    metadata_mtime = cached["metadata_mtime"]
+    if old_mtime and metadata_mtime and metadata_mtime <= old_mtime:
+        return ReadResult(**{**cached, "tags": None})
+    return cached if cached["tags"] is not None else None
+
+
+def _read_cache_lookup(
+    read_cache: ReadCache,
+    path: Path,
+    fmt: MetadataFormats,
+    old_mtime: dt.datetime | None,
+    fingerprints: dict[Path, Fingerprint],
+    *,
+    full_metadata: bool,
+    config_key: str,
+) -> ReadResult | None:
+    """
+    Answer a path from the read cache, or None on a miss.
+
+    Misses record the fingerprint taken before the worker opens the file,
+    so a file rewritten mid-read is stored under its old fingerprint and
+    misses again next run.
+    """
+    from comicbox.read_cache import file_fingerprint
+
+    try:
+        fingerprint = file_fingerprint(path)
+    except OSError:
+        # Leave missing or unreadable paths for the worker to report.
+        return None
+    if (cached := read_cache.get(path, fingerprint, fmt, config_key)) is not None and (
+        result := _cached_read_result(cached, old_mtime, full_metadata=full_metadata)
+    ) is not None:
+        return result
+    fingerprints[path] = fingerprint
+    return None
+
+
+def _read_config_key(config: ComicboxSettings | Mapping | None) -> str:
+    """Hash the effective read config once per batch for the read cache key."""
+    from comicbox.config import get_config
+    from comicbox.read_cache import read_config_key
+
+    return read_config_key(get_config(config))
+
+
+def _store_completed(
+    completed: Iterable[tuple[Path, tuple[ReadResult, BaseException | None]]],
+    read_cache: ReadCache,
+    fmt: MetadataFormats,
+    fingerprints: dict[Path, Fingerprint],
+    config_key: str,
+) -> Generator[tuple[Path, tuple[ReadResult, BaseException | None]], None, None]:
+    """Store successful worker results in the read cache as they pass through."""
+    for path, (result, exc) in completed:
+        if exc is None and (fingerprint := fingerprints.pop(path, None)):
+            read_cache.set(path, fingerprint, fmt, result, config_key)
+        yield path, (result, exc)
+
+
 def _read_one(
     path: Path | str,
     config: ComicboxSettings | Mapping | None = None,
     fmt: MetadataFormats = MetadataFormats.COMICBOX_YAML,
-    old_mtime: datetime.datetime | None = None,
+    old_mtime: dt.datetime | None = None,
     *,
     full_metadata: bool = True,
 ) -> ReadResult:
     """Read metadata from a single comic file (runs in a worker process)."""
     tags: dict[str, Any] | None = None
-    metadata_mtime: datetime.datetime | None = None
+    metadata_mtime: dt.datetime | None = None
     with Comicbox(path, config=config, fmt=fmt) as cb:
         if full_metadata:
             metadata_mtime = cb.get_metadata_mtime()
@@ -147,6 +228,17 @@ def _worker_log_init(log_config: Mapping) -> None:
     )
 
 
+def _make_executor(
+    max_workers: int | None, worker_log_config: Mapping | None
+) -> ProcessPoolExecutor:
+    """Build the worker pool, re-initializing worker logging if configured."""
+    executor_kwargs: dict[str, Any] = {"max_workers": max_workers}
+    if worker_log_config:
+        executor_kwargs["initializer"] = _worker_log_init
+        executor_kwargs["initargs"] = (dict(worker_log_config),)
+    return ProcessPoolExecutor(**executor_kwargs)
+
+
 _OutcomeCounters = dict[str, int]
 
 
@@ -187,6 +279,22 @@ def _emit_per_file_event(
         on_event(FileParsed(path=path, index=index, total=total))
 
 
+def _emit_cache_hit(
+    path: Path,
+    *,
+    index: int,
+    total: int,
+    on_event: EventHandler | None,
+    counters: _OutcomeCounters,
+) -> None:
+    """Count a read cache hit and dispatch its FileShortCircuited event."""
+    counters["short_circuited"] += 1
+    if on_event is not None:
+        on_event(
+            FileShortCircuited(path=path, index=index, total=total, reason="cache_hit")
+        )
+
+
 def _iter_completed(
     futures: Mapping[Any, Path],
     logger: Any,
@@ -248,11 +356,12 @@ def iter_process_files(  # noqa: PLR0913
     logger: Any = None,
     fmt: MetadataFormats = MetadataFormats.COMICBOX_YAML,
     max_workers: int | None = None,
-    old_mtime_map: Mapping[str, datetime.datetime] | None = None,
+    old_mtime_map: Mapping[str, dt.datetime] | None = None,
     worker_log_config: Mapping | None = None,
     *,
     full_metadata: bool = True,
     on_event: EventHandler | None = None,
+    read_cache: ReadCache | None = None,
 ) -> Generator[tuple[Path, tuple[ReadResult, BaseException | None]], None, None]:
     """
     Yield (path, (ReadResult, exception_or_None)) as each file completes.
@@ -274,6 +383,13 @@ def iter_process_files(  # noqa: PLR0913
         :class:`FileShortCircuited` / :class:`FileError` per delivered
         result, and :class:`BatchFinished` once with totals. Handler runs
         on the orchestrator thread and must be thread-safe and quick.
+
+    ``read_cache``: optional :class:`comicbox.read_cache.ReadCache`. Paths
+        whose stat fingerprint matches a cached result are answered on the
+        orchestrator without reaching a worker and reported as
+        :class:`FileShortCircuited` with ``reason="cache_hit"``. Successful
+        worker results are stored back into it. Rows are keyed by a hash of
+        the effective read config, so a run with other read settings misses.
     """
     if not logger:
         from loguru import logger
@@ -282,19 +398,38 @@ def iter_process_files(  # noqa: PLR0913
     path_list = [Path(p) for p in paths]
     total = len(path_list)
 
+    config_key = _read_config_key(config) if read_cache is not None else ""
     if on_event is not None:
         on_event(BatchStarted(total=total))
 
-    executor_kwargs: dict[str, Any] = {"max_workers": max_workers}
-    if worker_log_config:
-        executor_kwargs["initializer"] = _worker_log_init
-        executor_kwargs["initargs"] = (dict(worker_log_config),)
-    executor = ProcessPoolExecutor(**executor_kwargs)
+    executor = _make_executor(max_workers, worker_log_config)
     try:
         futures: dict = {}
         submit_failures: list[tuple[Path, BaseException]] = []
+        fingerprints: dict[Path, Fingerprint] = {}
+        counters: _OutcomeCounters = {"parsed": 0, "short_circuited": 0, "errored": 0}
+        index = 0
         for path in path_list:
             old_mtime = old_mtime_map.get(str(path), EPOCH_START)
+            if read_cache is not None and (
+                cached := _read_cache_lookup(
+                    read_cache,
+                    path,
+                    fmt,
+                    old_mtime,
+                    fingerprints,
+                    full_metadata=full_metadata,
+                    config_key=config_key,
+                )
+            ):
+                # Answered on the orchestrator while already-submitted
+                # misses run in the pool.
+                _emit_cache_hit(
+                    path, index=index, total=total, on_event=on_event, counters=counters
+                )
+                yield path, (cached, None)
+                index += 1
+                continue
             try:
                 future = executor.submit(
                     _read_one,
@@ -314,21 +449,27 @@ def iter_process_files(  # noqa: PLR0913
         # events matches the yield order seen by the caller. They seed the
         # counters and starting index that _iter_completed continues from,
         # keeping the BatchFinished invariant intact.
-        counters: _OutcomeCounters = {"parsed": 0, "short_circuited": 0, "errored": 0}
-        for index, (path, exc) in enumerate(submit_failures):
+        for path, exc in submit_failures:
             counters["errored"] += 1
             if on_event is not None:
                 on_event(FileError(path=path, index=index, total=total, error=str(exc)))
             yield path, (_empty_read_result(), exc)
+            index += 1
 
-        yield from _iter_completed(
+        completed = _iter_completed(
             futures,
             logger,
             on_event,
             total,
             counters=counters,
-            start_index=len(submit_failures),
+            start_index=index,
         )
+        if read_cache is None:
+            yield from completed
+        else:
+            yield from _store_completed(
+                completed, read_cache, fmt, fingerprints, config_key
+            )
     finally:
         executor.shutdown(wait=False, cancel_futures=True)
 
@@ -342,6 +483,7 @@ def process_files(
     worker_log_config: Mapping | None = None,
     *,
     on_event: EventHandler | None = None,
+    read_cache: ReadCache | None = None,
 ) -> dict[Path, tuple[ReadResult, BaseException | None]]:
     """Process multiple comic files in parallel via ProcessPoolExecutor."""
     return dict(
@@ -353,6 +495,7 @@ def process_files(
             max_workers,
             worker_log_config=worker_log_config,
             on_event=on_event,
+            read_cache=read_cache,
         )
     )
 
@@ -0,0 +1,281 @@
+"""
+Persistent read cache keyed by archive fingerprint.
+
+Bulk re-scans of a large library mostly re-read archives whose bytes have
+not changed since the last run. ``iter_process_files`` consults this cache
+on the orchestrator before submitting a path, so an unchanged archive is
+answered without a process hop, an archive open, or a central directory
+parse.
+
+An archive's fingerprint is its ``(st_dev, st_ino, st_size, st_mtime_ns)``
+stat tuple. Any rewrite of the file — comicbox's own metadata writes
+included — changes the size or the mtime, so a stale row can never match.
+
+Rows are keyed by path, metadata format and a hash of the read config, so
+a run with different read formats, compute switches or delete keys misses
+instead of getting another config's tags back. Storing a row for a changed
+archive drops every row left for its old bytes, whatever their config, so
+dead rows don't accumulate. Rows for configs no longer used stay until the
+archive changes or is ``delete()``d.
+
+The same file also keeps per-archive indexes, such as CBT member offsets,
+under the same fingerprint rule, so a box opened with the cache skips
+rebuilding them.
+"""
+
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import threading
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from hashlib import sha256
+from pathlib import Path
+from types import NoneType
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from platformdirs import user_cache_path
+from typing_extensions import Self
+
+if TYPE_CHECKING:
+    from os import stat_result
+
+    from comicbox.config.settings import ComicboxSettings
+    from comicbox.formats import MetadataFormats
+    from comicbox.process import ReadResult
+
+Fingerprint: TypeAlias = tuple[int, int, int, int]
+
+_DB_FILENAME = "read_cache.sqlite"
+_PURGE_SQL = (
+    "DELETE FROM {table} WHERE path = ? AND NOT "
+    "(st_dev = ? AND st_ino = ? AND st_size = ? AND st_mtime_ns = ?)"
+)
+
+
+def stat_fingerprint(st: stat_result) -> Fingerprint:
+    """Return the fingerprint for an existing stat result."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def file_fingerprint(path: Path | str) -> Fingerprint:
+    """Return the (st_dev, st_ino, st_size, st_mtime_ns) fingerprint of a file."""
+    return stat_fingerprint(Path(path).stat())
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce a settings value to a repr that is stable across runs."""
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if is_dataclass(value) and not isinstance(value, type):
+        return tuple(
+            (f.name, _canonical(getattr(value, f.name))) for f in fields(value)
+        )
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_canonical(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    return value if isinstance(value, (str, int, float, NoneType)) else str(value)
+
+
+def read_config_key(config: ComicboxSettings) -> str:
+    """Return a stable hash of the settings that shape a read result."""
+    general = config.general
+    settings = (
+        config.read,
+        config.compute,
+        general.delete_keys,
+        general.metadata,
+        general.metadata_cli,
+        general.metadata_format,
+        config.convert.import_paths,
+        config.read_filename_formats,
+        config.read_file_formats,
+        config.read_metadata_lower_filenames,
+        config.is_read_comments,
+        config.is_skip_computed_from_tags,
+    )
+    return sha256(repr(_canonical(settings)).encode()).hexdigest()[:16]
+
+
+def default_read_cache_path() -> Path:
+    """Return the platformdirs user cache path for the read cache."""
+    return user_cache_path("comicbox") / _DB_FILENAME
+
+
+class ReadCache:
+    """
+    SQLite store of ``ReadResult`` envelopes and tags per archive fingerprint.
+
+    One connection is shared behind a lock rather than reconnecting per
+    call: a nightly scan does hundreds of thousands of lookups and the
+    connect cost would dominate them. Writes only happen on the
+    orchestrator thread, so workers never contend for the database.
+
+    Every operation is best-effort: a locked, busy, or corrupt database
+    reads as a miss and drops stores and deletes rather than failing the
+    batch.
+    """
+
+    def __init__(self, db_path: Path | str | None = None) -> None:
+        """Open / create the sqlite cache file at ``db_path``."""
+        path = Path(db_path) if db_path else default_read_cache_path()
+        path = path.expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_path = path
+        # Reclaim space left by replaced rows before the connection opens.
+        from comicbox.formats.base.online.vacuum import vacuum_if_bloated
+
+        vacuum_if_bloated(self._db_path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = sqlite3.connect(
+            self._db_path, isolation_level=None, check_same_thread=False
+        )
+        with suppress(sqlite3.Error):
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(read_results)")
+        }
+        if columns and "config_key" not in columns:
+            # Rows from before results were keyed by config; it's only a cache.
+            self._conn.execute("DROP TABLE read_results")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS read_results ("
+            "path TEXT NOT NULL, fmt TEXT NOT NULL, config_key TEXT NOT NULL, "
+            "st_dev INTEGER NOT NULL, st_ino INTEGER NOT NULL, "
+            "st_size INTEGER NOT NULL, st_mtime_ns INTEGER NOT NULL, "
+            "result BLOB NOT NULL, PRIMARY KEY (path, fmt, config_key))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS archive_indexes ("
+            "path TEXT NOT NULL, kind TEXT NOT NULL, "
+            "st_dev INTEGER NOT NULL, st_ino INTEGER NOT NULL, "
+            "st_size INTEGER NOT NULL, st_mtime_ns INTEGER NOT NULL, "
+            "data BLOB NOT NULL, PRIMARY KEY (path, kind))"
+        )
+
+    @property
+    def db_path(self) -> Path:
+        """Return the path of the sqlite file."""
+        return self._db_path
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        if self._conn is None:
+            reason = f"Read cache {self._db_path} is closed."
+            raise sqlite3.ProgrammingError(reason)
+        return self._conn.execute(sql, params)
+
+    def _load(self, sql: str, params: tuple, fingerprint: Fingerprint) -> Any:
+        """Unpickle the blob of a row whose fingerprint still matches."""
+        try:
+            with self._lock:
+                row = self._execute(sql, params).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row or tuple(row[:4]) != fingerprint:
+            return None
+        try:
+            return pickle.loads(row[4])  # noqa: S301
+        except Exception:
+            # Written by an incompatible comicbox version; treat as a miss.
+            return None
+
+    def _store(
+        self, table: str, sql: str, key: tuple, fingerprint: Fingerprint, value: Any
+    ) -> None:
+        """Replace a row, dropping the path's rows for other archive bytes."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = key[0]
+        with suppress(sqlite3.Error), self._lock:
+            self._execute(_PURGE_SQL.format(table=table), (path, *fingerprint))
+            self._execute(sql, (*key, *fingerprint, blob))
+
+    def get(
+        self,
+        path: Path | str,
+        fingerprint: Fingerprint,
+        fmt: MetadataFormats,
+        config_key: str = "",
+    ) -> ReadResult | None:
+        """Return the cached result if the archive fingerprint still matches."""
+        return self._load(
+            "SELECT st_dev, st_ino, st_size, st_mtime_ns, result "
+            "FROM read_results WHERE path = ? AND fmt = ? AND config_key = ?",
+            (str(path), fmt.name, config_key),
+            fingerprint,
+        )
+
+    def set(
+        self,
+        path: Path | str,
+        fingerprint: Fingerprint,
+        fmt: MetadataFormats,
+        result: ReadResult | dict[str, Any],
+        config_key: str = "",
+    ) -> None:
+        """Store the result for an archive, replacing any previous row."""
+        self._store(
+            "read_results",
+            "INSERT OR REPLACE INTO read_results "
+            "(path, fmt, config_key, st_dev, st_ino, st_size, st_mtime_ns, result) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(path), fmt.name, config_key),
+            fingerprint,
+            dict(result),
+        )
+
+    def get_index(self, path: Path | str, fingerprint: Fingerprint, kind: str) -> Any:
+        """Return a cached archive index if the archive fingerprint still matches."""
+        return self._load(
+            "SELECT st_dev, st_ino, st_size, st_mtime_ns, data "
+            "FROM archive_indexes WHERE path = ? AND kind = ?",
+            (str(path), kind),
+            fingerprint,
+        )
+
+    def set_index(
+        self, path: Path | str, fingerprint: Fingerprint, kind: str, index: Any
+    ) -> None:
+        """Store an archive index, replacing any previous one of its kind."""
+        self._store(
+            "archive_indexes",
+            "INSERT OR REPLACE INTO archive_indexes "
+            "(path, kind, st_dev, st_ino, st_size, st_mtime_ns, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (str(path), kind),
+            fingerprint,
+            index,
+        )
+
+    def delete(self, path: Path | str) -> None:
+        """Forget every cached result and index for a path."""
+        with suppress(sqlite3.Error, OSError), self._lock:
+            self._execute("DELETE FROM read_results WHERE path = ?", (str(path),))
+            self._execute("DELETE FROM archive_indexes WHERE path = ?", (str(path),))
+
+    def clear(self) -> None:
+        """Forget every cached result and index."""
+        with suppress(sqlite3.Error, OSError), self._lock:
+            self._execute("DELETE FROM read_results")
+            self._execute("DELETE FROM archive_indexes")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> Self:
+        """Context enter."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Context close."""
+        self.close()
@@ -0,0 +1,249 @@
+"""
+Cover thumbnails with an on disk cache.
+
+Hosts that show covers decode and resize every full size cover themselves,
+which dominates the first scan of a large library. ``make_thumbnail``
+decodes at reduced resolution where the codec allows it: JPEG covers
+downscale in the DCT domain through Pillow's draft mode and JPEG 2000
+covers decode a lower resolution level. Pillow's reducing resize does the
+rest.
+
+Thumbnails are stored by content address under a key of the archive
+fingerprint, the cover filename, the size, the format and its quality,
+and the page format of pdf covers, so a rewritten archive, a different
+cover or different settings never match a stale file. Stores are
+atomic renames and, like the read cache, best-effort: a failed read is a
+miss and a failed write is dropped.
+
+``extract_covers`` builds thumbnails for many archives across a process
+pool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import suppress
+from io import BytesIO
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, TypeAlias
+
+from platformdirs import user_cache_path
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Mapping
+
+    from PIL.Image import Image
+
+    from comicbox.config.settings import ComicboxSettings
+    from comicbox.read_cache import Fingerprint
+
+ThumbnailSize: TypeAlias = int | tuple[int, int]
+
+DEFAULT_FORMAT = "webp"
+DEFAULT_QUALITY = 80
+_DIRNAME = "thumbnails"
+_FORMAT_SUFFIXES = {"webp": ".webp", "jpeg": ".jpg", "png": ".png"}
+_FORMAT_ALIASES = {"jpg": "jpeg"}
+# Formats that take a save quality.
+_LOSSY_FORMATS = frozenset({"webp", "jpeg"})
+# Modes each format saves without conversion.
+_FORMAT_MODES = {
+    "webp": frozenset({"RGB", "RGBA"}),
+    "jpeg": frozenset({"RGB", "L"}),
+    "png": frozenset({"RGB", "RGBA", "L", "LA", "P"}),
+}
+_JPEG2000_MAX_REDUCE = 5
+
+
+def default_thumbnail_cache_dir() -> Path:
+    """Return the platformdirs user cache path for thumbnails."""
+    return user_cache_path("comicbox") / _DIRNAME
+
+
+def _normalize_format(fmt: str) -> str:
+    fmt = fmt.lower()
+    fmt = _FORMAT_ALIASES.get(fmt, fmt)
+    if fmt not in _FORMAT_SUFFIXES:
+        reason = f"Unsupported thumbnail format: {fmt}"
+        raise ValueError(reason)
+    return fmt
+
+
+def _bounding_box(size: ThumbnailSize) -> tuple[int, int]:
+    return (size, size) if isinstance(size, int) else size
+
+
+def _reduce_jpeg2000(img: Image, box: tuple[int, int]) -> None:
+    """Decode only the resolution level the thumbnail needs."""
+    factor = 0
+    while (
+        factor < _JPEG2000_MAX_REDUCE
+        and img.width >> (factor + 1) >= box[0]
+        and img.height >> (factor + 1) >= box[1]
+    ):
+        factor += 1
+    if factor:
+        img.reduce = factor  # pyright: ignore[reportAttributeAccessIssue], # ty: ignore[invalid-assignment]
+
+
+def make_thumbnail(
+    data: bytes,
+    size: ThumbnailSize,
+    fmt: str = DEFAULT_FORMAT,
+    quality: int = DEFAULT_QUALITY,
+) -> bytes:
+    """Shrink image data to fit inside size, keeping its aspect ratio."""
+    from PIL import Image as PILImage
+
+    fmt = _normalize_format(fmt)
+    box = _bounding_box(size)
+    with PILImage.open(BytesIO(data)) as img:
+        if img.format == "JPEG":
+            # Scales by 1/2, 1/4 or 1/8 while decoding, never below box.
+            img.draft("RGB", box)
+        elif img.format == "JPEG2000":
+            _reduce_jpeg2000(img, box)
+        img.thumbnail(box, reducing_gap=2.0)
+        thumb = img
+        if thumb.mode not in _FORMAT_MODES[fmt]:
+            has_alpha = "A" in thumb.getbands() or "transparency" in thumb.info
+            mode = "RGBA" if has_alpha and "RGBA" in _FORMAT_MODES[fmt] else "RGB"
+            thumb = thumb.convert(mode)
+        buf = BytesIO()
+        save_kwargs = {"quality": quality} if fmt in _LOSSY_FORMATS else {}
+        thumb.save(buf, format=fmt.upper(), **save_kwargs)
+    return buf.getvalue()
+
+
+class ThumbnailCache:
+    """Content addressed directory of thumbnail files."""
+
+    def __init__(self, cache_dir: Path | str | None = None) -> None:
+        """Create the cache directory."""
+        path = Path(cache_dir) if cache_dir else default_thumbnail_cache_dir()
+        self.cache_dir = path.expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(
+        fingerprint: Fingerprint,
+        filename: str,
+        size: ThumbnailSize,
+        fmt: str,
+        quality: int = DEFAULT_QUALITY,
+        pdf_format: str = "",
+    ) -> str:
+        """
+        Return the content address for a thumbnail.
+
+        pdf_format is the page format a pdf cover was read with, empty for
+        other archives.
+        """
+        box = _bounding_box(size)
+        fmt = _normalize_format(fmt)
+        fmt_quality = quality if fmt in _LOSSY_FORMATS else None
+        material = repr(
+            (tuple(fingerprint), filename, box, fmt, fmt_quality, pdf_format)
+        ).encode()
+        return hashlib.sha256(material).hexdigest()
+
+    def path(self, key: str, fmt: str) -> Path:
+        """Return where a thumbnail lives, sharded by key prefix."""
+        suffix = _FORMAT_SUFFIXES[_normalize_format(fmt)]
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, fmt: str) -> bytes | None:
+        """Return a cached thumbnail or None."""
+        try:
+            return self.path(key, fmt).read_bytes()
+        except OSError:
+            return None
+
+    def set(self, key: str, fmt: str, data: bytes) -> None:
+        """Store a thumbnail atomically."""
+        path = self.path(key, fmt)
+        tmp_name = ""
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with NamedTemporaryFile(
+                dir=path.parent, prefix=".tmp-", delete=False
+            ) as tmp:
+                tmp_name = tmp.name
+                tmp.write(data)
+            Path(tmp_name).replace(path)
+        except OSError:
+            if tmp_name:
+                with suppress(OSError):
+                    Path(tmp_name).unlink()
+
+    def clear(self) -> None:
+        """Remove every cached thumbnail."""
+        for path in self.cache_dir.glob("*/*"):
+            with suppress(OSError):
+                path.unlink()
+
+
+def _cover_thumbnail(
+    path: Path,
+    size: ThumbnailSize,
+    fmt: str,
+    cache_dir: Path | str | None,
+    config: ComicboxSettings | Mapping | None,
+    *,
+    skip_metadata: bool,
+    quality: int,
+) -> bytes:
+    """Build one archive's cover thumbnail in a worker."""
+    from comicbox.box import Comicbox
+
+    cache = ThumbnailCache(cache_dir)
+    with Comicbox(path, config=config) as cb:
+        return cb.get_cover_thumbnail(
+            size, fmt, cache=cache, skip_metadata=skip_metadata, quality=quality
+        )
+
+
+def extract_covers(
+    paths: Iterable[Path | str],
+    size: ThumbnailSize,
+    fmt: str = DEFAULT_FORMAT,
+    cache_dir: Path | str | None = None,
+    config: ComicboxSettings | Mapping | None = None,
+    max_workers: int | None = None,
+    *,
+    skip_metadata: bool = False,
+    quality: int = DEFAULT_QUALITY,
+) -> Generator[tuple[Path, bytes, BaseException | None]]:
+    """
+    Yield (path, thumbnail, exception_or_None) as each archive completes.
+
+    Thumbnails come from and go to the cache at cache_dir, the user cache
+    directory by default. Failures are delivered rather than raised, with
+    empty thumbnail bytes, so one bad archive can't abort the batch.
+    """
+    fmt = _normalize_format(fmt)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _cover_thumbnail,
+                Path(path),
+                size,
+                fmt,
+                cache_dir,
+                config,
+                skip_metadata=skip_metadata,
+                quality=quality,
+            ): Path(path)
+            for path in paths
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as exc:
+                    yield futures[future], b"", exc
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,75 @@
+"""Tests for single read archive type detection."""
+
+from __future__ import annotations
+
+import shutil
+import tarfile
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.sniff import sniff_archive_types
+from tests.const import TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from comicbox.enums.comicbox import FileTypeEnum
+
+ARCHIVE_PATHS = tuple(
+    sorted(
+        path
+        for suffix in ("cbz", "cbr", "cb7", "cbt", "pdf")
+        for path in TEST_FILES_DIR.glob(f"*.{suffix}")
+    )
+)
+
+
+def _legacy_file_type(path: Path) -> FileTypeEnum | None:
+    with Comicbox() as cb:
+        cb._path = path
+        for key in cb._FULL_DETECT_ORDER:
+            if cb._try_detect(key, path):
+                return cb._file_type
+    return None
+
+
+@pytest.mark.parametrize("path", ARCHIVE_PATHS, ids=lambda p: p.name)
+def test_matches_library_detection(path: Path) -> None:
+    with Comicbox(path) as cb:
+        assert cb._file_type == _legacy_file_type(path)
+
+
+@pytest.mark.parametrize("path", ARCHIVE_PATHS, ids=lambda p: p.name)
+def test_misnamed_archive_detected_in_one_read(
+    tmp_path: Path, path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = _legacy_file_type(path)
+    misnamed = tmp_path / (path.stem + (".cbr" if path.suffix == ".cbz" else ".cbz"))
+    shutil.copy(path, misnamed)
+
+    def _no_library_detection(_path: Path) -> bool:
+        reason = "detected without magic bytes"
+        raise AssertionError(reason)
+
+    monkeypatch.setattr(Comicbox, "_try_detect", _no_library_detection)
+    with Comicbox(misnamed) as cb:
+        assert cb._file_type == expected
+
+
+@pytest.mark.parametrize("compression", ["", "gz", "xz"])
+def test_sniff_tar(compression: str) -> None:
+    buf = BytesIO()
+    with tarfile.open(fileobj=buf, mode=f"w:{compression}") as tf:
+        info = tarfile.TarInfo("page.jpg")
+        info.size = 3
+        tf.addfile(info, BytesIO(b"abc"))
+    data = buf.getvalue()
+    assert sniff_archive_types(data[:8192], data[-8192:]) == {"tar"}
+
+
+@pytest.mark.parametrize("data", [b"", b"not an archive" * 100, bytes(1024)])
+def test_sniff_nothing(data: bytes) -> None:
+    assert not sniff_archive_types(data, data)
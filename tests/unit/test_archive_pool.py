@@ -0,0 +1,94 @@
+"""Tests for the pool of open archives."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.pool import ArchivePool
+from tests.const import CB7_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _copy(tmp_path: Path, source: Path = CIX_CBZ_SOURCE_PATH) -> Path:
+    path = tmp_path / source.name
+    shutil.copy(source, path)
+    return path
+
+
+@pytest.mark.parametrize(
+    "source", [CIX_CBZ_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CB7_SOURCE_PATH]
+)
+def test_reopen_reuses_archive(tmp_path: Path, source: Path) -> None:
+    path = _copy(tmp_path, source)
+    with ArchivePool() as pool:
+        with Comicbox(path, pool=pool) as cb:
+            page = cb.get_page_by_index(0)
+            archive = cb._archive
+        assert len(pool) == 1
+        with Comicbox(path, pool=pool) as cb:
+            assert cb._namelist is not None
+            assert cb.get_page_by_index(0) == page
+            assert cb._archive is archive
+        assert pool.hits == 1
+
+
+def test_changed_file_is_not_reused(tmp_path: Path) -> None:
+    path = _copy(tmp_path)
+    with ArchivePool() as pool:
+        with Comicbox(path, pool=pool) as cb:
+            cb.get_page_by_index(0)
+            archive = cb._archive
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        with Comicbox(path, pool=pool) as cb:
+            assert cb._archive is None
+            assert cb.get_page_by_index(0)
+            assert cb._archive is not archive
+        assert pool.hits == 0
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    paths = [
+        _copy(tmp_path, CIX_CBZ_SOURCE_PATH),
+        _copy(tmp_path, CIX_CBT_SOURCE_PATH),
+    ]
+    with ArchivePool(max_handles=1) as pool:
+        for path in paths:
+            with Comicbox(path, pool=pool) as cb:
+                cb.get_page_by_index(0)
+        assert len(pool) == 1
+        with Comicbox(paths[0], pool=pool):
+            pass
+        assert pool.hits == 0
+
+
+def test_memory_budget(tmp_path: Path) -> None:
+    path = _copy(tmp_path)
+    with ArchivePool(max_bytes=1) as pool:
+        with Comicbox(path, pool=pool) as cb:
+            cb.get_page_by_index(0)
+        assert len(pool) == 0
+        assert pool.size == 0
+
+
+def test_threads_share_pool(tmp_path: Path) -> None:
+    path = _copy(tmp_path)
+    with Comicbox(path) as cb:
+        expected = cb.get_page_by_index(1)
+
+    def _read(pool: ArchivePool) -> bytes | None:
+        with Comicbox(path, pool=pool) as cb:
+            return cb.get_page_by_index(1)
+
+    with ArchivePool() as pool, ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_read, [pool] * 32))
+        assert len(pool) == 1
+    assert results == [expected] * 32
@@ -0,0 +1,130 @@
+"""Tests for the byte budgeted CB7 page buffer."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from py7zr import SevenZipFile
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.sevenzip import PageBufferFactory
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PAGE_SIZE = 1000
+PAGES = {f"{index:03}.jpg": os.urandom(PAGE_SIZE) for index in range(6)}
+
+
+class SmallBufferComicbox(Comicbox):
+    """Room for two pages in memory."""
+
+    CB7_BUFFER_MEMORY_LIMIT = 2 * PAGE_SIZE
+
+
+class SpillBufferComicbox(SmallBufferComicbox):
+    """Room for two more pages on disk."""
+
+    CB7_BUFFER_SPILL_LIMIT = 2 * PAGE_SIZE
+
+
+@pytest.fixture
+def cb7_path(tmp_path: Path) -> Path:
+    path = tmp_path / "test.cb7"
+    with SevenZipFile(path, "w") as archive:
+        for name, data in PAGES.items():
+            archive.writestr(data, name)
+    return path
+
+
+def _count_extracts(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls = []
+    extract = SevenZipFile.extract
+
+    def _extract(self, *args, **kwargs):
+        calls.extend(kwargs.get("targets") or ())
+        return extract(self, *args, **kwargs)
+
+    monkeypatch.setattr(SevenZipFile, "extract", _extract)
+    return calls
+
+
+def test_buffer_hits(cb7_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _count_extracts(monkeypatch)
+    with Comicbox(cb7_path) as cb:
+        assert cb.get_cb7_buffer_stats() is None
+        for name in ("000.jpg", "001.jpg", "000.jpg", "001.jpg"):
+            assert cb.get_page_by_filename(name) == PAGES[name]
+        stats = cb.get_cb7_buffer_stats()
+    assert calls == ["000.jpg", "001.jpg"]
+    assert stats
+    assert (stats.hits, stats.misses) == (2, 2)
+    assert stats.memory_size == 2 * PAGE_SIZE
+
+
+def test_memory_budget(cb7_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _count_extracts(monkeypatch)
+    with SmallBufferComicbox(cb7_path) as cb:
+        for name, data in PAGES.items():
+            assert cb.get_page_by_filename(name) == data
+            stats = cb.get_cb7_buffer_stats()
+            assert stats
+            assert stats.memory_size <= cb.CB7_BUFFER_MEMORY_LIMIT
+        # The most recent pages are buffered, the oldest were dropped.
+        assert cb.get_page_by_filename("005.jpg") == PAGES["005.jpg"]
+        assert cb.get_page_by_filename("000.jpg") == PAGES["000.jpg"]
+        stats = cb.get_cb7_buffer_stats()
+    assert calls == [*PAGES, "000.jpg"]
+    assert stats
+    assert stats.evictions == len(PAGES) - 1
+    assert not stats.spills
+    assert not stats.spill_size
+
+
+def test_spill_budget(cb7_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _count_extracts(monkeypatch)
+    with SpillBufferComicbox(cb7_path) as cb:
+        for name, data in PAGES.items():
+            assert cb.get_page_by_filename(name) == data
+        # Pages pushed out of memory are read back from their spill files.
+        assert cb.get_page_by_filename("002.jpg") == PAGES["002.jpg"]
+        assert cb.get_page_by_filename("000.jpg") == PAGES["000.jpg"]
+        stats = cb.get_cb7_buffer_stats()
+    assert calls == [*PAGES, "000.jpg"]
+    assert stats
+    assert stats.hits == 1
+    assert stats.spills
+    assert stats.spill_size <= SpillBufferComicbox.CB7_BUFFER_SPILL_LIMIT
+    assert stats.memory_size <= SpillBufferComicbox.CB7_BUFFER_MEMORY_LIMIT
+
+
+def test_oversized_page(cb7_path: Path) -> None:
+    class TinyBufferComicbox(Comicbox):
+        CB7_BUFFER_MEMORY_LIMIT = PAGE_SIZE // 2
+
+    with TinyBufferComicbox(cb7_path) as cb:
+        assert cb.get_page_by_filename("000.jpg") == PAGES["000.jpg"]
+        stats = cb.get_cb7_buffer_stats()
+    assert stats
+    assert (stats.memory_size, stats.spill_size) == (0, 0)
+    assert stats.evictions == 1
+
+
+@pytest.mark.parametrize("spill_limit", [0, 4 * PAGE_SIZE])
+def test_member_over_memory_limit(spill_limit: int) -> None:
+    """A member that spills while it's written is charged in full."""
+    factory = PageBufferFactory(memory_limit=PAGE_SIZE, spill_limit=spill_limit)
+    data = os.urandom(3 * PAGE_SIZE)
+    product = factory.create("big.jpg")
+    for start in range(0, len(data), PAGE_SIZE // 10):
+        product.write(data[start : start + PAGE_SIZE // 10])
+        assert factory.spill_size == product.size() or not product.spilled
+    assert factory.read("big.jpg") == data
+    stats = factory.stats
+    assert stats.memory_size == 0
+    assert stats.spill_size == (len(data) if spill_limit else 0)
+    assert stats.evictions == (0 if spill_limit else 1)
+    factory.close()
+    assert (factory.memory_size, factory.spill_size) == (0, 0)
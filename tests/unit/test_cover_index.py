@@ -0,0 +1,90 @@
+"""Tests for the persistent cover index."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from argparse import Namespace
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+from comicbox.box import Comicbox
+from comicbox.read_cache import ReadCache, file_fingerprint
+from tests.const import CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _no_metadata(*_args, **_kwargs):
+    reason = "cover should come from the index"
+    raise AssertionError(reason)
+
+
+def test_cover_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / CIX_CBZ_SOURCE_PATH.name
+    shutil.copy(CIX_CBZ_SOURCE_PATH, path)
+    with ReadCache(tmp_path / "cache.sqlite") as read_cache:
+        with Comicbox(path, read_cache=read_cache) as cb:
+            cover = cb.get_cover_page()
+            cover_path = cb.get_cover_paths()[0]
+            kind = cb._get_cover_index_kind()
+        assert cover
+        assert read_cache.get_index(path, file_fingerprint(path), kind) == cover_path
+
+        with monkeypatch.context() as mp:
+            mp.setattr(Comicbox, "generate_cover_paths", _no_metadata)
+            with Comicbox(path, read_cache=read_cache) as cb:
+                assert cb.get_cover_page() == cover
+            with Comicbox(path, read_cache=read_cache) as cb:
+                assert cb.get_cover_thumbnail(32)
+
+        # A changed archive misses the index.
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        calls = []
+        generate_cover_paths = Comicbox.generate_cover_paths
+
+        def _generate(self):
+            calls.append(self)
+            return generate_cover_paths(self)
+
+        monkeypatch.setattr(Comicbox, "generate_cover_paths", _generate)
+        with Comicbox(path, read_cache=read_cache) as cb:
+            assert cb.get_cover_page() == cover
+        assert calls
+
+
+def test_cover_index_skips_api_metadata(tmp_path: Path) -> None:
+    with ReadCache(tmp_path / "cache.sqlite") as read_cache:
+        metadata = {"comicbox": {"title": "Override"}}
+        with Comicbox(
+            CIX_CBZ_SOURCE_PATH, metadata=metadata, read_cache=read_cache
+        ) as cb:
+            assert cb.get_cover_page()
+            kind = cb._get_cover_index_kind()
+        fingerprint = file_fingerprint(CIX_CBZ_SOURCE_PATH)
+        assert read_cache.get_index(CIX_CBZ_SOURCE_PATH, fingerprint, kind) is None
+
+
+def test_cover_index_keyed_by_config(tmp_path: Path) -> None:
+    path = tmp_path / "bare.cbz"
+    pages = {f"{index:03}.jpg": b"\xff\xd8" + bytes([index]) * 64 for index in range(3)}
+    with ZipFile(path, "w") as zf:
+        for name, data in pages.items():
+            zf.writestr(name, data)
+    override = Namespace(
+        comicbox=Namespace(general=Namespace(metadata_cli=["cover_image: 002.jpg"]))
+    )
+    with ReadCache(tmp_path / "cache.sqlite") as read_cache:
+        with Comicbox(path, read_cache=read_cache) as cb:
+            assert cb.get_cover_page() == pages["000.jpg"]
+        # The cover indexed without metadata doesn't answer a run with it.
+        with Comicbox(path, config=override, read_cache=read_cache) as cb:
+            assert cb.get_cover_page() == pages["002.jpg"]
+        with Comicbox(path, read_cache=read_cache) as cb:
+            assert cb.get_cover_page() == pages["000.jpg"]
+        with Comicbox(path, config=override, read_cache=read_cache) as cb:
+            assert cb.get_cover_page() == pages["002.jpg"]
@@ -0,0 +1,117 @@
+"""Tests for concurrent streaming page extraction."""
+
+from __future__ import annotations
+
+import tarfile
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+from loguru import logger
+
+from comicbox.box import Comicbox
+from tests.const import CB7_SOURCE_PATH
+
+PAGES = {
+    "a/001.jpg": b"\xff\xd8" + bytes(range(256)) * 400,
+    "a/002.jpg": b"\xff\xd8" + b"stored" * 5000,
+    "a/003.jpg": b"\xff\xd8" + b"first" * 100,
+    "b/003.jpg": b"\xff\xd8" + b"last" * 100,
+}
+
+
+def _make_cbz(path: Path) -> None:
+    with ZipFile(path, "w") as zf:
+        for index, (name, data) in enumerate(PAGES.items()):
+            compress_type = ZIP_STORED if index % 2 else ZIP_DEFLATED
+            zf.writestr(name, data, compress_type=compress_type)
+
+
+def _make_cbt(path: Path, mode: str) -> None:
+    with tarfile.open(path, mode) as tf:
+        for name, data in PAGES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, BytesIO(data))
+
+
+def _no_buffered_read(*_args, **_kwargs) -> bytes:
+    reason = "pages should stream to disk"
+    raise AssertionError(reason)
+
+
+@pytest.mark.parametrize(
+    ("suffix", "make"),
+    [
+        (".cbz", _make_cbz),
+        (".cbt", lambda path: _make_cbt(path, "w")),
+        (".cbt", lambda path: _make_cbt(path, "w:gz")),
+    ],
+    ids=["cbz", "cbt", "cbt-gz"],
+)
+def test_extract_streamed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, suffix: str, make
+) -> None:
+    path = tmp_path / f"test{suffix}"
+    make(path)
+    dest = tmp_path / "pages"
+    dest.mkdir()
+    monkeypatch.setattr(Comicbox, "_archive_readfile", _no_buffered_read)
+    monkeypatch.setattr(Comicbox, "EXTRACT_WORKERS", 2)
+    with Comicbox(path) as cb:
+        cb.extract_pages(path=dest)
+    assert sorted(p.name for p in dest.iterdir()) == ["001.jpg", "002.jpg", "003.jpg"]
+    for name in ("a/001.jpg", "a/002.jpg", "b/003.jpg"):
+        assert (dest / name.split("/")[1]).read_bytes() == PAGES[name]
+
+
+@pytest.mark.parametrize(
+    ("suffix", "make", "method"),
+    [
+        (".cbz", _make_cbz, "_extract_zip_member"),
+        (".cbt", lambda path: _make_cbt(path, "w:gz"), "_extract_tar_member"),
+    ],
+    ids=["cbz", "cbt-gz"],
+)
+def test_extract_streamed_logs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, suffix: str, make, method: str
+) -> None:
+    path = tmp_path / f"test{suffix}"
+    make(path)
+    dest = tmp_path / "pages"
+    dest.mkdir()
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="INFO", format="{message}")
+    try:
+        with Comicbox(path) as cb:
+            cb.extract_pages(path=dest)
+        assert messages[-1].strip() == f"Saved 3 pages to {dest}"
+
+        def _fail(_self, filename: str, *_args) -> None:
+            reason = "boom"
+            raise OSError(reason)
+
+        monkeypatch.setattr(Comicbox, method, _fail)
+        messages.clear()
+        with Comicbox(path) as cb:
+            cb.extract_pages(path=dest)
+    finally:
+        logger.remove(handler_id)
+    lines = [message.strip() for message in messages]
+    assert "Could not extract page a/001.jpg: boom" in lines
+    assert lines[-1] == "No pages extracted: boom"
+
+
+def test_extract_cb7_single_pass(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with Comicbox(CB7_SOURCE_PATH) as cb:
+        expected = {
+            Path(name).name: cb._archive_readfile(name)
+            for name in cb.get_page_filenames()
+        }
+    monkeypatch.setattr(Comicbox, "_archive_readfile", _no_buffered_read)
+    with Comicbox(CB7_SOURCE_PATH) as cb:
+        cb.extract_pages(path=tmp_path)
+    assert {p.name: p.read_bytes() for p in tmp_path.iterdir()} == expected
@@ -0,0 +1,149 @@
+"""Tests for reading page dimensions from image headers."""
+
+from __future__ import annotations
+
+from argparse import Namespace
+from io import BytesIO
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+from PIL import Image
+from py7zr import SevenZipFile
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.imagesize import image_size
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SIZE = (123, 45)
+
+
+def _image(fmt: str, size: tuple[int, int] = SIZE, **kwargs) -> bytes:
+    mode = "RGBA" if kwargs.pop("alpha", False) else "RGB"
+    buf = BytesIO()
+    Image.new(mode, size, "red").save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+def _jxl_codestream(*fields: tuple[int, int]) -> bytes:
+    """Pack (value, bit count) fields least significant bit first."""
+    value = shift = 0
+    for field, bits in fields:
+        value |= field << shift
+        shift += bits
+    return b"\xff\x0a" + value.to_bytes((shift + 7) // 8 + 1, "little")
+
+
+# A large EXIF segment pushes the start of frame past the first read.
+_EXIF = b"Exif\x00\x00" + bytes(20_000)
+
+IMAGES = {
+    "jpeg": _image("JPEG"),
+    "jpeg-exif": _image("JPEG", exif=_EXIF),
+    "progressive-jpeg": _image("JPEG", progressive=True),
+    "png": _image("PNG"),
+    "gif": _image("GIF"),
+    "webp-lossy": _image("WEBP"),
+    "webp-lossless": _image("WEBP", lossless=True),
+    "webp-extended": _image("WEBP", alpha=True, exif=b"Exif\x00\x00"),
+}
+
+
+@pytest.mark.parametrize("name", IMAGES)
+def test_image_size(name: str) -> None:
+    assert image_size(IMAGES[name]) == SIZE
+
+
+def test_jxl_small_header() -> None:
+    # small, height 32, no ratio, width 64
+    data = _jxl_codestream((1, 1), (3, 5), (0, 3), (7, 5))
+    assert image_size(data) == (64, 32)
+
+
+def test_jxl_sizes() -> None:
+    # not small, 13 bit height 700, no ratio, 13 bit width 1000
+    data = _jxl_codestream((0, 1), (1, 2), (699, 13), (0, 3), (1, 2), (999, 13))
+    assert image_size(data) == (1000, 700)
+    # ratio 7 is 2:1
+    data = _jxl_codestream((0, 1), (1, 2), (699, 13), (7, 3))
+    assert image_size(data) == (1400, 700)
+    container = (
+        b"\x00\x00\x00\x0cJXL \r\n\x87\n"
+        + (20).to_bytes(4, "big")
+        + b"ftyp"
+        + b"jxl \x00\x00\x00\x00jxl "
+        + (8 + len(data)).to_bytes(4, "big")
+        + b"jxlc"
+        + data
+    )
+    assert image_size(container) == (1400, 700)
+
+
+def test_truncated_and_unknown() -> None:
+    with pytest.raises(EOFError):
+        image_size(IMAGES["jpeg-exif"][:4096])
+    assert image_size(b"II*\x00" + bytes(100)) is None
+
+
+def _make_cbz(path: Path) -> None:
+    with ZipFile(path, "w") as zf:
+        zf.writestr("001.jpg", IMAGES["jpeg-exif"], compress_type=ZIP_DEFLATED)
+        zf.writestr("002.png", _image("PNG", (200, 100)), compress_type=ZIP_STORED)
+        zf.writestr("003.webp", IMAGES["webp-lossy"], compress_type=ZIP_DEFLATED)
+
+
+def test_computed_pages(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "test.cbz"
+    _make_cbz(path)
+
+    def _no_full_read(*_args, **_kwargs) -> None:
+        reason = "pages should not be read whole"
+        raise AssertionError(reason)
+
+    monkeypatch.setattr(ZipFile, "read", _no_full_read)
+    config = Namespace(
+        comicbox=Namespace(
+            compute=Namespace(pages=True), write=Namespace(formats=["cix"])
+        )
+    )
+    with Comicbox(path, config=config) as cb:
+        pages = cb._get_computed_pages_metadata({"page_count": 3})
+    assert pages
+    pages = pages["pages"]
+    assert pages[0]["width"] == SIZE[0]
+    assert pages[0]["height"] == SIZE[1]
+    assert pages[0]["double_page"]
+    assert (pages[1]["width"], pages[1]["height"]) == (200, 100)
+    assert (pages[2]["width"], pages[2]["height"]) == SIZE
+
+
+def test_computed_pages_cb7(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """CB7 page dimensions come from one extract, not one per page."""
+    path = tmp_path / "test.cb7"
+    with SevenZipFile(path, "w") as archive:
+        archive.writestr(IMAGES["jpeg-exif"], "001.jpg")
+        archive.writestr(_image("PNG", (200, 100)), "002.png")
+        archive.writestr(IMAGES["webp-lossy"], "003.webp")
+    extracts = []
+    extract = SevenZipFile.extract
+
+    def _extract(self, *args, **kwargs):
+        extracts.append(kwargs.get("targets"))
+        return extract(self, *args, **kwargs)
+
+    monkeypatch.setattr(SevenZipFile, "extract", _extract)
+    config = Namespace(
+        comicbox=Namespace(
+            compute=Namespace(pages=True), write=Namespace(formats=["cix"])
+        )
+    )
+    with Comicbox(path, config=config) as cb:
+        pages = cb._get_computed_pages_metadata({"page_count": 3})
+    assert len(extracts) == 1
+    assert pages
+    pages = pages["pages"]
+    assert (pages[0]["width"], pages[0]["height"]) == SIZE
+    assert (pages[1]["width"], pages[1]["height"]) == (200, 100)
+    assert (pages[2]["width"], pages[2]["height"]) == SIZE
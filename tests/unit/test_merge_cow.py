@@ -0,0 +1,105 @@
+"""Tests for the copy on write deep merge."""
+
+from __future__ import annotations
+
+from collections import Counter
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.formats import MetadataFormats
+from comicbox.merge import mergedeep
+from comicbox.merge.cow import copy_keypath, merge
+from comicbox.merge.mergedeep import Strategy
+from tests.const import TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+STRATEGIES = [Strategy.REPLACE, Strategy.ADDITIVE]
+CASES = [
+    ({"a": {"x": 1, "y": [1]}}, [{"a": {"y": [2], "z": {"q": 1}}, "b": [3]}]),
+    ({"pages": [1, 2], "count": 2}, [{"pages": (3,), "count": 1}, {"pages": [4]}]),
+    ({"tags": {"a"}, "t": (1,)}, [{"tags": frozenset({"b"}), "t": [2]}]),
+    ({"c": Counter(a=1), "s": "x"}, [{"c": Counter(a=2, b=1), "s": {"k": 1}}]),
+    ({"a": {"x": {"y": 1}}}, [{"a": {"x": {"z": 2}}}, {"a": {"x": {"y": 3}}}]),
+    ({}, [{"a": [1], "b": {"c": 1}}, {"a": [2], "b": {"c": 2, "d": [1]}}]),
+]
+ARCHIVE_NAMES = [
+    "Captain Science #001 (1950) The Beginning - multi.cbz",
+    "comicbox.cbz",
+    "test_pdf.pdf",
+]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize(("dest", "sources"), CASES)
+def test_parity(dest: dict, sources: list[Mapping], strategy: Strategy) -> None:
+    """Results match mergedeep and the inputs are left alone."""
+    dest, sources = deepcopy(dest), deepcopy(sources)
+    expected = mergedeep.merge(deepcopy(dest), *deepcopy(sources), strategy=strategy)
+    dest_values, dest_copy = dict(dest), deepcopy(dest)
+    sources_copy = deepcopy(sources)
+    result = merge(dest, *sources, strategy=strategy)
+    assert result is dest
+    assert result == expected
+    assert sources == sources_copy
+    # The containers dest held are copied before they change.
+    assert dest_values == dest_copy
+
+
+def test_shares_unchanged_subtrees() -> None:
+    shared = {"x": [1, 2]}
+    source = {"a": shared, "b": {"y": 1}}
+    dest = {"b": {"z": 2}}
+    merge(dest, source)
+    assert dest["a"] is shared
+    assert dest["b"] is not source["b"]
+    assert source["b"] == {"y": 1}
+
+
+def test_merged_aliases_act_as_copies() -> None:
+    """Values a merge shares are copied before a later source changes them."""
+    first = {"a": {"x": [1]}}
+    second = {"a": {"x": [2]}}
+    dest = {}
+    merge(dest, first, second, strategy=Strategy.ADDITIVE)
+    assert dest == {"a": {"x": [1, 2]}}
+    assert first == {"a": {"x": [1]}}
+
+
+def test_same_object_skipped() -> None:
+    """Like mergedeep, a value already in dest and source is left as is."""
+    items = [1]
+    dest = {"a": items}
+    merge(dest, {"a": items}, strategy=Strategy.ADDITIVE)
+    assert dest == {"a": [1]}
+
+
+def test_copy_keypath() -> None:
+    leaf = {"name": "x"}
+    pages = [leaf]
+    data = {"comicbox": {"pages": pages, "title": "t"}}
+    original = data["comicbox"]
+    copy_keypath(data, "comicbox.pages.0.name")
+    del data["comicbox"]["pages"][0]["name"]
+    assert leaf == {"name": "x"}
+    assert pages == [leaf]
+    assert original == {"pages": [{"name": "x"}], "title": "t"}
+    copy_keypath(data, "comicbox.missing.key")
+    copy_keypath(data, "comicbox.pages.5.name")
+
+
+@pytest.mark.parametrize("name", ARCHIVE_NAMES)
+def test_box_metadata_unchanged(name: str) -> None:
+    """Writing every format leaves the cached merged metadata alone."""
+    with Comicbox(TEST_FILES_DIR / name) as cb:
+        cb.to_dict()
+        merged = cb.get_merged_metadata()
+        snapshot = deepcopy(dict(merged))
+        for fmt in MetadataFormats:
+            if fmt.value.enabled:
+                cb.to_dict(fmt)
+        assert dict(merged) == snapshot
@@ -0,0 +1,83 @@
+"""Tests for keeping CBZ metadata members at the end of the archive."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+from zipremove import ZipFile as RemoveZipFile
+
+from comicbox.box import Comicbox
+from comicbox.write import write_metadata
+from tests.const import CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+METADATA_NAMES = frozenset({"comicinfo.xml", "comicbox.json"})
+
+
+def _metadata_first_cbz(tmp_path: Path) -> Path:
+    path = tmp_path / "test.cbz"
+    with ZipFile(CIX_CBZ_SOURCE_PATH) as src, ZipFile(path, "w") as dest:
+        infos = sorted(
+            src.infolist(), key=lambda i: not i.filename.lower().endswith(".xml")
+        )
+        for info in infos:
+            dest.writestr(info, src.read(info))
+    return path
+
+
+def _layout(path: Path) -> list[tuple[str, int]]:
+    with ZipFile(path) as zf:
+        assert zf.testzip() is None
+        return sorted(
+            ((i.filename, i.header_offset) for i in zf.infolist()),
+            key=lambda item: item[1],
+        )
+
+
+def _is_metadata(filename: str) -> bool:
+    return filename.rsplit("/", 1)[-1].lower() in METADATA_NAMES
+
+
+def _pages(path: Path) -> list[bytes]:
+    with Comicbox(path) as cb:
+        return list(cb.get_pages(0, cb.get_page_count() - 1))
+
+
+def _write(path: Path, title: str) -> None:
+    result = write_metadata(path, patch={"title": title}, formats=["comic_info"])
+    assert result.error is None
+
+
+def test_metadata_moves_to_tail_then_truncates(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _metadata_first_cbz(tmp_path)
+    pages = _pages(path)
+    assert _is_metadata(_layout(path)[0][0])
+
+    _write(path, "First")
+    layout = _layout(path)
+    flags = [_is_metadata(filename) for filename, _ in layout]
+    assert flags == sorted(flags)
+    assert flags[-1]
+    page_offsets = [item for item in layout if not _is_metadata(item[0])]
+
+    def _no_repack(*_args, **_kwargs) -> None:
+        reason = "pages should not move"
+        raise AssertionError(reason)
+
+    monkeypatch.setattr(RemoveZipFile, "repack", _no_repack)
+    size = path.stat().st_size
+    _write(path, "A much longer second title than the first one")
+    layout = _layout(path)
+    assert [item for item in layout if not _is_metadata(item[0])] == page_offsets
+    assert _pages(path) == pages
+    assert abs(path.stat().st_size - size) < 1024
+    with Comicbox(path) as cb:
+        title = cb.get_internal_metadata()["comicbox"]["title"]
+    assert title == "A much longer second title than the first one"
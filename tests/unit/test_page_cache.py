@@ -0,0 +1,85 @@
+"""Tests for the shared memory page cache."""
+
+from __future__ import annotations
+
+import multiprocessing
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.pagecache import SharedPageCache
+from tests.const import CB7_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FINGERPRINT = (1, 2, 3, 4)
+SIZE = 64 * 1024
+SLOTS = 16
+
+
+def _set_in_child(path: str) -> None:
+    with SharedPageCache(path) as cache:
+        cache.set(FINGERPRINT, "child.jpg", b"from the child")
+
+
+def test_get_set(tmp_path: Path) -> None:
+    with SharedPageCache(tmp_path / "pages", SIZE, SLOTS) as cache:
+        assert cache.get(FINGERPRINT, "001.jpg") is None
+        cache.set(FINGERPRINT, "001.jpg", b"page one")
+        assert cache.get(FINGERPRINT, "001.jpg") == b"page one"
+        assert cache.get((1, 2, 3, 5), "001.jpg") is None
+        cache.set(FINGERPRINT, "001.jpg", b"page one again")
+        assert cache.get(FINGERPRINT, "001.jpg") == b"page one again"
+        # Too big to be worth caching.
+        cache.set(FINGERPRINT, "big.jpg", bytes(cache.max_page_size + 1))
+        assert cache.get(FINGERPRINT, "big.jpg") is None
+        cache.clear()
+        assert cache.get(FINGERPRINT, "001.jpg") is None
+
+
+def test_ring_and_slot_eviction(tmp_path: Path) -> None:
+    with SharedPageCache(tmp_path / "pages", SIZE, SLOTS) as cache:
+        page = bytes(cache.max_page_size)
+        names = [f"{i:03}.jpg" for i in range(40)]
+        for name in names:
+            cache.set(FINGERPRINT, name, page)
+        assert cache.get(FINGERPRINT, names[-1]) == page
+        live = [name for name in names if cache.get(FINGERPRINT, name) is not None]
+        # The oldest pages were overwritten by the ring.
+        assert len(live) <= 8
+
+
+def test_shared_between_processes(tmp_path: Path) -> None:
+    path = tmp_path / "pages"
+    with SharedPageCache(path, SIZE, SLOTS) as cache:
+        context = multiprocessing.get_context("spawn")
+        child = context.Process(target=_set_in_child, args=(str(path),))
+        child.start()
+        child.join(30)
+        assert child.exitcode == 0
+        assert cache.get(FINGERPRINT, "child.jpg") == b"from the child"
+    # Reopening keeps the geometry the file was created with.
+    with SharedPageCache(path, SIZE * 2, SLOTS * 2) as cache:
+        assert cache.max_page_size < SIZE // 8
+        assert cache.get(FINGERPRINT, "child.jpg") == b"from the child"
+
+
+def test_box_reads_through_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with SharedPageCache(tmp_path / "pages", 16 * 1024 * 1024) as cache:
+        with Comicbox(CB7_SOURCE_PATH, page_cache=cache) as cb:
+            expected = cb.get_page_by_index(1)
+        assert expected
+
+        def _no_read(*_args, **_kwargs) -> bytes:
+            reason = "page should come from the cache"
+            raise AssertionError(reason)
+
+        monkeypatch.setattr(Comicbox, "_archive_readfile", _no_read)
+        with Comicbox(CB7_SOURCE_PATH, page_cache=cache) as cb:
+            assert cb.get_page_by_index(1) == expected
+            with pytest.raises(AssertionError):
+                cb.get_page_by_index(2)
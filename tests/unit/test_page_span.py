@@ -0,0 +1,78 @@
+"""Tests for sendfile-ready page spans."""
+
+from __future__ import annotations
+
+import tarfile
+from typing import TYPE_CHECKING
+from zipfile import ZIP_STORED, ZipFile
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.sniff import sniff_mime_type
+from tests.const import CB7_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _read_span(path: Path, offset: int, length: int) -> bytes:
+    with path.open("rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def _stored_cbz(tmp_path: Path) -> Path:
+    path = tmp_path / "stored.cbz"
+    with ZipFile(CIX_CBZ_SOURCE_PATH) as src, ZipFile(path, "w") as dest:
+        for info in src.infolist():
+            dest.writestr(info.filename, src.read(info), compress_type=ZIP_STORED)
+    return path
+
+
+def _plain_cbt(tmp_path: Path) -> Path:
+    path = tmp_path / "plain.cbt"
+    with tarfile.open(CIX_CBT_SOURCE_PATH) as src, tarfile.open(path, "w") as dest:
+        for info in src.getmembers():
+            dest.addfile(info, src.extractfile(info) if info.isreg() else None)
+    return path
+
+
+@pytest.mark.parametrize("make_archive", [_stored_cbz, _plain_cbt])
+def test_page_span(tmp_path: Path, make_archive) -> None:
+    path = make_archive(tmp_path)
+    with Comicbox(path) as cb:
+        for filename in cb.get_page_filenames():
+            span = cb.get_page_span(filename)
+            assert span
+            assert span.path == path
+            assert span.content_type == "image/jpeg"
+            data = _read_span(span.path, span.offset, span.length)
+            assert data == cb.get_page_by_filename(filename)
+
+
+@pytest.mark.parametrize(
+    "path", [CIX_CBZ_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CB7_SOURCE_PATH]
+)
+def test_no_span_for_compressed_members(path: Path) -> None:
+    with Comicbox(path) as cb:
+        filename = cb.get_pagename(0)
+        assert filename
+        assert cb.get_page_span(filename) is None
+
+
+def test_no_span_for_missing_member(tmp_path: Path) -> None:
+    with Comicbox(_stored_cbz(tmp_path)) as cb:
+        assert cb.get_page_span("missing.jpg") is None
+
+
+@pytest.mark.parametrize(
+    ("data", "filename", "mime_type"),
+    [
+        (b"\x89PNG\r\n\x1a\n", "page.jpg", "image/png"),
+        (b"\x00\x00", "page.jxl", "image/jxl"),
+        (b"\x00\x00", "page", "application/octet-stream"),
+    ],
+)
+def test_sniff_mime_type(data: bytes, filename: str, mime_type: str) -> None:
+    assert sniff_mime_type(data, filename) == mime_type
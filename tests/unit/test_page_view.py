@@ -0,0 +1,68 @@
+"""Tests for zero copy page views."""
+
+from __future__ import annotations
+
+import mmap
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from comicbox.box import Comicbox
+from tests.const import CB7_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _stored_copy(tmp_path: Path) -> Path:
+    """Rewrite the fixture with STORED pages and a deflated ComicInfo."""
+    path = tmp_path / "stored.cbz"
+    with ZipFile(CIX_CBZ_SOURCE_PATH) as src, ZipFile(path, "w") as dest:
+        for info in src.infolist():
+            compress = ZIP_STORED if info.filename.endswith(".jpg") else ZIP_DEFLATED
+            dest.writestr(info.filename, src.read(info), compress_type=compress)
+    return path
+
+
+def test_stored_page_view_is_zero_copy(tmp_path: Path) -> None:
+    path = _stored_copy(tmp_path)
+    with Comicbox(path) as cb:
+        filename = cb.get_pagename(0)
+        assert filename
+        view = cb.get_page_view(filename)
+        assert isinstance(view.obj, mmap.mmap)
+        assert view.readonly
+        assert bytes(view) == cb.get_page_by_filename(filename)
+        # The page list reads through the same map.
+        views = tuple(cb.get_pages(0, 2, zero_copy=True))
+        assert all(isinstance(v.obj, mmap.mmap) for v in views)
+        assert [bytes(v) for v in views] == list(cb.get_pages(0, 2))
+    # Still readable after close while referenced.
+    assert bytes(view[:3]) == b"\xff\xd8\xff"
+    view.release()
+
+
+def test_stored_page_view_with_open_zipfile(tmp_path: Path) -> None:
+    """Views still work once ZipFile already holds the directory."""
+    path = _stored_copy(tmp_path)
+    with Comicbox(path) as cb:
+        filename = cb.get_pagename(1)
+        assert filename
+        data = cb.get_page_by_filename(filename)
+        cb._zipdir = None
+        view = cb.get_page_view(filename)
+        assert isinstance(view.obj, mmap.mmap)
+        assert view == data
+
+
+@pytest.mark.parametrize(
+    "path", [CIX_CBZ_SOURCE_PATH, CIX_CBT_SOURCE_PATH, CB7_SOURCE_PATH]
+)
+def test_page_view_falls_back_to_copy(path: Path) -> None:
+    with Comicbox(path) as cb:
+        filename = cb.get_pagename(0)
+        assert filename
+        view = cb.get_page_view(filename)
+        assert not isinstance(view.obj, mmap.mmap)
+        assert view == cb.get_page_by_filename(filename)
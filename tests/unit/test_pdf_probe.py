@@ -0,0 +1,172 @@
+"""Tests for reading pdf metadata without MuPDF."""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING
+
+import pymupdf
+import pytest
+from pdffile import PDFFile
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.pdfprobe import PdfProbe, PdfProbeError, _Parser
+from tests.const import TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PDF_NAMES = ("test_cix.pdf", "test_pdf.pdf", "test_pdf_legacy_keywords.pdf")
+
+
+@pytest.mark.parametrize("name", PDF_NAMES)
+def test_probe_matches_mupdf(name: str) -> None:
+    path = TEST_FILES_DIR / name
+    probe = PdfProbe.from_path(path)
+    with pymupdf.open(path) as doc:
+        assert probe.page_count == doc.page_count
+        assert probe.metadata == doc.metadata
+    with PDFFile(path) as pdf:
+        assert list(probe.namelist()) == pdf.namelist()
+
+
+@pytest.mark.parametrize("name", PDF_NAMES)
+def test_box_skips_mupdf(name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = TEST_FILES_DIR / name
+    with Comicbox(path) as cb:
+        expected_metadata = cb.to_dict()
+        expected_count = cb.get_page_count()
+
+    def _no_open(*_args, **_kwargs) -> None:
+        reason = "pdf should not be opened"
+        raise AssertionError(reason)
+
+    monkeypatch.setattr(PDFFile, "__init__", _no_open)
+    with Comicbox(path) as cb:
+        assert cb.get_page_count() == expected_count
+        assert cb.get_metadata_mtime() == cb.get_path_mtime_dttm()
+        if name != "test_cix.pdf":
+            # The embedded ComicInfo.xml is read from the open pdf.
+            assert cb.to_dict() == expected_metadata
+
+
+def test_probe_rejects(tmp_path: Path) -> None:
+    path = tmp_path / "garbage.pdf"
+    path.write_bytes(b"%PDF-1.7\nnot a pdf at all\n%%EOF\n")
+    with pytest.raises(PdfProbeError):
+        PdfProbe.from_path(path)
+
+    path = tmp_path / "encrypted.pdf"
+    with pymupdf.open() as doc:
+        doc.new_page()
+        doc.save(
+            path,
+            encryption=pymupdf.PDF_ENCRYPT_AES_256,
+            owner_pw="owner",
+            user_pw="user",
+        )
+    with pytest.raises(PdfProbeError):
+        PdfProbe.from_path(path)
+
+
+def _write_pdf(path: Path, objects: list[bytes]) -> None:
+    """Write a pdf with a correct xref table around raw objects."""
+    out = bytearray(b"%PDF-1.7\n")
+    offsets = []
+    for num, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<</Size %d/Root 1 0 R>>\n" % (len(objects) + 1)
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    path.write_bytes(out)
+
+
+def _write_hybrid_pdf(path: Path) -> None:
+    """Write a hybrid pdf whose table marks the Info dict, kept in an object stream, free."""
+    out = bytearray(b"%PDF-1.7\n")
+    offsets = {}
+
+    def _add(num: int, obj: bytes) -> None:
+        offsets[num] = len(out)
+        out.extend(b"%d 0 obj\n%s\nendobj\n" % (num, obj))
+
+    def _stream(info: bytes, data: bytes) -> bytes:
+        return b"<<%s/Length %d>>\nstream\n%s\nendstream" % (info, len(data), data)
+
+    _add(1, b"<</Type/Catalog/Pages 2 0 R>>")
+    _add(2, b"<</Type/Pages/Count 1/Kids[3 0 R]>>")
+    _add(3, b"<</Type/Page/MediaBox[0 0 595 842]/Parent 2 0 R>>")
+    _add(5, _stream(b"/Type/ObjStm/N 1/First 4", b"4 0 <</Title(Hybrid)>>"))
+    # Object 4 is the first object in object stream 5.
+    _add(6, _stream(b"/Type/XRef/Size 7/W[1 2 1]/Index[4 1]", b"\x02\x00\x05\x00"))
+    xref = len(out)
+    out += b"xref\n0 7\n0000000000 65535 f \n"
+    for num in range(1, 7):
+        if num in offsets:
+            out += b"%010d 00000 n \n" % offsets[num]
+        else:
+            out += b"0000000000 00001 f \n"
+    out += b"trailer\n<</Size 7/Root 1 0 R/Info 4 0 R/XRefStm %d>>\n" % offsets[6]
+    out += b"startxref\n%d\n%%%%EOF\n" % xref
+    path.write_bytes(out)
+
+
+def test_hybrid_xref(tmp_path: Path) -> None:
+    """XRefStm entries replace the free entries of their xref table."""
+    path = tmp_path / "hybrid.pdf"
+    _write_hybrid_pdf(path)
+    probe = PdfProbe.from_path(path)
+    assert probe.page_count == 1
+    assert probe.metadata["title"] == "Hybrid"
+
+
+class _MuPDFOpenedError(Exception):
+    pass
+
+
+@pytest.mark.parametrize(
+    "catalog",
+    [
+        b"<</Type/Catalog/Pages[2 0 R]>>",
+        b"[/Catalog]",
+    ],
+)
+def test_malformed_falls_back_to_mupdf(
+    catalog: bytes, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Objects of the wrong type make the probe defer to MuPDF."""
+    path = tmp_path / "malformed.pdf"
+    _write_pdf(
+        path,
+        [
+            catalog,
+            b"<</Type/Pages/Count 1/Kids[3 0 R]>>",
+            b"<</Type/Page/MediaBox[0 0 595 842]/Parent 2 0 R>>",
+        ],
+    )
+    with pytest.raises(PdfProbeError):
+        PdfProbe.from_path(path)
+
+    def _open(*_args, **_kwargs) -> None:
+        raise _MuPDFOpenedError
+
+    monkeypatch.setattr(PDFFile, "__init__", _open)
+    with Comicbox(path) as cb:
+        assert cb._get_pdf_probe() is None
+        with pytest.raises(_MuPDFOpenedError):
+            cb.get_page_count()
+
+
+@pytest.mark.parametrize("params", [b"5", b"[1 2]", b"(text)"])
+def test_stream_params_not_a_dict(params: bytes) -> None:
+    data = b"abc"
+    compressed = zlib.compress(data)
+    buf = (
+        b"1 0 obj\n<</Filter/FlateDecode/DecodeParms %s/Length %d>>\nstream\n%s"
+        b"\nendstream\nendobj\n" % (params, len(compressed), compressed)
+    )
+    parser = _Parser(buf)
+    assert parser.read_stream(parser._parse_indirect(0, 1)) == data
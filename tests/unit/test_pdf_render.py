@@ -0,0 +1,109 @@
+"""Tests for parallel pdf page rendering."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pymupdf import Document, Pixmap
+
+from comicbox._pdf import PAGE_FORMAT_PDF, PAGE_FORMAT_PIXMAP_JPEG
+from comicbox.box import Comicbox
+from comicbox.box.archive import pdfrender
+from comicbox.box.archive.pdfrender import PdfRenderSettings, render_pages
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PAGE_COUNT = 6
+POOL = PdfRenderSettings(workers=2, min_pages=2)
+SERIAL = PdfRenderSettings(workers=1)
+
+
+@pytest.fixture
+def pdf_path(tmp_path: Path) -> Path:
+    path = tmp_path / "test.pdf"
+    doc = Document()
+    for i in range(PAGE_COUNT):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 40 + i * 10), f"Page {i}", fontsize=24)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _names(path: Path) -> list[str]:
+    with Comicbox(path) as cb:
+        return list(cb.get_page_filenames())
+
+
+@pytest.mark.parametrize("pdf_format", [PAGE_FORMAT_PIXMAP_JPEG, PAGE_FORMAT_PDF])
+def test_pool_matches_serial(pdf_path: Path, pdf_format: str) -> None:
+    names = _names(pdf_path)
+    serial = list(render_pages(pdf_path, names, pdf_format, SERIAL))
+    pooled = list(render_pages(pdf_path, names, pdf_format, POOL))
+    assert [name for name, _, _ in pooled] == names
+    assert pooled == serial
+
+
+def test_render_settings(pdf_path: Path) -> None:
+    names = _names(pdf_path)[:2]
+    low = {
+        name: data
+        for name, data, _ in render_pages(
+            pdf_path,
+            names,
+            PAGE_FORMAT_PIXMAP_JPEG,
+            PdfRenderSettings(workers=1, dpi=36, jpeg_quality=20),
+        )
+    }
+    high = {
+        name: data
+        for name, data, _ in render_pages(
+            pdf_path,
+            names,
+            PAGE_FORMAT_PIXMAP_JPEG,
+            PdfRenderSettings(workers=1, dpi=144, jpeg_quality=95),
+        )
+    }
+    for name in names:
+        assert Pixmap(low[name]).width * 4 == Pixmap(high[name]).width
+        assert len(low[name]) < len(high[name])
+
+
+def test_box_renders_in_pool(pdf_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    with Comicbox(pdf_path) as cb:
+        expected = [
+            cb.get_page_by_index(i, pdf_format=PAGE_FORMAT_PIXMAP_JPEG)
+            for i in range(PAGE_COUNT)
+        ]
+    monkeypatch.setattr(Comicbox, "PDF_RENDER_SETTINGS", POOL)
+    with Comicbox(pdf_path) as cb:
+        pages = list(
+            cb.get_pages(0, PAGE_COUNT - 1, pdf_format=PAGE_FORMAT_PIXMAP_JPEG)
+        )
+    assert pages == expected
+
+
+@pytest.mark.parametrize(
+    ("pdf_format", "settings"),
+    [
+        (PAGE_FORMAT_PIXMAP_JPEG, PdfRenderSettings(min_pages=2)),
+        (PAGE_FORMAT_PDF, POOL),
+    ],
+)
+def test_pool_opt_in(
+    pdf_path: Path,
+    pdf_format: str,
+    settings: PdfRenderSettings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Default settings and pdf page splits render in process."""
+
+    def _no_pool(*_args, **_kwargs) -> None:
+        reason = "pages should render in process"
+        raise AssertionError(reason)
+
+    monkeypatch.setattr(pdfrender, "_render_in_pool", _no_pool)
+    names = _names(pdf_path)
+    assert len(list(render_pages(pdf_path, names, pdf_format, settings))) == len(names)
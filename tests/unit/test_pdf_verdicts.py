@@ -0,0 +1,98 @@
+"""Tests for classifying pdf pages once per document."""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pymupdf
+from pdffile import PDFFile
+from PIL import Image
+
+from comicbox.box import Comicbox
+from comicbox.read_cache import ReadCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+PAGE_COUNT = 3
+
+
+def _build_pdf(path: Path) -> None:
+    """Red top, blue bottom pages; the first is displayed upside down."""
+    img = Image.new("RGB", (300, 400), (200, 50, 50))
+    img.paste((50, 50, 200), (0, 200, 300, 400))
+    buf = BytesIO()
+    img.save(buf, "JPEG")
+    doc = pymupdf.open()
+    for index in range(PAGE_COUNT):
+        page = doc.new_page(width=300, height=400)
+        page.insert_image(page.rect, stream=buf.getvalue())
+        if not index:
+            page.set_rotation(180)
+    doc.save(path)
+    doc.close()
+
+
+def _top_is_blue(data: bytes) -> bool:
+    img = Image.open(BytesIO(data)).convert("RGB")
+    px = img.getpixel((img.width // 2, img.height // 20))
+    assert isinstance(px, tuple)
+    return px[2] > px[0]
+
+
+def _count_classify(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls = []
+    classify_page = PDFFile.classify_page
+
+    def _classify_page(self: PDFFile, index: int):
+        calls.append(index)
+        return classify_page(self, index)
+
+    monkeypatch.setattr(PDFFile, "classify_page", _classify_page)
+    return calls
+
+
+def test_classify_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "rotated.pdf"
+    _build_pdf(path)
+    calls = _count_classify(monkeypatch)
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        with Comicbox(path, read_cache=cache) as cb:
+            pages = [
+                cb.get_page_by_index(index, pdf_format="image")
+                for index in (0, 1, 2, 0)
+            ]
+            verdicts = cb._get_pdf_page_verdicts()
+        # Rotated pages render through pdffile, which classifies them itself.
+        assert calls[:PAGE_COUNT] == list(range(PAGE_COUNT))
+        assert set(calls[PAGE_COUNT:]) == {0}
+        assert verdicts
+        assert [bool(verdict.rotation) for verdict in verdicts] == [
+            True,
+            False,
+            False,
+        ]
+        assert all(pages)
+        assert _top_is_blue(pages[0])
+        assert not _top_is_blue(pages[1])
+
+        # The verdicts come from the read cache.
+        calls.clear()
+        with Comicbox(path, read_cache=cache) as cb:
+            page = cb.get_page_by_index(1, pdf_format="image")
+        assert not calls
+        assert page == pages[1]
+
+
+def test_other_formats_skip_classify(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "rotated.pdf"
+    _build_pdf(path)
+    calls = _count_classify(monkeypatch)
+    with Comicbox(path) as cb:
+        assert cb.get_page_by_index(1, pdf_format="pdf")
+    assert not calls
@@ -0,0 +1,79 @@
+"""Tests for the read ahead page prefetcher."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from tests.const import CB7_SOURCE_PATH, CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _pages(path: Path) -> list[bytes]:
+    with Comicbox(path) as cb:
+        return [cb.get_page_by_filename(name) for name in cb.get_page_filenames()]
+
+
+@pytest.mark.parametrize("path", [CIX_CBZ_SOURCE_PATH, CB7_SOURCE_PATH])
+def test_sequential_reads_hit(path: Path) -> None:
+    expected = _pages(path)
+    with Comicbox(path) as cb:
+        prefetcher = cb.get_page_prefetcher(ahead=3)
+        assert list(prefetcher.iter_pages()) == expected
+        assert prefetcher.get_page(len(expected)) is None
+    assert prefetcher.misses == 1
+    assert prefetcher.hits == len(expected) - 1
+
+
+def test_jump_cancels_read_ahead(monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = _pages(CIX_CBZ_SOURCE_PATH)
+    read = []
+    gate = threading.Event()
+    blocked = threading.Event()
+    get_page_by_filename = Comicbox.get_page_by_filename
+
+    def _read(self, filename: str, pdf_format: str = "") -> bytes:
+        read.append(filename)
+        if len(read) == 2:
+            # Hold the first page of read ahead until the reader jumps.
+            blocked.set()
+            gate.wait(5)
+        return get_page_by_filename(self, filename, pdf_format)
+
+    monkeypatch.setattr(Comicbox, "get_page_by_filename", _read)
+    with Comicbox(CIX_CBZ_SOURCE_PATH) as cb:
+        names = cb.get_page_filenames()
+        prefetcher = cb.get_page_prefetcher(ahead=2)
+        assert prefetcher.get_page(0) == expected[0]
+        assert blocked.wait(5)
+        result = []
+        reader = threading.Thread(target=lambda: result.append(prefetcher.get_page(4)))
+        reader.start()
+        gate.set()
+        reader.join(5)
+    assert result == [expected[4]]
+    # Page 2 was queued behind page 1 and cancelled by the jump.
+    assert read == [names[0], names[1], names[4]]
+
+
+def test_memory_limit_evicts() -> None:
+    expected = _pages(CIX_CBZ_SOURCE_PATH)
+    with Comicbox(CIX_CBZ_SOURCE_PATH) as cb:
+        prefetcher = cb.get_page_prefetcher(ahead=1, memory_limit=1)
+        assert list(prefetcher.iter_pages()) == expected
+        assert prefetcher.get_page(0) == expected[0]
+        assert prefetcher.misses == 2
+
+
+def test_box_close_closes_prefetcher() -> None:
+    with Comicbox(CIX_CBZ_SOURCE_PATH) as cb:
+        prefetcher = cb.get_page_prefetcher()
+        prefetcher.get_page(0)
+        assert cb.get_page_prefetcher() is not prefetcher
+    with pytest.raises(RuntimeError):
+        prefetcher.get_page(1)
@@ -0,0 +1,182 @@
+"""Tests for the fingerprint keyed read cache used by iter_process_files."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+from argparse import Namespace
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from comicbox.config import get_config
+from comicbox.events import Event, FileParsed, FileShortCircuited
+from comicbox.formats import MetadataFormats
+from comicbox.process import ReadResult, iter_process_files
+from comicbox.read_cache import ReadCache, file_fingerprint, read_config_key
+from tests.const import CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CONFIG = get_config(Namespace(comicbox=Namespace(compute_page_count=True)))
+FUTURE = datetime(2999, 1, 1, tzinfo=timezone.utc)
+FMT = MetadataFormats.COMICBOX_YAML
+
+
+def _copy_cbz(tmp_path: Path) -> Path:
+    path = tmp_path / CIX_CBZ_SOURCE_PATH.name
+    shutil.copy(CIX_CBZ_SOURCE_PATH, path)
+    return path
+
+
+def _run(path: Path, cache: ReadCache, **kwargs) -> tuple[ReadResult, list[Event]]:
+    events: list[Event] = []
+    results = dict(
+        iter_process_files(
+            [path],
+            config=kwargs.pop("config", CONFIG),
+            max_workers=1,
+            on_event=events.append,
+            read_cache=cache,
+            **kwargs,
+        )
+    )
+    result, exc = results[path]
+    assert exc is None
+    return result, events
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    result = ReadResult(
+        metadata_mtime=FUTURE, page_count=3, file_type="CBZ", tags={"a": 1}
+    )
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        fingerprint = file_fingerprint(path)
+        cache.set(path, fingerprint, FMT, result)
+        assert cache.get(path, fingerprint, FMT) == result
+        assert cache.get(path, fingerprint, MetadataFormats.COMIC_INFO) is None
+        stale = (*fingerprint[:3], fingerprint[3] + 1)
+        assert cache.get(path, stale, FMT) is None
+
+
+def test_second_run_is_a_cache_hit(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        first, events = _run(path, cache)
+        assert any(isinstance(e, FileParsed) for e in events)
+
+        second, events = _run(path, cache)
+    assert second == first
+    hits = [e for e in events if isinstance(e, FileShortCircuited)]
+    assert len(hits) == 1
+    assert hits[0].reason == "cache_hit"
+    assert hits[0].index == 0
+
+
+def test_cache_hit_honors_old_mtime(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        _run(path, cache)
+        result, events = _run(path, cache, old_mtime_map={str(path): FUTURE})
+    assert result["tags"] is None
+    assert result["page_count"] is not None
+    assert [e.reason for e in events if isinstance(e, FileShortCircuited)] == [
+        "cache_hit"
+    ]
+
+
+def test_envelope_only_row_misses_full_read(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        _run(path, cache, full_metadata=False)
+        result, events = _run(path, cache)
+    assert result["tags"]
+    assert any(isinstance(e, FileParsed) for e in events)
+
+
+def test_changed_file_misses(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        _run(path, cache)
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        _, events = _run(path, cache)
+    assert any(isinstance(e, FileParsed) for e in events)
+    assert not any(isinstance(e, FileShortCircuited) for e in events)
+
+
+def test_config_key_is_stable() -> None:
+    args = Namespace(comicbox=Namespace(compute_page_count=True))
+    assert read_config_key(get_config(args)) == read_config_key(CONFIG)
+    general = Namespace(delete_keys=["notes"])
+    other = get_config(Namespace(comicbox=Namespace(general=general)))
+    assert read_config_key(other) != read_config_key(CONFIG)
+
+
+def test_changed_config_misses(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    general = Namespace(delete_keys=["notes"])
+    other = get_config(
+        Namespace(comicbox=Namespace(compute_page_count=True, general=general))
+    )
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        _run(path, cache)
+        _, events = _run(path, cache, config=other)
+        assert any(isinstance(e, FileParsed) for e in events)
+        _, events = _run(path, cache)
+    assert [e.reason for e in events if isinstance(e, FileShortCircuited)] == [
+        "cache_hit"
+    ]
+
+
+def test_delete_and_clear_are_best_effort(tmp_path: Path) -> None:
+    cache = ReadCache(tmp_path / "cache.sqlite")
+    cache.close()
+    cache.delete(tmp_path / "missing.cbz")
+    cache.clear()
+
+
+def _row_count(cache: ReadCache) -> int:
+    with closing(sqlite3.connect(cache.db_path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM read_results").fetchone()[0]
+
+
+def test_changed_archive_drops_other_config_rows(tmp_path: Path) -> None:
+    path = _copy_cbz(tmp_path)
+    result = ReadResult(
+        metadata_mtime=FUTURE, page_count=3, file_type="CBZ", tags={"a": 1}
+    )
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        fingerprint = file_fingerprint(path)
+        cache.set(path, fingerprint, FMT, result, "one")
+        cache.set(path, fingerprint, FMT, result, "two")
+        assert cache.get(path, fingerprint, FMT, "one") == result
+        assert cache.get(path, fingerprint, FMT, "two") == result
+        assert cache.get(path, fingerprint, FMT, "three") is None
+        assert _row_count(cache) == 2
+        changed = (*fingerprint[:3], fingerprint[3] + 1)
+        cache.set(path, changed, FMT, result, "one")
+        assert _row_count(cache) == 1
+        assert cache.get(path, changed, FMT, "one") == result
+
+
+def test_legacy_table_is_rebuilt(tmp_path: Path) -> None:
+    db_path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE read_results (path TEXT NOT NULL, fmt TEXT NOT NULL, "
+            "st_dev INTEGER NOT NULL, st_ino INTEGER NOT NULL, "
+            "st_size INTEGER NOT NULL, st_mtime_ns INTEGER NOT NULL, "
+            "result BLOB NOT NULL, PRIMARY KEY (path, fmt))"
+        )
+    conn.close()
+    path = _copy_cbz(tmp_path)
+    with ReadCache(db_path) as cache:
+        result, _ = _run(path, cache)
+        assert _row_count(cache) == 1
+        cached, events = _run(path, cache)
+    assert cached == result
+    assert any(isinstance(e, FileShortCircuited) for e in events)
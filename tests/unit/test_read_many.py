@@ -0,0 +1,114 @@
+"""Tests for batched multi-member archive reads."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import rarfile
+from py7zr import SevenZipFile
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.rar import _unrar_cmdline
+from tests.const import (
+    CB7_SOURCE_PATH,
+    CIX_CBI_CBR_SOURCE_PATH,
+    CIX_CBT_SOURCE_PATH,
+    CIX_CBZ_SOURCE_PATH,
+)
+
+
+def _read_each(path: Path) -> list[bytes]:
+    with Comicbox(path) as cb:
+        return [
+            cb.get_page_by_filename(filename) for filename in cb.get_page_filenames()
+        ]
+
+
+def _count_extracts(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls = []
+    extract = SevenZipFile.extract
+
+    def _extract(self, *args, **kwargs):
+        calls.append(len(kwargs.get("targets") or ()))
+        return extract(self, *args, **kwargs)
+
+    monkeypatch.setattr(SevenZipFile, "extract", _extract)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "path", [CB7_SOURCE_PATH, CIX_CBZ_SOURCE_PATH, CIX_CBT_SOURCE_PATH]
+)
+def test_get_pages_matches_single_reads(path: Path) -> None:
+    expected = _read_each(path)
+    with Comicbox(path) as cb:
+        assert list(cb.get_pages(0, len(expected) - 1)) == expected
+
+
+def test_cb7_pages_extract_in_one_pass(monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = _read_each(CB7_SOURCE_PATH)
+    calls = _count_extracts(monkeypatch)
+    with Comicbox(CB7_SOURCE_PATH) as cb:
+        pages = list(cb.get_pages(0, len(expected) - 1))
+        # Still readable one at a time after the batch.
+        assert cb.get_page_by_filename(cb.get_page_filenames()[0]) == expected[0]
+    assert pages == expected
+    assert calls == [len(expected), 1]
+
+
+def test_cb7_spills_past_memory_limit() -> None:
+    expected = _read_each(CB7_SOURCE_PATH)
+    with Comicbox(CB7_SOURCE_PATH) as cb:
+        cb.READ_MANY_MEMORY_LIMIT = 1
+        filenames = cb.get_page_filenames()
+        # Out of archive order and repeated.
+        filenames = (*reversed(filenames), filenames[0])
+        results = list(cb._archive_readfiles(filenames))
+    assert [filename for filename, _, _ in results] == list(filenames)
+    assert [data for _, data, _ in results] == [*reversed(expected), expected[0]]
+
+
+def test_cb7_extract_pages(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = _read_each(CB7_SOURCE_PATH)
+    calls = _count_extracts(monkeypatch)
+    with Comicbox(CB7_SOURCE_PATH) as cb:
+        cb.extract_pages(0, len(expected) - 1, tmp_path)
+        filenames = cb.get_page_filenames()
+    assert calls == [len(expected)]
+    for filename, data in zip(filenames, expected, strict=True):
+        assert (tmp_path / Path(filename).name).read_bytes() == data
+
+
+@pytest.mark.skipif(not Comicbox.is_unrar_supported(), reason="unrar not on path")
+def test_cbr_pages_read_with_one_unrar_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = _read_each(CIX_CBI_CBR_SOURCE_PATH)
+    calls = []
+    popen = rarfile.custom_popen
+
+    def _popen(cmd):
+        calls.append(cmd)
+        return popen(cmd)
+
+    monkeypatch.setattr(rarfile, "custom_popen", _popen)
+    with Comicbox(CIX_CBI_CBR_SOURCE_PATH) as cb:
+        assert list(cb.get_pages(0, len(expected) - 1)) == expected
+    assert len(calls) == 1
+
+
+def test_unrar_cmdline_lists_members(tmp_path: Path) -> None:
+    dest = tmp_path / "dest"
+    listfile = tmp_path / "members.lst"
+    names = ("b/2.jpg", "1.jpg", "1.jpg", *(f"{i:05}.jpg" for i in range(10000)))
+    cmdline = _unrar_cmdline(Path("a.cbr"), names, dest, listfile)
+    # The names go in the listfile, so the command line stays short.
+    assert cmdline[-3:] == ["a.cbr", f"@{listfile}", f"{dest}/"]
+    lines = listfile.read_text(encoding="utf-16").splitlines()
+    assert lines[0] == "00000.jpg"
+    assert lines[-2:] == ["1.jpg", "b/2.jpg"]
+    assert len(lines) == 10002
+    # Wildcard characters can't be escaped, so extract the whole archive.
+    listfile.unlink()
+    cmdline = _unrar_cmdline(Path("a.cbr"), ("1.jpg", "what?.jpg"), dest, listfile)
+    assert cmdline[-2:] == ["a.cbr", f"{dest}/"]
+    assert not listfile.exists()
@@ -0,0 +1,176 @@
+"""Tests for compiling schema loads and dumps into Python functions."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from marshmallow import ValidationError, fields, validates
+
+from comicbox.box import Comicbox
+from comicbox.formats import MetadataFormats
+from comicbox.formats.base.schemas.base import BaseSchema, BaseSubSchema, _env_flag
+from comicbox.formats.base.schemas.cache import get_schema
+from tests.const import TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+FORMATS = tuple(fmt for fmt in MetadataFormats if fmt.value.enabled)
+METADATA_PATHS = tuple(
+    sorted(
+        path
+        for dir_name in ("metadata", "export")
+        for path in (TEST_FILES_DIR / dir_name).iterdir()
+        if path.suffix in {".json", ".txt", ".xml", ".yaml"}
+    )
+)
+ARCHIVE_PATHS = tuple(
+    sorted(
+        path
+        for path in TEST_FILES_DIR.iterdir()
+        if path.suffix in {".cb7", ".cbt", ".cbz", ".pdf"}
+    )
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1", True),
+        ("true", True),
+        ("Yes", True),
+        (" on ", True),
+        ("0", False),
+        ("false", False),
+        ("no", False),
+        ("", False),
+        (None, False),
+    ],
+)
+def test_compiled_env_flag(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, *, expected: bool
+) -> None:
+    name = "COMICBOX_COMPILED_SCHEMAS"
+    if value is None:
+        monkeypatch.delenv(name, raising=False)
+    else:
+        monkeypatch.setenv(name, value)
+    assert _env_flag(name) is expected
+
+
+def _call(func: Callable, *args: Any) -> Any:
+    try:
+        return func(*args)
+    except Exception as exc:
+        return type(exc)
+
+
+def _both(monkeypatch: pytest.MonkeyPatch, func: Callable, *args: Any) -> Any:
+    """Return the marshmallow and compiled results, which must match."""
+    monkeypatch.setattr(BaseSubSchema, "COMPILED", False)
+    expected = _call(func, *args)
+    monkeypatch.setattr(BaseSubSchema, "COMPILED", True)
+    result = _call(func, *args)
+    assert result == expected
+    if isinstance(expected, dict):
+        assert list(result) == list(expected)
+    return result
+
+
+def _walk_schemas(schema: Any, seen: set[int]) -> None:
+    if id(schema) in seen or not isinstance(schema, BaseSubSchema):
+        return
+    seen.add(id(schema))
+    if "Api" not in type(schema).__name__:
+        assert schema._compiled_schema, type(schema).__name__
+    for field in schema.fields.values():
+        for sub_field in (field, getattr(field, "inner", None)):
+            if isinstance(sub_field, fields.Nested):
+                _walk_schemas(sub_field.schema, seen)
+
+
+def test_schemas_compile() -> None:
+    seen = set()
+    for fmt in FORMATS:
+        _walk_schemas(get_schema(fmt.value.schema_class), seen)
+    assert seen
+
+
+@pytest.mark.parametrize(
+    "path", METADATA_PATHS, ids=lambda path: f"{path.parent.name}/{path.name}"
+)
+def test_file_parity(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every format loads and dumps every metadata file the same way."""
+    text = path.read_text()
+    for fmt in FORMATS:
+        schema = get_schema(fmt.value.schema_class)
+        loaded = _both(monkeypatch, schema.loads, text)
+        if isinstance(loaded, dict) and loaded:
+            _both(monkeypatch, schema.dump, loaded)
+            _both(monkeypatch, schema.dumps, loaded)
+
+
+@pytest.mark.parametrize("path", ARCHIVE_PATHS, ids=lambda path: path.name)
+def test_archive_parity(path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reading an archive and writing every format is the same."""
+
+    def _to_dicts() -> list[dict]:
+        with Comicbox(path) as cb:
+            return [cb.to_dict(fmt) for fmt in FORMATS]
+
+    _both(monkeypatch, _to_dicts)
+
+
+class _NumberSubSchema(BaseSubSchema):
+    SUPPRESS_ERRORS = False
+
+    number = fields.Integer()
+    name = fields.String()
+
+
+class _NumberSchema(BaseSchema):
+    ROOT_TAG = "root"
+
+    root = fields.Nested(_NumberSubSchema)
+    count = fields.Integer()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"root": {"number": "2", "name": "two"}, "count": "1"},
+        {"root": {"number": "two", "name": "two"}, "count": "1"},
+        {"root": ["bad"], "count": "bad"},
+        {"count": ""},
+        {},
+    ],
+)
+def test_error_parity(data: dict, monkeypatch: pytest.MonkeyPatch) -> None:
+    schema = _NumberSchema()
+    result = _both(monkeypatch, schema.load, data)
+    sub_schema = schema.fields["root"].schema  # pyright: ignore[reportAttributeAccessIssue], # ty: ignore[unresolved-attribute]
+    _both(monkeypatch, sub_schema.load, data.get("root"))
+    if isinstance(result, dict):
+        _both(monkeypatch, schema.dump, result)
+
+
+def test_invalid_sub_schema_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(BaseSubSchema, "COMPILED", True)
+    with pytest.raises(ValidationError) as exc:
+        _NumberSubSchema().load({"number": "two", "name": "two"})
+    assert exc.value.messages == {"number": ["Not a valid integer."]}
+    assert exc.value.valid_data == {"name": "two"}
+
+
+def test_uncompilable_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    class ValidatedSchema(_NumberSchema):
+        @validates("count")
+        def check_count(self, _value: int, **_kwargs: Any) -> None:
+            pass
+
+    schema = ValidatedSchema()
+    assert schema._compiled_schema is None
+    data = {"root": {"number": "2"}, "count": "3"}
+    assert _both(monkeypatch, schema.load, data) == {"root": {"number": 2}, "count": 3}
@@ -0,0 +1,134 @@
+"""Tests for compiling transform specs into Python functions."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import pytest
+from glom import Fill, GlomError, T, glom
+
+from comicbox.box import Comicbox
+from comicbox.formats import MetadataFormats
+from comicbox.formats.base.transforms.base import BaseTransform
+from comicbox.formats.base.transforms.compiler import SpecCompileError, compile_specs
+from comicbox.formats.base.transforms.spec import (
+    GLOBAL_SCOPE_PREFIX,
+    MetaSpec,
+    create_specs_from_comicbox,
+    create_specs_to_comicbox,
+)
+from tests.const import TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+ARCHIVE_NAMES = (
+    "Captain Science #001-cix.cbz",
+    "Captain Science #001-comet.cbz",
+    "Captain Science #001-metron.cbz",
+    "Captain Science #001 (1950) The Beginning - multi.cbz",
+    "comicbox.cbz",
+    "yaml.cbz",
+    "test_pdf.pdf",
+)
+SCOPE_TOTAL = f"{GLOBAL_SCOPE_PREFIX}.total"
+TRANSFORM_CLASSES = tuple(
+    {fmt.value.transform_class for fmt in MetadataFormats if fmt.value.enabled}
+)
+
+
+def _assert_parity(specs: Mapping, data: Mapping) -> dict:
+    expected = glom(deepcopy(dict(data)), dict(specs))
+    result = compile_specs(specs)(deepcopy(dict(data)))
+    assert result == expected
+    assert list(result) == list(expected)
+    return result
+
+
+@pytest.mark.parametrize(
+    "transform_class", TRANSFORM_CLASSES, ids=lambda cls: cls.__name__
+)
+@pytest.mark.parametrize("specs_attr", ["SPECS_TO", "SPECS_FROM"])
+def test_empty_parity(transform_class: type[BaseTransform], specs_attr: str) -> None:
+    specs = getattr(transform_class, specs_attr)
+    _assert_parity(specs, {})
+    assert transform_class._get_spec_function(specs_attr)
+
+
+@pytest.mark.parametrize("name", ARCHIVE_NAMES)
+def test_archive_parity(name: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every transform of a read and a write matches glom."""
+    calls = []
+    apply_specs = BaseTransform._apply_specs
+
+    def _apply_specs(self: BaseTransform, data: Mapping, specs_attr: str) -> dict:
+        calls.append((getattr(self, specs_attr), deepcopy(dict(data))))
+        return apply_specs(self, data, specs_attr)
+
+    monkeypatch.setattr(BaseTransform, "_apply_specs", _apply_specs)
+    with Comicbox(TEST_FILES_DIR / name) as cb:
+        for fmt in MetadataFormats:
+            if fmt.value.enabled:
+                cb.to_dict(fmt)
+    assert calls
+    for specs, data in calls:
+        _assert_parity(specs, data)
+
+
+def test_skip_empty() -> None:
+    specs = create_specs_to_comicbox(
+        MetaSpec(key_map={"title": "Title", "count": "Count"}, spec=int),
+        format_root_keypath="Root",
+    )
+    result = _assert_parity(specs, {"Root": {"Title": "", "Count": "3"}})
+    assert result == {"comicbox": {"title": None, "count": 3}}
+
+
+def test_multiple_values_and_global_scope() -> None:
+    def _sum(values: dict) -> dict:
+        return {"total": sum(value for value in values.values() if value is not None)}
+
+    specs = create_specs_to_comicbox(
+        MetaSpec(key_map={"total": ("A", "B", "C")}, spec=_sum, assign_global=True),
+        MetaSpec(
+            key_map={"double": (SCOPE_TOTAL, "Missing")},
+            spec=lambda values: values[SCOPE_TOTAL] * 2,
+            inherit_root_keypath=False,
+        ),
+    )
+    result = _assert_parity(specs, {"A": 1, "B": 2})
+    assert result == {"comicbox": {"total": 3}, "double": 6}
+
+
+def test_glom_step() -> None:
+    specs = create_specs_from_comicbox(
+        MetaSpec(key_map={"Pair": "pair"}, spec=Fill({"value": T["x"]})),
+        format_root_keypath="Root",
+    )
+    result = _assert_parity(specs, {"comicbox": {"pair": {"x": 1}}})
+    assert result == {"Root": {"Pair": {"value": 1}}}
+
+
+def test_uncompilable_spec() -> None:
+    with pytest.raises(SpecCompileError):
+        compile_specs({"key": "value"})
+
+
+def test_transform_error() -> None:
+    def _fail(_value: str) -> str:
+        reason = "bad value"
+        raise ValueError(reason)
+
+    class FailTransform(BaseTransform):
+        SPECS_TO = create_specs_to_comicbox(
+            MetaSpec(key_map={"title": "T"}, spec=_fail)
+        )
+
+    with pytest.raises(GlomError) as compiled_exc:
+        FailTransform()._apply_specs({"T": "x"}, "SPECS_TO")
+    with pytest.raises(GlomError) as glom_exc:
+        glom({"T": "x"}, dict(FailTransform.SPECS_TO))
+    assert isinstance(compiled_exc.value, ValueError)
+    assert type(compiled_exc.value).__mro__[1:] == type(glom_exc.value).__mro__[1:]
+    assert (FailTransform, "SPECS_TO") in BaseTransform._SPEC_FUNCTIONS
@@ -0,0 +1,101 @@
+"""Tests for the random access CBT member index."""
+
+from __future__ import annotations
+
+import os
+import tarfile
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive import tarindex
+from comicbox.box.archive.tarindex import TarIndex, TarStreamReader
+from comicbox.read_cache import ReadCache
+from tests.const import CIX_CBT_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+COMPRESSIONS = ("", "gz", "bz2", "xz")
+
+
+def _make_tar(tmp_path: Path, compression: str, members: dict[str, bytes]) -> Path:
+    path = tmp_path / f"test-{compression or 'plain'}.cbt"
+    with tarfile.open(path, f"w:{compression}") as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, BytesIO(data))
+    return path
+
+
+def _random_members(count: int = 8, size: int = 64 * 1024) -> dict[str, bytes]:
+    return {f"page-{i:02}.jpg": os.urandom(size) for i in range(count)}
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_out_of_order_reads(tmp_path: Path, compression: str) -> None:
+    members = _random_members()
+    path = _make_tar(tmp_path, compression, members)
+    index = TarIndex.from_path(path)
+    assert index.compression == compression
+    assert index.namelist() == tuple(members)
+    reader = TarStreamReader(path, compression)
+    try:
+        for name in (*reversed(members), *members):
+            info = index.getmember(name)
+            assert info
+            assert reader.read(info.offset_data, info.size) == members[name]
+    finally:
+        reader.close()
+
+
+def test_gzip_checkpoints(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tarindex, "CHECKPOINT_SPACING", 128 * 1024)
+    members = _random_members(count=16)
+    path = _make_tar(tmp_path, "gz", members)
+    index = TarIndex.from_path(path)
+    reader = TarStreamReader(path, "gz")
+    try:
+        last = index.members[-1]
+        assert reader.read(last.offset_data, last.size) == members[last.name]
+        assert len(reader._checkpoints) > 1
+        # A backward read resumes from a checkpoint, not the start.
+        restarts = []
+        monkeypatch.setattr(reader, "_restart", lambda: restarts.append(1))
+        middle = index.members[len(members) // 2]
+        assert reader.read(middle.offset_data, middle.size) == members[middle.name]
+        assert not restarts
+    finally:
+        reader.close()
+
+
+def test_box_reads_through_index() -> None:
+    with Comicbox(CIX_CBT_SOURCE_PATH) as cb, tarfile.open(CIX_CBT_SOURCE_PATH) as tf:
+        assert cb.namelist()
+        assert cb.get_metadata_mtime()
+        for filename in reversed(cb.get_page_filenames()):
+            file_obj = tf.extractfile(filename)
+            assert file_obj
+            assert cb.get_page_by_filename(filename) == file_obj.read()
+        assert cb._archive is None
+
+
+def test_index_persists_in_read_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _make_tar(tmp_path, "gz", _random_members(count=2))
+    with ReadCache(tmp_path / "cache.sqlite") as cache:
+        with Comicbox(path, read_cache=cache) as cb:
+            namelist = cb.namelist()
+
+        def _no_walk(_path):
+            reason = "index should come from the cache"
+            raise AssertionError(reason)
+
+        monkeypatch.setattr(TarIndex, "from_path", _no_walk)
+        with Comicbox(path, read_cache=cache) as cb:
+            assert cb.namelist() == namelist
+            assert cb._tar_index is not None
@@ -0,0 +1,122 @@
+"""Tests for cover thumbnails and their cache."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import pytest
+from PIL import Image, JpegImagePlugin
+
+from comicbox._pdf import PAGE_FORMAT_IMAGE, PAGE_FORMAT_PIXMAP_JPEG
+from comicbox.box import Comicbox
+from comicbox.thumbnails import ThumbnailCache, extract_covers, make_thumbnail
+from tests.const import CB7_SOURCE_PATH, CIX_CBZ_SOURCE_PATH, PDF_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _jpeg(size: tuple[int, int]) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", size, "blue").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("fmt", ["webp", "jpeg", "png"])
+def test_make_thumbnail(fmt: str) -> None:
+    thumb = make_thumbnail(_jpeg((1600, 2400)), 200, fmt)
+    with Image.open(BytesIO(thumb)) as img:
+        assert img.format == fmt.upper()
+        assert img.size == (133, 200)
+
+
+def test_jpeg_draft_decode(monkeypatch: pytest.MonkeyPatch) -> None:
+    drafts = []
+    draft = JpegImagePlugin.JpegImageFile.draft
+
+    def _draft(self, mode, size):
+        result = draft(self, mode, size)
+        drafts.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", _draft)
+    make_thumbnail(_jpeg((1600, 2400)), 200)
+    # Decoded at 1/8 scale rather than full size.
+    assert drafts[0] == (200, 300)
+
+
+def _copy(tmp_path: Path, source: Path = CIX_CBZ_SOURCE_PATH) -> Path:
+    path = tmp_path / source.name
+    shutil.copy(source, path)
+    return path
+
+
+def test_cover_thumbnail_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = _copy(tmp_path)
+    cache = ThumbnailCache(tmp_path / "thumbs")
+    with Comicbox(path) as cb:
+        thumb = cb.get_cover_thumbnail(64, cache=cache)
+    with Image.open(BytesIO(thumb)) as img:
+        assert max(img.size) == 64
+    assert len(list(cache.cache_dir.glob("*/*.webp"))) == 1
+
+    def _no_read(*_args, **_kwargs) -> bytes:
+        reason = "thumbnail should come from the cache"
+        raise AssertionError(reason)
+
+    with monkeypatch.context() as mp:
+        mp.setattr(Comicbox, "_archive_readfile", _no_read)
+        with Comicbox(path) as cb:
+            assert cb.get_cover_thumbnail(64, cache=cache) == thumb
+
+    # A rewritten archive gets a new entry.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    with Comicbox(path) as cb:
+        assert cb.get_cover_thumbnail(64, cache=cache) == thumb
+    assert len(list(cache.cache_dir.glob("*/*.webp"))) == 2
+
+
+def test_extract_covers(tmp_path: Path) -> None:
+    paths = [_copy(tmp_path), _copy(tmp_path, CB7_SOURCE_PATH)]
+    missing = tmp_path / "missing.cbz"
+    cache_dir = tmp_path / "thumbs"
+    results = {
+        path: (thumb, exc)
+        for path, thumb, exc in extract_covers(
+            [*paths, missing], 32, "jpeg", cache_dir=cache_dir, max_workers=2
+        )
+    }
+    for path in paths:
+        thumb, exc = results[path]
+        assert exc is None
+        assert thumb.startswith(b"\xff\xd8")
+    assert results[missing][1] is not None
+    assert len(list(cache_dir.glob("*/*.jpg"))) == len(paths)
+
+
+def test_cache_key_settings(tmp_path: Path) -> None:
+    """Quality and the pdf page format get their own cache entries."""
+    cbz_path = _copy(tmp_path)
+    pdf_path = _copy(tmp_path, PDF_SOURCE_PATH)
+    cache = ThumbnailCache(tmp_path / "thumbs")
+    with Comicbox(cbz_path) as cb:
+        low = cb.get_cover_thumbnail(256, "jpeg", cache=cache, quality=10)
+        high = cb.get_cover_thumbnail(256, "jpeg", cache=cache, quality=95)
+        cb.get_cover_thumbnail(256, "png", cache=cache, quality=10)
+        cb.get_cover_thumbnail(256, "png", cache=cache, quality=95)
+    assert len(low) < len(high)
+    assert len(list(cache.cache_dir.glob("*/*.jpg"))) == 2
+    assert len(list(cache.cache_dir.glob("*/*.png"))) == 1
+    with Comicbox(pdf_path) as cb:
+        cb.get_cover_thumbnail(32, cache=cache, pdf_format=PAGE_FORMAT_PIXMAP_JPEG)
+        cb.get_cover_thumbnail(32, cache=cache, pdf_format=PAGE_FORMAT_IMAGE)
+    assert len(list(cache.cache_dir.glob("*/*.webp"))) == 2
+
+
+def test_png_ignores_quality() -> None:
+    data = _jpeg((400, 600))
+    assert make_thumbnail(data, 100, "png", 10) == make_thumbnail(data, 100, "png", 95)
@@ -0,0 +1,165 @@
+"""Tests for raw zip member copies."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import zlib
+from io import BytesIO, UnsupportedOperation
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile
+
+import pytest
+
+from comicbox.box.archive.zipcopy import copy_member
+from comicbox.write import write_metadata
+from tests.const import CIX_CBZ_SOURCE_PATH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MEMBERS = {
+    "stored.jpg": (ZIP_STORED, os.urandom(4096)),
+    "deflated.xml": (ZIP_DEFLATED, b"<ComicInfo/>" * 1000),
+    "lzma.txt": (ZIP_LZMA, b"lzma " * 1000),
+}
+
+
+class _Unseekable(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        raise UnsupportedOperation
+
+
+def _make_zip(path: Path) -> None:
+    with ZipFile(path, "w") as zf:
+        for name, (compress_type, data) in MEMBERS.items():
+            zf.writestr(name, data, compress_type=compress_type)
+    # Streamed members get a data descriptor after their data.
+    stream = _Unseekable()
+    with ZipFile(stream, "w") as zf, zf.open("streamed.bin", "w") as member:
+        member.write(b"streamed" * 512)
+    with ZipFile(path, "a") as dest, ZipFile(BytesIO(stream.getvalue())) as src:
+        info = src.getinfo("streamed.bin")
+        assert info.flag_bits & 0x08
+        copy_member(src, info, dest)
+
+
+def _no_open(*_args, **_kwargs) -> None:
+    reason = "members should not be decompressed"
+    raise AssertionError(reason)
+
+
+@pytest.mark.parametrize("kernel_copy", [True, False])
+def test_copy_member(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, *, kernel_copy: bool
+) -> None:
+    if not kernel_copy:
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+    src_path = tmp_path / "src.zip"
+    dest_path = tmp_path / "dest.zip"
+    _make_zip(src_path)
+    with ZipFile(src_path) as src:
+        expected = {info.filename: src.read(info) for info in src.infolist()}
+        with ZipFile(dest_path, "x") as dest, monkeypatch.context() as mp:
+            mp.setattr(ZipFile, "open", _no_open)
+            for info in src.infolist():
+                new_info = copy_member(src, info, dest, "copy-" + info.filename)
+                assert new_info.compress_type == info.compress_type
+                assert new_info.compress_size == info.compress_size
+    with ZipFile(dest_path) as dest:
+        assert dest.testzip() is None
+        assert {
+            info.filename.removeprefix("copy-"): dest.read(info)
+            for info in dest.infolist()
+        } == expected
+
+
+def test_relayout_keeps_compressed_members(tmp_path: Path) -> None:
+    path = tmp_path / "interleaved.cbz"
+    shutil.copy(CIX_CBZ_SOURCE_PATH, path)
+    with ZipFile(path, "a") as zf:
+        zf.writestr("comicbox.json", b"{}")
+        zf.writestr("zz-last-page.jpg", os.urandom(1024))
+    with ZipFile(path) as zf:
+        before = {
+            info.filename: (info.compress_type, info.compress_size, info.CRC)
+            for info in zf.infolist()
+            if not info.filename.lower().endswith((".xml", ".json"))
+        }
+
+    result = write_metadata(path, patch={"title": "Raw"}, formats=["comic_info"])
+    assert result.error is None
+
+    with ZipFile(path) as zf:
+        assert zf.testzip() is None
+        infos = sorted(zf.infolist(), key=lambda info: info.header_offset)
+        after = {
+            info.filename: (info.compress_type, info.compress_size, info.CRC)
+            for info in infos
+            if not info.filename.lower().endswith((".xml", ".json"))
+        }
+        assert infos[-1].filename.lower().endswith("comicinfo.xml")
+    assert after == before
+
+
+def _crypt_keys_update(keys: list[int], byte: int) -> None:
+    keys[0] = ~zlib.crc32(bytes([byte]), ~keys[0] & 0xFFFFFFFF) & 0xFFFFFFFF
+    keys[1] = ((keys[1] + (keys[0] & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+    keys[2] = ~zlib.crc32(bytes([keys[1] >> 24]), ~keys[2] & 0xFFFFFFFF) & 0xFFFFFFFF
+
+
+def _zip_crypto_encrypt(pwd: bytes, plain: bytes) -> bytes:
+    """Encrypt with traditional PKWARE encryption, which zipfile only reads."""
+    keys = [0x12345678, 0x23456789, 0x34567890]
+    for byte in pwd:
+        _crypt_keys_update(keys, byte)
+    out = bytearray()
+    for byte in plain:
+        temp = (keys[2] | 2) & 0xFFFF
+        out.append(byte ^ (((temp * (temp ^ 1)) >> 8) & 0xFF))
+        _crypt_keys_update(keys, byte)
+    return bytes(out)
+
+
+def _make_encrypted_zip(name: str, data: bytes, pwd: bytes) -> bytes:
+    """Build a zip with one stored ZipCrypto member and a data descriptor."""
+    dos_time, dos_date = (12 << 11) | (34 << 5) | 28, (40 << 9) | (5 << 5) | 6
+    crc = zlib.crc32(data)
+    # With a data descriptor the password check byte is the time's high byte.
+    header = os.urandom(11) + bytes([dos_time >> 8])
+    payload = _zip_crypto_encrypt(pwd, header + data)
+    flags = 0x01 | 0x08
+    raw_name = name.encode()
+    local = struct.pack(
+        "<4s2B4HL2L2H", b"PK\x03\x04", 20, 0, flags, 0, dos_time, dos_date,
+        0, 0, 0, len(raw_name), 0,
+    )  # fmt: skip
+    descriptor = struct.pack("<4s3L", b"PK\x07\x08", crc, len(payload), len(data))
+    member = local + raw_name + payload + descriptor
+    central = struct.pack(
+        "<4s4B4HL2L5H2L", b"PK\x01\x02", 20, 0, 20, 0, flags, 0, dos_time,
+        dos_date, crc, len(payload), len(data), len(raw_name), 0, 0, 0, 0, 0, 0,
+    ) + raw_name  # fmt: skip
+    end = struct.pack(
+        "<4s4H2LH", b"PK\x05\x06", 0, 0, 1, 1, len(central), len(member), 0
+    )
+    return member + central + end
+
+
+def test_copy_encrypted_member(tmp_path: Path) -> None:
+    """Encrypted members still decrypt after a raw copy."""
+    data, pwd = b"secret page " * 100, b"password"
+    dest_path = tmp_path / "dest.zip"
+    with ZipFile(BytesIO(_make_encrypted_zip("page.jpg", data, pwd))) as src:
+        info = src.getinfo("page.jpg")
+        assert src.read(info, pwd=pwd) == data
+        with ZipFile(dest_path, "x") as dest:
+            copy_member(src, info, dest)
+    with ZipFile(dest_path) as dest:
+        new_info = dest.getinfo("page.jpg")
+        assert new_info.flag_bits == info.flag_bits
+        assert dest.read(new_info, pwd=pwd) == data
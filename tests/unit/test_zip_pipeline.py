@@ -0,0 +1,86 @@
+"""Tests for the pipelined conversion writer."""
+
+from __future__ import annotations
+
+import os
+from itertools import count
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from comicbox.box.archive import zippipeline
+from comicbox.box.archive.zippipeline import ZipWritePipeline
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+
+def _members(number: int = 40) -> dict[str, tuple[bytes, int]]:
+    return {
+        f"{i:03}.{'jpg' if i % 2 else 'xml'}": (
+            os.urandom(2048) if i % 2 else b"<page/>" * 500,
+            ZIP_STORED if i % 2 else ZIP_DEFLATED,
+        )
+        for i in range(number)
+    }
+
+
+@pytest.mark.parametrize(
+    ("workers", "queue_depth", "memory_budget"), [(1, 1, 1), (4, 8, 64 * 1024)]
+)
+def test_writes_in_order(
+    tmp_path: Path, workers: int, queue_depth: int, memory_budget: int
+) -> None:
+    members = _members()
+    path = tmp_path / "test.cbz"
+    with ZipFile(path, "x") as zf:
+        ZipWritePipeline(
+            zf, workers=workers, queue_depth=queue_depth, memory_budget=memory_budget
+        ).run((name, data, ct) for name, (data, ct) in members.items())
+    with ZipFile(path) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == list(members)
+        for info in zf.infolist():
+            data, compress_type = members[info.filename]
+            assert info.compress_type == compress_type
+            assert zf.read(info) == data
+
+
+def test_reader_error_propagates(tmp_path: Path) -> None:
+    def _broken() -> Generator[tuple[str, bytes, int]]:
+        yield "001.jpg", b"page", ZIP_STORED
+        reason = "bad archive"
+        raise ValueError(reason)
+
+    with (
+        ZipFile(tmp_path / "test.cbz", "x") as zf,
+        pytest.raises(ValueError, match="bad archive"),
+    ):
+        ZipWritePipeline(zf).run(_broken())
+
+
+def test_writer_error_stops_reader(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    closed = []
+
+    def _endless() -> Generator[tuple[str, bytes, int]]:
+        try:
+            for i in count():
+                yield f"{i}.jpg", b"page", ZIP_STORED
+        finally:
+            closed.append(True)
+
+    def _fail(*_args) -> None:
+        reason = "disk full"
+        raise OSError(reason)
+
+    monkeypatch.setattr(zippipeline, "write_compressed", _fail)
+    with (
+        ZipFile(tmp_path / "test.cbz", "x") as zf,
+        pytest.raises(OSError, match="disk full"),
+    ):
+        ZipWritePipeline(zf, queue_depth=2).run(_endless())
+    assert closed
@@ -0,0 +1,106 @@
+"""Tests for the lightweight zip central directory reader."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from zipfile import BadZipFile, ZipFile, ZipInfo
+
+import pytest
+
+from comicbox.box import Comicbox
+from comicbox.box.archive.zipdir import ZipDirectory
+from tests.const import CIX_CBZ_SOURCE_PATH, EMPTY_CBZ_SOURCE_PATH, TEST_FILES_DIR
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CBZ_PATHS = tuple(sorted(TEST_FILES_DIR.glob("*.cbz")))
+
+
+def _info_tuples(path: Path) -> tuple[tuple, ...]:
+    with ZipFile(path) as zf:
+        return tuple(
+            (
+                i.filename,
+                i.file_size,
+                i.compress_size,
+                i.CRC,
+                i.compress_type,
+                i.flag_bits,
+                i.header_offset,
+                i.date_time,
+            )
+            for i in zf.infolist()
+        )
+
+
+@pytest.mark.parametrize("path", CBZ_PATHS, ids=lambda p: p.name)
+def test_matches_zipfile(path: Path) -> None:
+    """The table reports exactly what ZipFile does."""
+    table = ZipDirectory.from_path(path)
+    with ZipFile(path) as zf:
+        assert table.namelist() == tuple(zf.namelist())
+        assert table.comment == zf.comment
+    assert tuple(tuple(entry) for entry in table.infolist()) == _info_tuples(path)
+
+
+def test_zip64_and_prefixed(tmp_path: Path) -> None:
+    """ZIP64 records and data prepended to the archive decode like ZipFile."""
+    path = tmp_path / "zip64.cbz"
+    with ZipFile(path, "w") as zf:
+        with zf.open("a.txt", "w", force_zip64=True) as f:
+            f.write(b"data")
+        zf.comment = b"comment"
+    prefixed = tmp_path / "prefixed.cbz"
+    prefixed.write_bytes(b"#!/bin/sh\n" + path.read_bytes())
+    for test_path in (path, prefixed):
+        table = ZipDirectory.from_path(test_path)
+        assert tuple(tuple(entry) for entry in table.infolist()) == _info_tuples(
+            test_path
+        )
+        assert table.comment == b"comment"
+
+
+@pytest.mark.parametrize("data", [b"", b"not a zip file"])
+def test_not_a_zip(tmp_path: Path, data: bytes) -> None:
+    path = tmp_path / "bad.cbz"
+    path.write_bytes(data)
+    with pytest.raises(BadZipFile):
+        ZipDirectory.from_path(path)
+
+
+def test_box_listing_does_not_open_zipfile() -> None:
+    """Listings, comment and metadata mtime come from the table alone."""
+    with Comicbox(CIX_CBZ_SOURCE_PATH) as cb:
+        assert cb.namelist()
+        assert cb._get_infolist()
+        cb._get_comment()
+        assert cb.get_metadata_mtime()
+        assert cb._archive is None
+        assert cb._zipdir is not None
+        # Member bytes still come from ZipFile.
+        assert cb.get_page_by_index(0)
+        assert cb._archive is not None
+
+
+def test_box_empty_cbz() -> None:
+    with Comicbox(EMPTY_CBZ_SOURCE_PATH) as cb:
+        assert cb.get_page_count() == 0
+        assert cb._archive is None
+
+
+def test_box_infolist_is_zipinfo() -> None:
+    """The public infolist keeps returning ZipFile's own ZipInfos."""
+    with ZipFile(CIX_CBZ_SOURCE_PATH) as zf:
+        expected = sorted(zf.infolist(), key=lambda i: i.filename.lower())
+    with Comicbox(CIX_CBZ_SOURCE_PATH) as cb:
+        assert cb.get_metadata_mtime()
+        infolist = cb.infolist()
+        # Sorted once and kept until the archive closes.
+        assert cb.infolist() is infolist
+    assert cb._zipinfolist is None
+    assert all(isinstance(info, ZipInfo) for info in infolist)
+    assert [repr(info) for info in infolist] == [repr(info) for info in expected]
+    assert [info.external_attr for info in infolist] == [
+        info.external_attr for info in expected
+    ]